@@ -1,22 +1,27 @@
+from datetime import date, timedelta
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from databaseDAO.sqlConnector import get_connection, db
+from databaseDAO.statement_cache import prepared_statement
+from Visuals.time_series import income_expense_series, WEEKLY
+
+WEEKLY_EXPENSES_QUERY = prepared_statement("""
+    SELECT transaction_date, amount
+    FROM transactions
+    WHERE user_id = %s
+      AND transaction_date >= %s
+    ORDER BY transaction_date ASC
+    """)
 
 
 def weekly_expenses(user, weeks=12):
     """Fetch transactions for a user within the specified number of weeks"""
+    since = date.today() - timedelta(weeks=weeks)
     with db() as (conn, cursor):
-        query = """
-            SELECT DATE (transaction_date) as date, amount
-            FROM transactions
-            WHERE user_id = %s
-              AND transaction_date >= DATE_SUB(CURDATE() \
-                , INTERVAL %s WEEK)
-            ORDER BY transaction_date ASC \
-            """
-        cursor.execute(query, (user, weeks))
+        cursor.execute(WEEKLY_EXPENSES_QUERY, (user, since))
         result = cursor.fetchall()
 
     if not result:
@@ -26,24 +31,6 @@ def weekly_expenses(user, weeks=12):
     return result
 
 
-def incoming_funds(amounts):
-    """Calculate total income (positive amounts)"""
-    total = 0
-    for amount in amounts:
-        if amount >= 0:
-            total += amount
-    return total
-
-
-def outgoing_funds(amounts):
-    """Calculate total expenses (negative amounts as positive values)"""
-    total = 0
-    for amount in amounts:
-        if amount < 0:
-            total += abs(amount)  # Convert to positive for display
-    return total
-
-
 def groupPlot_by_week(transactions):
     """Group transactions by week and create a line chart"""
 
@@ -51,20 +38,12 @@ def groupPlot_by_week(transactions):
         print("No transactions to plot!")
         return
 
-    # Create DataFrame from transactions
+    # Income and expenses per W-MON week, weeks without transactions as 0
     df = pd.DataFrame(transactions, columns=["Date", "Amount"])
-    df["Date"] = pd.to_datetime(df["Date"])
-    df.set_index("Date", inplace=True)
-
-    # Resample by week (starting Monday) and aggregate
-    weekly = df.resample('W-MON').agg({
-        'Amount': [incoming_funds, outgoing_funds]
-    })
+    weekly = income_expense_series(df["Date"], df["Amount"], WEEKLY)
 
     # Reset index first to get the Date column
     weekly = weekly.reset_index()
-
-    # Then rename the aggregated columns
     weekly.columns = ['Date', 'Income', 'Expenses']
 
     # Create the plot with line chart
@@ -1,65 +1,126 @@
-import requests
-from datetime import datetime, timedelta
+import asyncio
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
 from typing import Dict, List
 
+import numpy as np
+import pandas as pd
+
+from databaseDAO.ExchangeRate.rate_history_DAO import get_rate_history, save_rates
+from Visuals.rate_providers import RateProvider, get_rate_provider
+
 
 class ExchangeRates:
 
-    def __init__(self):
-        self.api_url = "https://api.exchangerate-api.com/v4/latest"
+    # Rates are fetched once against this currency; every other base is derived from it
+    PIVOT_CURRENCY = "USD"
+
+    def __init__(self, provider: RateProvider = None):
+        self.provider = provider or get_rate_provider()
         self.cache = {}
         self.cache_time = None
         self.cache_hours = 12  # Refresh every 12 hours
+        self.retry_seconds = 60  # Wait between attempts while the provider fails
+        self._lock = threading.Lock()
+        self._refresh_flight = None
+        self._last_attempt = None
 
-    def get_rates(self, base_currency: str = "USD") -> Dict[str, float]:
+    def refresh(self) -> Dict[str, float]:
         """
-        Get exchange rates from API with simple caching
+        Fetch the pivot rates now, sharing one fetch between concurrent callers
 
-        Args:
-            base_currency: Base currency (e.g., "USD")
+        Callers that arrive while a fetch is running wait for its result
+        instead of starting their own.
 
         Returns:
-            Dictionary of rates like {"EUR": 0.92, "SEK": 10.87, ...}
-            Meaning: 1 base_currency = X other_currency
-            Example: If base is USD, then rates["SEK"] = 10.87 means 1 USD = 10.87 SEK
+            The pivot rates; the old ones (or {}) if the fetch failed
         """
-        # Check if cache is still valid
-        if self._is_cache_valid() and self.cache.get('base') == base_currency:
-            print(f"Using cached rates for {base_currency}")
-            return self.cache.get('rates', {})
+        with self._lock:
+            flight = self._refresh_flight
+            leader = flight is None
+            if leader:
+                flight = self._refresh_flight = Future()
 
-        # Fetch new rates
-        try:
-            url = f"{self.api_url}/{base_currency}"
-            print(f"🌐 Fetching rates from {url}")
-
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+        if not leader:
+            return flight.result()
 
-            data = response.json()
-            rates = data['rates']
-            rates[base_currency] = 1.0  # Add base currency
+        self._last_attempt = datetime.now()
+        try:
+            rates = dict(self.provider.fetch(self.PIVOT_CURRENCY))
+            rates[self.PIVOT_CURRENCY] = 1.0
 
-            # Update cache with base currency info
+            # Rates and the cross rates derived from them are swapped in together
             self.cache = {
                 'rates': rates,
-                'base': base_currency
+                'base': self.PIVOT_CURRENCY,
+                'cross': {}
             }
             self.cache_time = datetime.now()
-
-            print(f" Got {len(rates)} exchange rates for base {base_currency}")
-            print(f"   Sample: 1 {base_currency} = {rates.get('SEK', 'N/A')} SEK, {rates.get('EUR', 'N/A')} EUR")
-            return rates
+            print(f" Got {len(rates)} exchange rates for base {self.PIVOT_CURRENCY}")
 
         except Exception as e:
             print(f"Error getting rates: {e}")
-            # If cache exists, use it even if old
-            if self.cache and self.cache.get('rates'):
-                print("Using old cached rates")
-                return self.cache.get('rates', {})
-            # Otherwise return empty dict
+
+        rates = self.cache.get('rates', {})
+        with self._lock:
+            self._refresh_flight = None
+        flight.set_result(rates)
+        return rates
+
+    def _get_pivot_rates(self) -> Dict[str, float]:
+        """
+        Rates against PIVOT_CURRENCY, stale-while-revalidate
+
+        Fresh rates are returned as they are. Expired rates are still
+        returned at once while a background thread refreshes them; only a
+        cold cache waits for the provider. After a failed fetch the provider
+        is not asked again for retry_seconds.
+        """
+        if self._is_cache_valid():
+            return self.cache['rates']
+
+        retry_due = (self._last_attempt is None or
+                     datetime.now() - self._last_attempt >= timedelta(seconds=self.retry_seconds))
+
+        if self.cache.get('rates'):
+            if retry_due and self._refresh_flight is None:
+                print("Using old cached rates while refreshing")
+                threading.Thread(target=self.refresh, daemon=True).start()
+            return self.cache['rates']
+
+        if not retry_due and self._refresh_flight is None:
+            return {}
+        return self.refresh()
+
+    def get_rates(self, base_currency: str = "USD") -> Dict[str, float]:
+        """
+        Get exchange rates for any base currency from the cached pivot rates
+
+        Args:
+            base_currency: Base currency (e.g., "USD")
+
+        Returns:
+            Dictionary of rates like {"EUR": 0.92, "SEK": 10.87, ...}
+            Meaning: 1 base_currency = X other_currency
+            Example: If base is USD, then rates["SEK"] = 10.87 means 1 USD = 10.87 SEK
+        """
+        base_currency = base_currency.upper()
+        self._get_pivot_rates()
+        cache = self.cache
+        pivot = cache.get('rates', {})
+
+        if base_currency not in pivot:
+            print(f"No rates available for base {base_currency}")
             return {}
 
+        # Cross rates: 1 base = pivot[code] / pivot[base] code
+        cross = cache['cross']
+        if base_currency not in cross:
+            base_rate = pivot[base_currency]
+            cross[base_currency] = {code: rate / base_rate for code, rate in pivot.items()}
+        return cross[base_currency]
+
     def _is_cache_valid(self) -> bool:
         """Check if cache is less than 12 hours old"""
         if not self.cache or not self.cache_time:
@@ -120,6 +181,78 @@ class ExchangeRates:
 
         return round(converted, 2)
 
+    def convert_many(self, amounts, from_codes, to_code: str) -> np.ndarray:
+        """
+        Convert many amounts to one currency with a single rate lookup
+
+        Args:
+            amounts: Sequence or array of amounts
+            from_codes: One currency code for all amounts, or one per amount
+            to_code: Target currency
+
+        Returns:
+            Float array rounded to 2 decimals; amounts in a currency without
+            a rate are left unconverted, like convert()
+        """
+        return self._convert_with(self.get_rates(to_code), amounts, from_codes, to_code)
+
+    @staticmethod
+    def _spot_factor(rates, from_code, to_code):
+        """Multiplier from from_code to to_code given rates based on to_code; 1.0 when unknown"""
+        if from_code == to_code or from_code not in rates:
+            return 1.0
+        return 1.0 / rates[from_code]
+
+    @classmethod
+    def _convert_with(cls, rates, amounts, from_codes, to_code):
+        amounts = np.asarray(amounts, dtype=float)
+        to_code = to_code.upper()
+
+        if isinstance(from_codes, str):
+            codes, inverse = np.array([from_codes.upper()]), np.zeros(amounts.shape, dtype=np.intp)
+        else:
+            codes, inverse = np.unique(np.char.upper(np.asarray(from_codes, dtype=str)), return_inverse=True)
+            inverse = inverse.reshape(amounts.shape)
+
+        # One factor per distinct currency, then a single multiply
+        factors = np.array([cls._spot_factor(rates, code, to_code) for code in codes.tolist()])
+        return np.round(amounts * factors[inverse], 2)
+
+    def convert_many_asof(self, amounts, dates, from_code: str, to_code: str) -> np.ndarray:
+        """
+        Convert amounts with the rate of their own date
+
+        Rates come from the exchange_rate_history table in one query; each
+        date takes the latest stored rate on or before it (an as-of join).
+        Dates before the first stored rate use today's rate.
+
+        Args:
+            amounts: Array with one row (or value) per date
+            dates: Date of each row
+            from_code: Currency of the amounts
+            to_code: Target currency
+
+        Returns:
+            Float array shaped like amounts, rounded to 2 decimals
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        from_code, to_code = from_code.upper(), to_code.upper()
+        dates = pd.DatetimeIndex(dates)
+
+        if from_code == to_code or len(dates) == 0:
+            return np.round(amounts, 2)
+
+        history = get_rate_history([from_code, to_code], dates.min().date(), dates.max().date())
+        factors = asof_factors(dates, from_code, to_code, history)
+
+        missing = np.isnan(factors)
+        if missing.any():
+            factors[missing] = self._spot_factor(self.get_rates(to_code), from_code, to_code)
+
+        if amounts.ndim > 1:
+            factors = factors.reshape((-1,) + (1,) * (amounts.ndim - 1))
+        return np.round(amounts * factors, 2)
+
     def convert_accounts(self, accounts: List[Dict], base_currency: str = "USD") -> Dict:
         """
         Convert all accounts to one currency and calculate total
@@ -146,19 +279,17 @@ class ExchangeRates:
         converted_accounts = []
         total_balance = 0.0
 
-        for account in accounts:
-            # Get original values
-            original_balance = float(account.get('account_balance', 0))
-            original_currency = account.get('currency', 'USD').upper()
+        # Convert every balance at once with the rates fetched above
+        original_balances = [float(account.get('account_balance', 0)) for account in accounts]
+        original_currencies = [account.get('currency', 'USD').upper() for account in accounts]
+        converted_balances = self._convert_with(rates, original_balances, original_currencies, base_currency)
 
-            print(f"\nAccount: {account.get('account_name')}")
-            print(f"   Original: {original_balance:.2f} {original_currency}")
-
-            # Convert to base currency
-            converted_balance = self.convert(original_balance, original_currency, base_currency)
+        for account, original_balance, original_currency, converted_balance in zip(
+                accounts, original_balances, original_currencies, converted_balances.tolist()):
             total_balance += converted_balance
 
-            print(f"   Converted: {converted_balance:.2f} {base_currency}")
+            print(f"\nAccount: {account.get('account_name')}")
+            print(f"   {original_balance:.2f} {original_currency} -> {converted_balance:.2f} {base_currency}")
 
             # Create converted account data
             converted_account = {
@@ -187,6 +318,35 @@ class ExchangeRates:
         }
 
 
+def asof_factors(dates, from_code, to_code, history):
+    """
+    Per-date multipliers from from_code to to_code
+
+    Args:
+        dates: DatetimeIndex, in any order
+        history: (currency, rate_date, rate) rows with rates per 1 USD
+
+    Returns:
+        Float array aligned with dates; NaN where either currency has no
+        rate on or before the date
+    """
+    history = pd.DataFrame(history, columns=["currency", "rate_date", "rate"])
+    history["rate_date"] = pd.DatetimeIndex(history["rate_date"]).as_unit("ns")
+    history["rate"] = history["rate"].astype(float)
+
+    frame = pd.DataFrame({"date": dates.as_unit("ns"), "position": np.arange(len(dates))}).sort_values("date")
+    for column, code in (("from_rate", from_code), ("to_rate", to_code)):
+        if code == "USD":
+            frame[column] = 1.0
+            continue
+        rates = history.loc[history["currency"] == code, ["rate_date", "rate"]].sort_values("rate_date")
+        frame = pd.merge_asof(frame, rates.rename(columns={"rate": column}),
+                              left_on="date", right_on="rate_date").drop(columns="rate_date")
+
+    frame = frame.sort_values("position")
+    return np.array(frame["to_rate"] / frame["from_rate"], dtype=float)
+
+
 _currency_converter_instance = None
 
 
@@ -204,3 +364,22 @@ def get_currency_converter() -> ExchangeRates:
 
     return _currency_converter_instance
 
+
+async def refresh_rates_periodically(converter: ExchangeRates, interval_seconds: float = 3600):
+    """
+    Keep the converter's rates fresh from the app lifespan
+
+    Refreshes in a worker thread right away and then every interval, so
+    request handlers never wait for the provider. Each successful fetch is
+    also stored as today's row in the rate history.
+    """
+    while True:
+        fetched_at = converter.cache_time
+        rates = await asyncio.to_thread(converter.refresh)
+        # A failed fetch returns the previous rates, which are not today's
+        if rates and converter.cache_time != fetched_at:
+            try:
+                await asyncio.to_thread(save_rates, date.today(), rates, converter.PIVOT_CURRENCY)
+            except Exception as e:
+                print(f"Could not store rate history: {e}")
+        await asyncio.sleep(interval_seconds)
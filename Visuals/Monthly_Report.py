@@ -1,6 +1,7 @@
 import os
 
 from reportlab.lib.pagesizes import letter
+import numpy as np
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -8,8 +9,11 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.lib.enums import TA_CENTER
-from datetime import datetime
+from datetime import datetime, timedelta
 from databaseDAO.sqlConnector import get_connection, db
+from databaseDAO.money import Money, cents_sql, to_units
+from databaseDAO.user_context import get_user_context
+from Visuals.time_series import income_expense_series, DAILY
 from contextlib import contextmanager
 from reportlab.graphics.shapes import Line, String
 
@@ -19,49 +23,65 @@ def get_data(user_id, month):
         print(f"User with ID {user_id} does not exist!")
         return None
 
+    try:
+        month_start, next_month_start = month_range(month)
+    except ValueError:
+        print(f"Invalid month {month}, expected YYYY-MM")
+        return None
+
     with db() as (conn, cursor):
 
-        query = """
+        query = f"""
                 SELECT transaction_date,
-                       amount,
+                       {cents_sql('amount')} AS cents,
                        name,
                        description
                 FROM transactions
-                WHERE user_id = %s \
-                  AND DATE_FORMAT(transaction_date, '%Y-%m') = %s
-                ORDER BY transaction_date \
+                WHERE user_id = %s
+                  AND transaction_date >= %s
+                  AND transaction_date < %s
+                ORDER BY transaction_date
                 """
-        cursor.execute(query, (user_id, month))
+        cursor.execute(query, (user_id, month_start, next_month_start))
         result = cursor.fetchall()
 
         if not result:
             print("The user has no data!(visual)")
             return None
 
-        df = pd.DataFrame(result, columns=['transaction_date', 'amount', 'name', 'description'])
+        df = pd.DataFrame(result, columns=['transaction_date', 'cents', 'name', 'description'])
 
         # Convert transaction_date to datetime
         df['transaction_date'] = pd.to_datetime(df['transaction_date'])
 
-        # Convert Decimal to float to avoid pandas calculation errors
-        df['amount'] = df['amount'].astype(float)
+        # Amounts arrive as whole cents, so sums below are exact integers
+        df['cents'] = df['cents'].astype(np.int64)
 
         # Create 'type' column based on amount sign
         # If amount is negative, it's an expense; if positive, it's income
-        df['type'] = df['amount'].apply(lambda x: 'expense' if x < 0 else 'income')
+        df['type'] = np.where(df['cents'] < 0, 'expense', 'income')
 
         # Convert all amounts to positive for easier calculations
-        df['amount'] = df['amount'].abs()
+        df['cents'] = df['cents'].abs()
 
         return df
 
 
+def month_range(month):
+    """First day of a YYYY-MM month and of the month after, for half-open date filters"""
+    month_start = datetime.strptime(month, '%Y-%m').date()
+    next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+    return month_start, next_month_start
+
+
+def sek(cents):
+    """Display string for an amount in cents; a mean or median is rounded to the cent"""
+    return f"SEK {Money(round(cents)):,.2f}"
+
+
 def user_exists(user_id):
-    with db() as (conn, cursor):
-        query = "SELECT 1 FROM users WHERE user_id = %s"
-        cursor.execute(query, (user_id,))
-        result = cursor.fetchone()
-        return result is not None
+    # Usually answered by the user context cache the request already filled
+    return get_user_context(user_id) is not None
 
 
 def get_merchant_breakdown(df):
@@ -69,14 +89,14 @@ def get_merchant_breakdown(df):
     expenses_df = df[df['type'] == 'expense']
     if len(expenses_df) == 0:
         return None
-    merchant_spending = expenses_df.groupby('name')['amount'].sum().sort_values(ascending=False).head(7)
+    merchant_spending = expenses_df.groupby('name')['cents'].sum().sort_values(ascending=False).head(7)
     return merchant_spending
 
 
 def get_weekly_breakdown(df):
     """Get spending by week"""
     df['week'] = df['transaction_date'].dt.isocalendar().week
-    weekly_spending = df.groupby('week')['amount'].sum()
+    weekly_spending = df.groupby('week')['cents'].sum()
     return weekly_spending
 
 
@@ -88,40 +108,40 @@ def get_spending_insights(df):
 
     insights = {
         # Expense insights
-        'total_expenses': expenses_df['amount'].sum() if len(expenses_df) > 0 else 0,
-        'average_expense': expenses_df['amount'].mean() if len(expenses_df) > 0 else 0,
-        'median_expense': expenses_df['amount'].median() if len(expenses_df) > 0 else 0,
+        'total_expenses': expenses_df['cents'].sum() if len(expenses_df) > 0 else 0,
+        'average_expense': expenses_df['cents'].mean() if len(expenses_df) > 0 else 0,
+        'median_expense': expenses_df['cents'].median() if len(expenses_df) > 0 else 0,
         'expense_count': len(expenses_df),
-        'min_expense': expenses_df['amount'].min() if len(expenses_df) > 0 else 0,
-        'max_expense': expenses_df['amount'].max() if len(expenses_df) > 0 else 0,
+        'min_expense': expenses_df['cents'].min() if len(expenses_df) > 0 else 0,
+        'max_expense': expenses_df['cents'].max() if len(expenses_df) > 0 else 0,
 
         # Income insights
-        'total_income': income_df['amount'].sum() if len(income_df) > 0 else 0,
-        'average_income': income_df['amount'].mean() if len(income_df) > 0 else 0,
+        'total_income': income_df['cents'].sum() if len(income_df) > 0 else 0,
+        'average_income': income_df['cents'].mean() if len(income_df) > 0 else 0,
         'income_count': len(income_df),
 
         # Overall
         'total_count': len(df),
-        'net_savings': (income_df['amount'].sum() if len(income_df) > 0 else 0) - (
-            expenses_df['amount'].sum() if len(expenses_df) > 0 else 0),
+        'net_savings': (income_df['cents'].sum() if len(income_df) > 0 else 0) - (
+            expenses_df['cents'].sum() if len(expenses_df) > 0 else 0),
         'days_with_spending': df['transaction_date'].nunique(),
-        'avg_daily_expense': expenses_df.groupby('transaction_date')['amount'].sum().mean() if len(
+        'avg_daily_expense': expenses_df.groupby('transaction_date')['cents'].sum().mean() if len(
             expenses_df) > 0 else 0
     }
 
     # Top 3 expense days
     if len(expenses_df) > 0:
-        daily_expenses = expenses_df.groupby('transaction_date')['amount'].sum().sort_values(ascending=False)
+        daily_expenses = expenses_df.groupby('transaction_date')['cents'].sum().sort_values(ascending=False)
         insights['top_3_expense_days'] = daily_expenses.head(3)
     else:
         insights['top_3_expense_days'] = pd.Series()
 
     # Largest expense transaction
     if len(expenses_df) > 0:
-        largest_expense = expenses_df.loc[expenses_df['amount'].idxmax()]
+        largest_expense = expenses_df.loc[expenses_df['cents'].idxmax()]
         insights['largest_expense'] = {
             'date': largest_expense['transaction_date'],
-            'amount': largest_expense['amount'],
+            'cents': largest_expense['cents'],
             'name': largest_expense['name'],
             'description': largest_expense['description']
         }
@@ -130,10 +150,10 @@ def get_spending_insights(df):
 
     # Smallest expense transaction
     if len(expenses_df) > 0:
-        smallest_expense = expenses_df.loc[expenses_df['amount'].idxmin()]
+        smallest_expense = expenses_df.loc[expenses_df['cents'].idxmin()]
         insights['smallest_expense'] = {
             'date': smallest_expense['transaction_date'],
-            'amount': smallest_expense['amount'],
+            'cents': smallest_expense['cents'],
             'name': smallest_expense['name']
         }
     else:
@@ -144,42 +164,22 @@ def get_spending_insights(df):
 
 def prepared_for_chart(df):
     """Prepare separate income and expense data grouped by day"""
-    # Separate income and expenses
-    expenses_df = df[df['type'] == 'expense'].copy()
-    income_df = df[df['type'] == 'income'].copy()
-
-    # Group by date
-    daily_expenses = expenses_df.groupby('transaction_date')['amount'].sum().reset_index()
-    daily_income = income_df.groupby('transaction_date')['amount'].sum().reset_index()
-
-    # Get all days in the month
-    if len(df) > 0:
-        first_date = df['transaction_date'].min()
-        last_day = pd.Period(first_date, freq='M').days_in_month
-        all_days = pd.date_range(start=first_date.replace(day=1),
-                                 periods=last_day,
-                                 freq='D')
-    else:
+    if len(df) == 0:
         return {'expense_amounts': [], 'income_amounts': [], 'day_labels': [], 'dates': []}
 
-    # Create data structure with all days
-    expense_amounts = []
-    income_amounts = []
-    day_labels = []
-
-    for day in all_days:
-        expense_val = daily_expenses[daily_expenses['transaction_date'] == day]['amount'].sum()
-        income_val = daily_income[daily_income['transaction_date'] == day]['amount'].sum()
+    # Every day of the month, with days without transactions as 0
+    first_date = df['transaction_date'].min()
+    month_start = first_date.replace(day=1)
+    month_end = month_start + pd.offsets.MonthEnd(0)
 
-        expense_amounts.append(float(expense_val) if expense_val > 0 else 0)
-        income_amounts.append(float(income_val) if income_val > 0 else 0)
-        day_labels.append(str(day.day))
+    signed_cents = np.where(df['type'] == 'expense', -df['cents'], df['cents'])
+    daily = to_units(income_expense_series(df['transaction_date'], signed_cents, DAILY, month_start, month_end))
 
     return {
-        'expense_amounts': expense_amounts,
-        'income_amounts': income_amounts,
-        'day_labels': day_labels,
-        'dates': all_days.tolist()
+        'expense_amounts': daily['expenses'].tolist(),
+        'income_amounts': daily['income'].tolist(),
+        'day_labels': [str(day) for day in daily.index.day],
+        'dates': daily.index.tolist()
     }
 
 
@@ -241,13 +241,13 @@ def create_executive_summary(insights, styles):
     # Create summary cards in a table
     summary_data = [
         ['Metric', 'Value'],
-        ['Total Income', f"SEK {insights['total_income']:,.2f}"],
-        ['Total Expenses', f"SEK {insights['total_expenses']:,.2f}"],
-        ['Net Savings', f"SEK {insights['net_savings']:,.2f}"],
+        ['Total Income', sek(insights['total_income'])],
+        ['Total Expenses', sek(insights['total_expenses'])],
+        ['Net Savings', sek(insights['net_savings'])],
         ['Total Transactions',
          f"{insights['total_count']} ({insights['income_count']} income, {insights['expense_count']} expenses)"],
-        ['Avg Expense/Transaction', f"SEK {insights['average_expense']:,.2f}"],
-        ['Avg Expense per Day', f"SEK {insights['avg_daily_expense']:,.2f}"],
+        ['Avg Expense/Transaction', sek(insights['average_expense'])],
+        ['Avg Expense per Day', sek(insights['avg_daily_expense'])],
         ['Days with Activity', f"{insights['days_with_spending']} days"]
     ]
 
@@ -402,12 +402,12 @@ def create_merchant_breakdown_section(df, styles):
     table_data = [['Rank', 'Merchant', 'Amount', 'Percentage']]
     total = merchant_data.sum()
 
-    for rank, (merchant, amount) in enumerate(merchant_data.items(), 1):
-        percentage = (amount / total) * 100
+    for rank, (merchant, cents) in enumerate(merchant_data.items(), 1):
+        percentage = (cents / total) * 100
         table_data.append([
             f"#{rank}",
             str(merchant)[:30],
-            f"SEK {amount:,.2f}",
+            sek(cents),
             f"{percentage:.1f}%"
         ])
 
@@ -453,12 +453,12 @@ def create_top_spending_section(insights, styles):
     # Top 3 expense days
     if len(insights['top_3_expense_days']) > 0:
         table_data = [['Rank', 'Date', 'Total Expenses']]
-        for rank, (date, amount) in enumerate(insights['top_3_expense_days'].items(), 1):
+        for rank, (date, cents) in enumerate(insights['top_3_expense_days'].items(), 1):
             emoji = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
             table_data.append([
                 f"{emoji} #{rank}",
                 str(date),
-                f"SEK {amount:,.2f}"
+                sek(cents)
             ])
 
         table = Table(table_data, colWidths=[70, 180, 150])
@@ -492,7 +492,7 @@ def create_top_spending_section(insights, styles):
             ['', '🔺 Largest', '🔻 Smallest'],
             ['Date', str(lt['date']), str(st['date'])],
             ['Merchant', str(lt['name'])[:20], str(st['name'])[:20]],
-            ['Amount', f"SEK {lt['amount']:,.2f}", f"SEK {st['amount']:,.2f}"],
+            ['Amount', sek(lt['cents']), sek(st['cents'])],
         ]
 
         extremes_table = Table(extremes_data, colWidths=[80, 160, 160])
@@ -540,7 +540,7 @@ def create_transaction_list_section(df, summary, styles):
         table_data.append([
             str(row['transaction_date']),
             str(row['name'])[:25],
-            f"SEK {row['amount']:,.2f}",
+            sek(row['cents']),
             str(row['description'])[:35] if row['description'] else 'N/A'
         ])
 
@@ -565,11 +565,13 @@ def create_transaction_list_section(df, summary, styles):
     return elements
 
 
-def make_report(user_id, month, output_filename=None):
+def make_report(user_id, month, output_filename=None, df=None):
+    """Render the month's PDF; df is get_data's frame when the caller already has it"""
     if output_filename is None:
         output_filename = f'financial_report_{month}.pdf'
 
-    df = get_data(user_id, month)
+    if df is None:
+        df = get_data(user_id, month)
     if df is None:
         return False
 
@@ -602,19 +604,35 @@ def make_report(user_id, month, output_filename=None):
     return True
 
 
+REPORTS_QUERY = """
+    SELECT report_id,
+           user_id,
+           report_month,
+           total_spending,
+           transaction_count,
+           generated_at
+    FROM reports
+    WHERE user_id = %s
+    ORDER BY report_month DESC, generated_at DESC
+    """
+
+REPORT_ID_QUERY = "SELECT report_id FROM reports WHERE user_id = %s AND report_month = %s"
+
+REPORT_MONTH_QUERY = "SELECT report_month FROM reports WHERE report_id = %s AND user_id = %s"
+
+DELETE_REPORT_QUERY = "DELETE FROM reports WHERE report_id = %s AND user_id = %s"
+
+
+def report_file(user_id, month):
+    """Path and file name of a user's PDF report for month"""
+    filename = f"financial_report_{user_id}_{month}.pdf"
+    reports_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+    return os.path.join(reports_dir, filename), filename
+
+
 def get_reports_by_userid(current_user_id):
     with db(dictionary=True) as (conn, cursor):
-        cursor.execute("""
-                       SELECT report_id,
-                              user_id,
-                              report_month,
-                              total_spending,
-                              transaction_count,
-                              generated_at
-                       FROM reports
-                       WHERE user_id = %s
-                       ORDER BY report_month DESC, generated_at DESC
-                       """, (current_user_id,))
+        cursor.execute(REPORTS_QUERY, (current_user_id,))
 
         return cursor.fetchall()
 
@@ -633,12 +651,7 @@ def get_reports_service(current_user_id):
 
 def download_report_by_userid(month, current_user_id):
     with db() as (conn, cursor):
-        cursor.execute("""
-                       SELECT report_id
-                       FROM reports
-                       WHERE user_id = %s
-                         AND report_month = %s
-                       """, (current_user_id, month))
+        cursor.execute(REPORT_ID_QUERY, (current_user_id, month))
 
         result = cursor.fetchone()
 
@@ -651,10 +664,7 @@ def download_report_service(month, current_user_id):
     if not report:
         raise ValueError("Report not found in database")
 
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    filename = f'financial_report_{current_user_id}_{month}.pdf'
-    reports_dir = os.path.join(BASE_DIR, "reports")
-    file_path = os.path.join(reports_dir, filename)
+    file_path, filename = report_file(current_user_id, month)
 
     if not os.path.exists(file_path):
         print(f"PDF missing, regenerating...")
@@ -700,13 +710,13 @@ def generate_report_by_userid(current_user_id, month, total_spending, transactio
                        INSERT INTO reports (user_id, report_month, total_spending, transaction_count)
                        VALUES (%s, %s, %s, %s) ON DUPLICATE KEY
                        UPDATE
+                           report_id = LAST_INSERT_ID(report_id),
                            total_spending =
                        VALUES (total_spending), transaction_count =
                        VALUES (transaction_count), generated_at = CURRENT_TIMESTAMP
                        """, (current_user_id, month, total_spending, transaction_count))
 
-        conn.commit()
-
+        # LAST_INSERT_ID(report_id) makes lastrowid the existing id on update too
         if cursor.lastrowid:
             return cursor.lastrowid
 
@@ -721,48 +731,61 @@ def generate_report_by_userid(current_user_id, month, total_spending, transactio
         return row[0] if row else None
 
 
-def generate_monthly_report_service(user_id, month):
-    df = get_data(user_id, month)
+def prepare_report(user_id, month):
+    """
+    Validate the month and load its transactions
+
+    Returns:
+        (df, output_path, filename)
+
+    Raises:
+        ValueError: If month is not YYYY-MM
+        LookupError: If the month has no data
+    """
     if len(month) != 7 or month[4] != "-":
         raise ValueError("Invalid month format. Use YYYY-MM")
 
-    total_spending = float(df["amount"].sum())
-    transaction_count = len(df)
+    df = get_data(user_id, month)
+    if df is None:
+        raise LookupError("No transaction data found or report generation failed")
 
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    output_path, filename = report_file(user_id, month)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return df, output_path, filename
 
-    reports_dir = os.path.join(BASE_DIR, "reports")
-    os.makedirs(reports_dir, exist_ok=True)
 
-    filename = f"financial_report_{user_id}_{month}.pdf"
-    output_path = os.path.join(reports_dir, filename)
-
-    success = make_report(user_id, month, output_path)
-    if not success:
-        raise LookupError("No transaction data found or report generation failed")
+def record_report(user_id, month, df, filename):
+    """Store the rendered report's totals and return the generate response"""
+    total_spending = Money(df["cents"].sum())
+    transaction_count = len(df)
 
     report_id = generate_report_by_userid(
         current_user_id=user_id,
         month=month,
-        total_spending=total_spending,
+        total_spending=total_spending.to_decimal(),
         transaction_count=transaction_count
     )
     return {
         "report_id": report_id,
         "filename": filename,
-        "total_spending": round(total_spending, 2),
+        "total_spending": float(total_spending),
         "transaction_count": transaction_count
     }
 
 
+def generate_monthly_report_service(user_id, month):
+    df, output_path, filename = prepare_report(user_id, month)
+
+    success = make_report(user_id, month, output_path, df)
+    if not success:
+        raise LookupError("No transaction data found or report generation failed")
+
+    return record_report(user_id, month, df, filename)
+
+
 def get_report_month(report_id: int, user_id: int) -> str | None:
     with db(dictionary=True) as (conn, cursor):
-        cursor.execute("""
-            SELECT report_month
-            FROM reports
-            WHERE report_id = %s
-              AND user_id = %s
-        """, (report_id, user_id))
+        cursor.execute(REPORT_MONTH_QUERY, (report_id, user_id))
 
         row = cursor.fetchone()
         return row["report_month"] if row else None
@@ -770,11 +793,7 @@ def get_report_month(report_id: int, user_id: int) -> str | None:
 
 def delete_report_by_id(report_id: int, user_id: int) -> int:
     with db() as (conn, cursor):
-        cursor.execute("""
-            DELETE FROM reports
-            WHERE report_id = %s
-              AND user_id = %s
-        """, (report_id, user_id))
+        cursor.execute(DELETE_REPORT_QUERY, (report_id, user_id))
 
         return cursor.rowcount
 
@@ -788,11 +807,7 @@ def delete_report_service(report_id: int, user_id: int):
     if deleted == 0:
         raise ValueError("Report not found")
 
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-    filename = f"financial_report_{user_id}_{month}.pdf"
-    reports_dir = os.path.join(BASE_DIR, "reports")
-    file_path = os.path.join(reports_dir, filename)
+    file_path, filename = report_file(user_id, month)
 
     try:
         if os.path.exists(file_path):
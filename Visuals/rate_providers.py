@@ -0,0 +1,70 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict
+
+import requests
+
+
+class RateProvider(ABC):
+    """Source of exchange rates; fetch() raises when no rates can be had"""
+
+    @abstractmethod
+    def fetch(self, base_currency: str) -> Dict[str, float]:
+        """
+        Returns:
+            Dictionary of rates where 1 base_currency = X other_currency
+        """
+
+
+class HttpRateProvider(RateProvider):
+    """exchangerate-api.com, the live source"""
+
+    def __init__(self, api_url="https://api.exchangerate-api.com/v4/latest", timeout=10):
+        self.api_url = api_url
+        self.timeout = timeout
+
+    def fetch(self, base_currency: str) -> Dict[str, float]:
+        url = f"{self.api_url}/{base_currency}"
+        print(f"🌐 Fetching rates from {url}")
+
+        response = requests.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['rates']
+
+
+class FileRateProvider(RateProvider):
+    """
+    Rates from a JSON file shaped like the API response, for offline runs and tests
+
+    The file holds {"base": "USD", "rates": {...}}; rates for another base
+    are derived from it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, base_currency: str) -> Dict[str, float]:
+        with open(self.path, encoding='utf-8') as rates_file:
+            data = json.load(rates_file)
+
+        rates = dict(data['rates'])
+        rates[data['base']] = 1.0
+        if base_currency not in rates:
+            raise ValueError(f"No rate for {base_currency} in {self.path}")
+
+        base_rate = rates[base_currency]
+        return {code: rate / base_rate for code, rate in rates.items()}
+
+
+def get_rate_provider() -> RateProvider:
+    """
+    Provider chosen by EXCHANGE_RATE_PROVIDER: "http" (default) or "file",
+    which reads EXCHANGE_RATE_FILE
+    """
+    provider = os.getenv("EXCHANGE_RATE_PROVIDER", "http")
+    if provider == "file":
+        return FileRateProvider(os.environ["EXCHANGE_RATE_FILE"])
+    if provider == "http":
+        return HttpRateProvider()
+    raise ValueError(f"Unknown exchange rate provider: {provider}")
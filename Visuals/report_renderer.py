@@ -0,0 +1,183 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from Visuals.Monthly_Report import make_report
+
+
+class RenderRejected(RuntimeError):
+    """The render queue is full, or the user already has as many renders running as allowed"""
+
+
+def pack_frame(df):
+    """
+    Serialize get_data's frame for a worker process
+
+    Only the columns make_report reads are sent, as plain arrays: dates as
+    int64 nanoseconds, cents as int64 and the income/expense split as one
+    bool per row, so a month of transactions is a few kilobytes.
+    """
+    return pickle.dumps({
+        "dates": df["transaction_date"].to_numpy(dtype="datetime64[ns]").view(np.int64),
+        "cents": df["cents"].to_numpy(dtype=np.int64),
+        "expense": (df["type"] == "expense").to_numpy(),
+        "name": df["name"].tolist(),
+        "description": df["description"].tolist(),
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def unpack_frame(blob):
+    columns = pickle.loads(blob)
+    return pd.DataFrame({
+        "transaction_date": pd.to_datetime(columns["dates"].view("datetime64[ns]")),
+        "cents": columns["cents"],
+        "name": columns["name"],
+        "description": columns["description"],
+        "type": np.where(columns["expense"], "expense", "income"),
+    })
+
+
+def render_packed(user_id, month, output_path, blob):
+    """Worker entry point: render a packed frame to output_path"""
+    return make_report(user_id, month, output_path, unpack_frame(blob))
+
+
+class ReportRenderer:
+    """
+    Renders report PDFs in a pool of worker processes
+
+    reportlab holds the GIL while it lays out a report, so rendering in
+    threads stalls every other request. Workers are started with "spawn"
+    (nothing is inherited from the server process but the code) the first
+    time a report is rendered. If a worker dies, e.g. killed for running
+    out of memory, the pool is broken for good, so it is replaced.
+
+    Args:
+        max_workers: Worker processes; 0 renders in a thread of this process instead
+        max_queue: Renders that may wait for a worker before new ones are rejected
+        per_user: Renders one user may have queued or running at once
+        timeout: Seconds a caller waits for its render
+    """
+
+    def __init__(self, max_workers=2, max_queue=16, per_user=1, timeout=60.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.per_user = per_user
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = 0
+        self._per_user = {}
+        self.counters = {"rendered": 0, "failed": 0, "rejected": 0, "timeouts": 0, "restarts": 0}
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _discard(self, executor):
+        """Drop a broken pool so the next render starts a new one"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.counters["restarts"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reserve(self, user_id):
+        with self._lock:
+            if self._per_user.get(user_id, 0) >= self.per_user:
+                self.counters["rejected"] += 1
+                raise RenderRejected("A report is already being generated for this user")
+            if self._pending >= max(self.max_workers, 1) + self.max_queue:
+                self.counters["rejected"] += 1
+                raise RenderRejected("Too many reports are being generated, try again shortly")
+            self._pending += 1
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+
+    def _release(self, user_id, failed):
+        with self._lock:
+            self._pending -= 1
+            if self._per_user[user_id] <= 1:
+                del self._per_user[user_id]
+            else:
+                self._per_user[user_id] -= 1
+            self.counters["failed" if failed else "rendered"] += 1
+
+    def _submit(self, user_id, month, output_path, df):
+        """Start a render; returns (future, the process pool it runs in or None)"""
+        if self.max_workers <= 0:
+            loop = asyncio.get_running_loop()
+            return loop.run_in_executor(None, make_report, user_id, month, output_path, df), None
+
+        blob = pack_frame(df)
+        executor = self._pool()
+        try:
+            return executor.submit(render_packed, user_id, month, output_path, blob), executor
+        except BrokenProcessPool:
+            # A worker died since the last render
+            self._discard(executor)
+            executor = self._pool()
+            return executor.submit(render_packed, user_id, month, output_path, blob), executor
+
+    async def render(self, user_id, month, output_path, df):
+        """
+        Render df's report to output_path
+
+        Returns:
+            make_report's result
+
+        Raises:
+            RenderRejected: If the queue is full or the user is at their limit
+            TimeoutError: If the render did not finish within timeout
+            BrokenProcessPool: If a worker died during the render; the pool is replaced
+        """
+        self._reserve(user_id)
+        try:
+            future, executor = self._submit(user_id, month, output_path, df)
+        except BaseException:
+            self._release(user_id, failed=True)
+            raise
+        # The slot is held until the work really ends, even after the caller gave up on it
+        future.add_done_callback(
+            lambda done: self._release(user_id, done.cancelled() or done.exception() is not None))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.counters["timeouts"] += 1
+            raise TimeoutError(f"Report for {month} was not ready after {self.timeout:.0f}s") from None
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def metrics(self):
+        with self._lock:
+            return {"workers": self.max_workers, "pending": self._pending, "max_queue": self.max_queue,
+                    "users": len(self._per_user), **self.counters}
+
+    def shutdown(self):
+        """Stop the worker processes, dropping queued renders; call on app shutdown"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+renderer = ReportRenderer(
+    max_workers=int(os.getenv("REPORT_RENDER_WORKERS", str(min(os.cpu_count() or 1, 4)))),
+    max_queue=int(os.getenv("REPORT_RENDER_QUEUE", "16")),
+    per_user=int(os.getenv("REPORT_RENDER_PER_USER", "1")),
+    timeout=float(os.getenv("REPORT_RENDER_TIMEOUT_SECONDS", "60")),
+)
@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+from databaseDAO.async_db import adb
+from Visuals.Monthly_Report import (
+    REPORTS_QUERY, REPORT_ID_QUERY, REPORT_MONTH_QUERY, DELETE_REPORT_QUERY, report_file, get_data,
+    prepare_report, record_report
+)
+from Visuals.report_renderer import renderer
+
+
+async def get_reports_service(current_user_id):
+    async with adb(dictionary=True) as (conn, cursor):
+        await cursor.execute(REPORTS_QUERY, (current_user_id,))
+        reports = list(await cursor.fetchall())
+
+    return {
+        "success": True,
+        "user_id": current_user_id,
+        "reports": reports,
+        "count": len(reports)
+    }
+
+
+async def generate_report_service(user_id, month):
+    """
+    Generate and store a monthly report
+
+    The month is loaded in a worker thread and rendered by the report
+    process pool, so the PDF layout never holds this process's GIL.
+    """
+    df, output_path, filename = await asyncio.to_thread(prepare_report, user_id, month)
+
+    if not await renderer.render(user_id, month, output_path, df):
+        raise LookupError("No transaction data found or report generation failed")
+
+    return await asyncio.to_thread(record_report, user_id, month, df, filename)
+
+
+async def download_report_service(month, current_user_id):
+    """Path and file name of a stored report; a missing PDF is rendered again by the report process pool"""
+    async with adb() as (conn, cursor):
+        await cursor.execute(REPORT_ID_QUERY, (current_user_id, month))
+        report = await cursor.fetchone()
+
+    if not report:
+        raise ValueError("Report not found in database")
+
+    file_path, filename = report_file(current_user_id, month)
+
+    if not os.path.exists(file_path):
+        df = await asyncio.to_thread(get_data, current_user_id, month)
+        success = df is not None and await renderer.render(current_user_id, month, file_path, df)
+
+        if not success or not os.path.exists(file_path):
+            raise FileNotFoundError("Could not generate report file")
+
+    return file_path, filename
+
+
+async def delete_report_service(report_id: int, user_id: int):
+    async with adb(dictionary=True) as (conn, cursor):
+        await cursor.execute(REPORT_MONTH_QUERY, (report_id, user_id))
+        row = await cursor.fetchone()
+        if not row:
+            raise ValueError("Report not found")
+        month = row["report_month"]
+
+        await cursor.execute(DELETE_REPORT_QUERY, (report_id, user_id))
+        if cursor.rowcount == 0:
+            raise ValueError("Report not found")
+
+    file_path, filename = report_file(user_id, month)
+
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    except Exception:
+        pass
+
+    return {
+        "report_id": report_id,
+        "filename": filename
+    }
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+
+DAILY = "D"
+WEEKLY = "W-MON"
+MONTHLY = "MS"
+
+
+def period_labels(dates, freq=DAILY):
+    """
+    Label of the period each date falls in
+
+    Days are labelled by the day, weeks by the Monday that closes them (the
+    labels resample('W-MON') uses) and months by their first day.
+    """
+    dates = pd.DatetimeIndex(dates).normalize()
+    if freq == DAILY:
+        return dates
+    if freq == WEEKLY:
+        return dates + pd.to_timedelta((7 - dates.weekday) % 7, unit="D")
+    if freq == MONTHLY:
+        return dates.to_period("M").to_timestamp()
+    raise ValueError(f"Unsupported frequency: {freq}")
+
+
+def densify(frame, freq=DAILY, start=None, end=None):
+    """
+    Reindex per-period sums onto every period from start to end, filling gaps with 0
+
+    Args:
+        frame: DataFrame indexed by period label
+        freq: DAILY, WEEKLY or MONTHLY
+        start, end: Dates inside the first and last period; default to the
+            first and last label of frame
+    """
+    if start is None and end is None and frame.empty:
+        return frame
+
+    start = period_labels([start], freq)[0] if start is not None else frame.index.min()
+    end = period_labels([end], freq)[0] if end is not None else frame.index.max()
+    return frame.reindex(pd.date_range(start, end, freq=freq), fill_value=0)
+
+
+def income_expense_series(dates, amounts, freq=DAILY, start=None, end=None):
+    """
+    Dense income and expense totals per day, week or month
+
+    One groupby over the period labels and one reindex, instead of
+    filtering the transactions once per period.
+
+    Args:
+        dates: Transaction dates
+        amounts: Signed amounts, expenses negative
+        freq: DAILY, WEEKLY or MONTHLY
+        start, end: Range to cover; defaults to the dates given
+
+    Returns:
+        DataFrame indexed by period label with income and expenses columns,
+        both positive floats
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    totals = pd.DataFrame({
+        "income": np.clip(amounts, 0.0, None),
+        "expenses": np.clip(-amounts, 0.0, None),
+    })
+    sums = totals.groupby(period_labels(dates, freq)).sum()
+    return densify(sums, freq, start, end)
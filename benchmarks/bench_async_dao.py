@@ -0,0 +1,135 @@
+"""
+Handler latency under many concurrent clients: thread-pool DAO calls vs the async DAO
+
+Usage:
+    python -m benchmarks.bench_async_dao [--fake] [clients] [requests_per_client] [user_id]
+
+Every client awaits the accounts lookup of GET /accounts back to back. The
+"before" path is the previous handler body, run_in_threadpool over the
+blocking DAO, which queues behind the default thread limiter (40 threads)
+and the pool; the "after" path awaits the aiomysql DAO directly. Reported
+are p50/p99/max latency per call and total throughput. Against MySQL the
+user_id should own a few accounts. --fake replaces both drivers with
+connections whose query takes 5 ms (time.sleep vs asyncio.sleep), with
+the same number of connections on each side, so the comparison runs
+without a database.
+"""
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from databaseDAO import async_db, sqlConnector
+from databaseDAO.Account import account_dao, account_dao_async
+from databaseDAO.connection_pool import ManagedPool
+
+QUERY_SECONDS = 0.005
+CONNECTIONS = 20
+ROWS = [{"account_id": 1, "account_name": "Savings", "currency": "SEK"}]
+
+
+class FakeCursor:
+
+    def execute(self, query, params=None):
+        time.sleep(QUERY_SECONDS)
+
+    def fetchall(self):
+        return list(ROWS)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def cursor(self, dictionary=False):
+        return FakeCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeAsyncCursor:
+
+    async def execute(self, query, params=None):
+        await asyncio.sleep(QUERY_SECONDS)
+
+    async def fetchall(self):
+        return list(ROWS)
+
+
+def fake_adb_factory():
+    """adb() stand-in holding one of CONNECTIONS slots per call, like the aiomysql pool"""
+    slots = asyncio.Semaphore(CONNECTIONS)
+
+    @asynccontextmanager
+    async def fake_adb(dictionary=False):
+        async with slots:
+            yield None, FakeAsyncCursor()
+
+    return fake_adb
+
+
+async def measure(call, clients, requests_per_client):
+    latencies = []
+
+    async def client():
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies = np.array(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), latencies.max(), len(latencies) / elapsed
+
+
+async def run(fake, clients, requests_per_client, user_id):
+    async def before():
+        return await run_in_threadpool(account_dao.get_all_accounts, user_id)
+
+    async def after():
+        return await account_dao_async.get_all_accounts(user_id)
+
+    print(f"{clients} clients x {requests_per_client} requests, {'fake' if fake else 'MySQL'} connections")
+    print(f"{'path':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'req/s':>8}")
+    for name, call in (("before", before), ("after", after)):
+        p50, p99, worst, throughput = await measure(call, clients, requests_per_client)
+        print(f"{name:>8} {p50:>8.1f} {p99:>8.1f} {worst:>8.1f} {throughput:>8.0f}")
+    await async_db.close_pool()
+
+
+def main(argv):
+    fake = "--fake" in argv
+    args = [int(arg) for arg in argv if arg != "--fake"]
+    clients = args[0] if args else 500
+    requests_per_client = args[1] if len(args) > 1 else 10
+    user_id = args[2] if len(args) > 2 else 1
+
+    if not fake:
+        asyncio.run(run(fake, clients, requests_per_client, user_id))
+        return
+
+    pool = ManagedPool(FakeConnection, min_size=CONNECTIONS, max_size=CONNECTIONS)
+    with patch.object(sqlConnector, "pool", pool), patch.object(account_dao_async, "adb", fake_adb_factory()):
+        asyncio.run(run(fake, clients, requests_per_client, user_id))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,107 @@
+"""
+Insert throughput of the bulk write strategies against a local MySQL
+
+Usage:
+    DB_HOST=127.0.0.1 DB_USER=root DB_PASSWORD=... DB_NAME=fintracker_test \\
+    DB_LOAD_DATA_LOCAL=1 python -m benchmarks.bench_bulk_insert [rows]
+
+Compares the original path (add_transaction_batch, one connection and
+transaction per 100 rows) with the multi-row INSERT and LOAD DATA writers,
+which use one transaction for the whole load. A throwaway user is created
+and deleted again afterwards. LOAD DATA needs local_infile=ON on the server.
+"""
+import sys
+import time
+
+from databaseDAO.sqlConnector import db, LOAD_DATA_LOCAL
+from databaseDAO.transaction.bulk_writer import bulk_writer, MULTIROW, LOAD_DATA
+from databaseDAO.transaction.importcsv import bankImporter
+from databaseDAO.transaction.transaction_DAO import add_transaction_batch
+
+BENCH_EMAIL = "bench-bulk-insert@example.com"
+CHUNK_ROWS = 10000
+
+
+def create_bench_user():
+    with db() as (conn, cursor):
+        cursor.execute("INSERT INTO users (name, email, password) VALUES (%s, %s, %s)",
+                       ("BenchUser", BENCH_EMAIL, "bench:bench"))
+        user_id = cursor.lastrowid
+        cursor.execute("INSERT INTO category (user_id, name, type) VALUES (%s, %s, %s)",
+                       (user_id, "Bench", "expense"))
+        category_id = cursor.lastrowid
+    return user_id, category_id
+
+
+def delete_bench_user():
+    with db() as (conn, cursor):
+        cursor.execute("SELECT user_id FROM users WHERE email = %s", (BENCH_EMAIL,))
+        row = cursor.fetchone()
+        if not row:
+            return
+        cursor.execute("DELETE FROM transactions WHERE user_id = %s", (row[0],))
+        cursor.execute("DELETE FROM category WHERE user_id = %s", (row[0],))
+        cursor.execute("DELETE FROM users WHERE user_id = %s", (row[0],))
+
+
+def make_rows(user_id, category_id, count, tag):
+    importer = bankImporter(user_id)
+    rows = []
+    for i in range(count):
+        description = f"bench merchant {i % 500}"
+        amount = f"{-(i % 10000) / 100:.2f}"
+        date = f"20{15 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+        transaction_hash = importer._generate_hash(f"{user_id}|{tag}|{description}|{amount}|{date}|{i}")
+        rows.append((user_id, category_id, description[:25], amount, description, date, 0.0, transaction_hash))
+    return rows
+
+
+def run_add_transaction_batch(rows):
+    inserted = 0
+    for start in range(0, len(rows), 100):
+        inserted += add_transaction_batch(rows[start:start + 100])
+    return inserted
+
+
+def run_bulk_writer(strategy, rows):
+    inserted = 0
+    with bulk_writer(strategy) as writer:
+        for start in range(0, len(rows), CHUNK_ROWS):
+            inserted += writer.write(rows[start:start + CHUNK_ROWS])
+    return inserted
+
+
+def main(count=100000):
+    delete_bench_user()
+    user_id, category_id = create_bench_user()
+
+    strategies = [
+        ("executemany", lambda rows: run_add_transaction_batch(rows)),
+        (MULTIROW, lambda rows: run_bulk_writer(MULTIROW, rows)),
+    ]
+    if LOAD_DATA_LOCAL:
+        strategies.append((LOAD_DATA, lambda rows: run_bulk_writer(LOAD_DATA, rows)))
+    else:
+        print("Skipping load_data, set DB_LOAD_DATA_LOCAL=1 to include it")
+
+    print(f"{'strategy':<12} {'rows':>9} {'seconds':>9} {'rows/sec':>10} {'dup rerun s':>12}")
+    try:
+        for name, run in strategies:
+            rows = make_rows(user_id, category_id, count, name)
+
+            start = time.perf_counter()
+            inserted = run(rows)
+            elapsed = time.perf_counter() - start
+
+            # Second pass: every row is a duplicate, which is the re-import case
+            start = time.perf_counter()
+            run(rows)
+            duplicate_elapsed = time.perf_counter() - start
+
+            print(f"{name:<12} {inserted:>9} {elapsed:>9.2f} {count / elapsed:>10,.0f} {duplicate_elapsed:>12.2f}")
+    finally:
+        delete_bench_user()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
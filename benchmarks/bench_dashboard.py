@@ -0,0 +1,95 @@
+"""
+Dashboard totals: Python over every transaction vs SQL aggregation
+
+Usage:
+    DB_HOST=127.0.0.1 DB_USER=root DB_PASSWORD=... DB_NAME=fintracker_test \\
+    python -m benchmarks.bench_dashboard [sizes...]
+
+For each size (default 10k, 100k and 1M transactions) a throwaway user is
+filled up to that many transactions, then the old dashboard path
+(get_all_transactions + sums in Python + [:5]) is timed against
+get_dashboard_summary. The user is deleted again afterwards.
+"""
+import sys
+import time
+
+from databaseDAO.sqlConnector import db
+from databaseDAO.transaction.bulk_writer import bulk_writer, MULTIROW
+from databaseDAO.transaction.transaction_DAO import get_all_transactions, get_dashboard_summary
+from databaseDAO.transaction.transaction_hash import generate_transaction_hash
+
+BENCH_EMAIL = "bench-dashboard@example.com"
+CHUNK_ROWS = 10000
+
+
+def create_bench_user():
+    with db() as (conn, cursor):
+        cursor.execute("INSERT INTO users (name, email, password) VALUES (%s, %s, %s)",
+                       ("BenchUser", BENCH_EMAIL, "bench:bench"))
+        user_id = cursor.lastrowid
+        cursor.execute("INSERT INTO category (user_id, name, type) VALUES (%s, %s, %s)",
+                       (user_id, "Bench", "expense"))
+        category_id = cursor.lastrowid
+    return user_id, category_id
+
+
+def delete_bench_user():
+    with db() as (conn, cursor):
+        cursor.execute("SELECT user_id FROM users WHERE email = %s", (BENCH_EMAIL,))
+        row = cursor.fetchone()
+        if not row:
+            return
+        cursor.execute("DELETE FROM transactions WHERE user_id = %s", (row[0],))
+        cursor.execute("DELETE FROM category WHERE user_id = %s", (row[0],))
+        cursor.execute("DELETE FROM users WHERE user_id = %s", (row[0],))
+
+
+def fill(user_id, category_id, start, stop):
+    with bulk_writer(MULTIROW) as writer:
+        for offset in range(start, stop, CHUNK_ROWS):
+            rows = []
+            for i in range(offset, min(offset + CHUNK_ROWS, stop)):
+                amount = f"{(i % 20000 - 15000) / 100:.2f}"
+                date = f"20{15 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+                description = f"bench merchant {i % 500}"
+                rows.append((user_id, category_id, description[:25], amount, description, date, None,
+                             generate_transaction_hash(f"{user_id}|{description}|{amount}|{date}|{i}")))
+            writer.write(rows)
+
+
+def old_dashboard(user_id):
+    transactions = get_all_transactions(user_id)
+    total_income = sum(float(t['amount']) for t in transactions if float(t['amount']) > 0)
+    total_expenses = sum(abs(float(t['amount'])) for t in transactions if float(t['amount']) < 0)
+    return total_income, total_expenses, transactions[:5]
+
+
+def best_of(func, user_id, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(user_id)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=(10000, 100000, 1000000)):
+    delete_bench_user()
+    user_id, category_id = create_bench_user()
+
+    print(f"{'transactions':>12} {'python ms':>10} {'sql ms':>8} {'speedup':>8}")
+    try:
+        filled = 0
+        for size in sizes:
+            fill(user_id, category_id, filled, size)
+            filled = size
+
+            old = best_of(old_dashboard, user_id, repeat=3 if size >= 1000000 else 5)
+            new = best_of(get_dashboard_summary, user_id)
+            print(f"{size:>12,} {old * 1000:>10.1f} {new * 1000:>8.1f} {old / new:>7.0f}x")
+    finally:
+        delete_bench_user()
+
+
+if __name__ == "__main__":
+    main(tuple(int(size) for size in sys.argv[1:]) or (10000, 100000, 1000000))
@@ -0,0 +1,59 @@
+"""
+Rows/sec of the CSV import row preparation: columnar vs iterrows
+
+Usage:
+    python -m benchmarks.bench_import_csv [rows]
+
+Only parsing, validation and hashing are timed; nothing is written to the
+database.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from databaseDAO.transaction.importcsv import bankImporter
+
+
+def make_statement(rows, seed=42):
+    """Build a bank statement frame shaped like the ones users upload"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365, rows), unit="D")
+    merchants = np.array(["ICA Supermarket", "SL Access", "Spotify", "Salary Deposit",
+                          "Amazon  Marketplace", "ATM Withdrawal", "Systembolaget"])
+    amounts = rng.integers(-500000, 500000, rows) / 100
+    return pd.DataFrame({
+        "Value date": dates.strftime("%Y-%m-%d"),
+        "Text": merchants[rng.integers(0, len(merchants), rows)],
+        "Amount": [f"{a:,.2f}" for a in amounts],
+        "Balance": [f"{b:.2f}" for b in np.cumsum(amounts)],
+    })
+
+
+def time_prepare(prepare, frame, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prepare(frame)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows=50000):
+    frame = make_statement(rows)
+    importer = bankImporter(user_id=1)
+
+    results = [
+        ("iterrows", time_prepare(importer._prepare_rows_iterrows, frame, repeat=1)),
+        ("columnar", time_prepare(importer._prepare_rows, frame)),
+    ]
+
+    print(f"{'path':<10} {'seconds':>10} {'rows/sec':>12}")
+    for name, seconds in results:
+        print(f"{name:<10} {seconds:>10.3f} {rows / seconds:>12,.0f}")
+    print(f"speedup: {results[0][1] / results[1][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,81 @@
+"""
+Login throughput per password hashing cost
+
+Usage:
+    python -m benchmarks.bench_password_hash [logins] [concurrency]
+
+For each scheme and cost setting, `concurrency` clients verify passwords
+through check_password_async(), the path logIn() takes, until `logins`
+verifications are done. The run reports logins per second, latency
+percentiles and the worst event loop stall seen by a 10 ms ticker, which
+stays small because hashing runs on the bounded executor
+(PASSWORD_HASH_WORKERS, default one per CPU). Needs no database.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+from databaseDAO import password_hasher
+from databaseDAO.password_hasher import Pbkdf2Hasher, ScryptHasher, check_password_async
+
+SETTINGS = (
+    ScryptHasher(n=2 ** 12), ScryptHasher(n=2 ** 14), ScryptHasher(n=2 ** 15), ScryptHasher(n=2 ** 16),
+    Pbkdf2Hasher(iterations=100_000), Pbkdf2Hasher(iterations=300_000), Pbkdf2Hasher(iterations=600_000),
+)
+PASSWORD = "Password123!"
+
+
+async def ticker(stalls, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - started - 0.01)
+
+
+async def run(hasher, logins, concurrency):
+    encoded = hasher.hash(PASSWORD)
+    latencies = []
+    remaining = logins
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            matches, _ = await check_password_async(PASSWORD, encoded)
+            assert matches
+            latencies.append(time.perf_counter() - started)
+
+    stalls, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(stalls, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+
+    latencies.sort()
+    return (len(latencies) / elapsed, statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99) - 1] * 1000, max(stalls, default=0) * 1000)
+
+
+def main(argv):
+    logins = int(argv[0]) if argv else 64
+    concurrency = int(argv[1]) if len(argv) > 1 else 16
+
+    print(f"{logins} logins, {concurrency} concurrent, {password_hasher.HASH_WORKERS} hash workers, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'setting':<28}{'logins/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'loop stall ms':>15}")
+    for hasher in SETTINGS:
+        label = f"{hasher.scheme} {'/'.join(map(str, hasher.params()))}"
+        # Verified hashes already use this setting, so no rehash is timed
+        with patch.object(password_hasher, "hasher", hasher):
+            rate, p50, p99, stall = asyncio.run(run(hasher, logins, concurrency))
+        print(f"{label:<28}{rate:>10.1f}{p50:>10.1f}{p99:>10.1f}{stall:>15.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,114 @@
+"""
+Connection pool load test: throughput and acquire waits versus pool size
+
+Usage:
+    python -m benchmarks.bench_pool [--fake] [workers] [seconds]
+
+Each worker thread loops over db() running a query that holds the
+connection for about 5 ms (SELECT SLEEP(0.005)), the shape of a typical
+dashboard query. For every pool size the run reports queries per second
+and the acquire-wait percentiles from the pool's own histogram. --fake
+swaps MySQL for connections that sleep in execute(), so the pool itself
+can be measured without a database.
+"""
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+from databaseDAO import sqlConnector
+from databaseDAO.connection_pool import ManagedPool
+
+POOL_SIZES = (1, 2, 4, 8, 16)
+QUERY = "SELECT SLEEP(0.005)"
+QUERY_SECONDS = 0.005
+
+
+class FakeCursor:
+
+    def execute(self, query, params=None):
+        time.sleep(QUERY_SECONDS)
+
+    def fetchall(self):
+        return [(0,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    in_transaction = False
+
+    def cursor(self, dictionary=False):
+        return FakeCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def run(pool, workers, seconds):
+    done = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def worker():
+        nonlocal done
+        count = 0
+        while time.perf_counter() < stop_at:
+            with sqlConnector.db() as (conn, cursor):
+                cursor.execute(QUERY)
+                cursor.fetchall()
+            count += 1
+        with lock:
+            done += count
+
+    with patch.object(sqlConnector, "pool", pool):
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return done / seconds
+
+
+def percentile_ms(histogram, fraction):
+    """Upper bound of the bucket holding the given fraction of observations"""
+    target = histogram["count"] * fraction
+    seen = 0
+    for label, count in histogram["buckets"].items():
+        seen += count
+        if seen >= target:
+            return label[3:]
+    return "-"
+
+
+def main(argv):
+    fake = "--fake" in argv
+    args = [arg for arg in argv if arg != "--fake"]
+    workers = int(args[0]) if args else 16
+    seconds = float(args[1]) if len(args) > 1 else 3.0
+    connect = FakeConnection if fake else sqlConnector.pool.connect
+
+    print(f"{workers} workers, {seconds:.0f}s per size, {'fake' if fake else 'MySQL'} connections")
+    print(f"{'pool size':>9} {'queries/s':>10} {'wait p50':>9} {'wait p99':>9} {'timeouts':>9}")
+    for size in POOL_SIZES:
+        pool = ManagedPool(connect, min_size=size, max_size=size, timeout=30)
+        throughput = run(pool, workers, seconds)
+        metrics = pool.metrics()
+        wait = metrics["acquire_wait"]
+        print(f"{size:>9} {throughput:>10.0f} {percentile_ms(wait, 0.5):>9} "
+              f"{percentile_ms(wait, 0.99):>9} {metrics['timeouts']:>9}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
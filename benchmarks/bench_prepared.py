@@ -0,0 +1,60 @@
+"""
+Single-row lookups: text protocol vs cached server-side prepared statements
+
+Usage:
+    python -m benchmarks.bench_prepared [lookups] [user_id]
+
+Runs get_account-style primary key lookups on one pooled connection, first
+as plain text queries (parsed by MySQL on every call), then through db(),
+which runs the registered GET_ACCOUNT_QUERY as a prepared statement.
+Needs the configured MySQL database; user_id should own an account.
+"""
+import sys
+import time
+
+from databaseDAO import sqlConnector, statement_cache
+from databaseDAO.Account.account_dao import GET_ACCOUNT_QUERY
+
+
+def time_lookups(run_lookup, lookups):
+    started = time.perf_counter()
+    for _ in range(lookups):
+        run_lookup()
+    return (time.perf_counter() - started) / lookups * 1e6
+
+
+def main(argv):
+    lookups = int(argv[0]) if argv else 5000
+    user_id = int(argv[1]) if len(argv) > 1 else 1
+
+    with sqlConnector.db(dictionary=True) as (conn, cursor):
+        cursor.execute("SELECT account_id FROM account WHERE user_id = %s LIMIT 1", (user_id,))
+        row = cursor.fetchone()
+    if not row:
+        sys.exit(f"User {user_id} has no accounts")
+    params = (row["account_id"], user_id)
+
+    with sqlConnector.db(dictionary=True) as (conn, cursor):
+        # A plain cursor of the same connection sends the query as text every time
+        text_cursor = conn.cursor(dictionary=True)
+
+        def text_lookup():
+            text_cursor.execute(GET_ACCOUNT_QUERY, params)
+            text_cursor.fetchone()
+
+        def prepared_lookup():
+            cursor.execute(GET_ACCOUNT_QUERY, params)
+            cursor.fetchone()
+
+        text_us = time_lookups(text_lookup, lookups)
+        prepared_us = time_lookups(prepared_lookup, lookups)
+        text_cursor.close()
+
+    print(f"{lookups} lookups of one account row")
+    print(f"  text protocol:      {text_us:8.1f} us/lookup")
+    print(f"  prepared statement: {prepared_us:8.1f} us/lookup ({text_us / prepared_us:.2f}x)")
+    print(f"  cache: {statement_cache.stats.to_dict()['hit_ratio']:.4f} hit ratio")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+"""
+Login rate limiter load test: memory with millions of distinct emails
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [emails] [capacity] [--sqlite]
+
+Counts one attempt for each of `emails` distinct addresses, the shape of a
+credential-stuffing run, on a simulated clock that crosses several
+windows. Every tenth of the run prints the keys held, the process RSS and
+the attempt rate. With the in-memory store the key count stops at
+`capacity` and RSS flattens once it is reached. --sqlite runs the same
+load against a temporary SQLite file, whose rows are purged a window
+after they were last touched.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from databaseDAO.rate_limiter import MemoryStore, RateLimiter, SQLiteStore
+
+WINDOW_SECONDS = 900
+WINDOWS_CROSSED = 6
+
+
+def rss_mb():
+    """Current resident set size; Linux only, 0 elsewhere"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return 0.0
+
+
+def held(store):
+    if isinstance(store, SQLiteStore):
+        return store._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+    return len(store)
+
+
+def run(store, emails):
+    limiter = RateLimiter(store, limit=5, window_seconds=WINDOW_SECONDS)
+    start = 1_000 * WINDOW_SECONDS
+    step = WINDOW_SECONDS * WINDOWS_CROSSED / emails
+    report_every = max(emails // 10, 1)
+
+    print(f"{'emails':>10}{'keys held':>12}{'rss MB':>10}{'attempts/s':>12}")
+    started = time.perf_counter()
+    for i in range(1, emails + 1):
+        limiter.hit(f"user{i}@example.com", start + i * step)
+        if i % report_every == 0:
+            rate = i / (time.perf_counter() - started)
+            print(f"{i:>10}{held(store):>12}{rss_mb():>10.1f}{rate:>12.0f}")
+
+
+def main(argv):
+    sqlite = "--sqlite" in argv
+    argv = [arg for arg in argv if arg != "--sqlite"]
+    emails = int(argv[0]) if argv else (200_000 if sqlite else 2_000_000)
+    capacity = int(argv[1]) if len(argv) > 1 else 100_000
+
+    print(f"{emails} distinct emails over {WINDOWS_CROSSED} windows of {WINDOW_SECONDS}s")
+    if sqlite:
+        with tempfile.TemporaryDirectory() as directory:
+            run(SQLiteStore(os.path.join(directory, "limits.sqlite3")), emails)
+    else:
+        print(f"memory store, capacity {capacity}")
+        run(MemoryStore(capacity), emails)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+"""
+Report rendering throughput and CPU scaling per worker process count
+
+Usage:
+    python -m benchmarks.bench_report_render [reports] [max_workers]
+
+Renders `reports` monthly PDFs (default 1000) from synthetic months of
+about 80 transactions, through ReportRenderer as the generate endpoint
+does. It runs once in threads of this process, the old path, and then
+with 1, 2, 4, ... worker processes up to max_workers (default the CPU
+count). Each run prints wall time, reports per second, speedup over one
+process and the CPU seconds the renders used. Needs no database.
+"""
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from Visuals.report_renderer import ReportRenderer
+
+MERCHANTS = ("ICA", "Coop", "SL", "Spotify", "Netflix", "Systembolaget", "Max", "Pressbyran", "Hemkop", "Apotek")
+
+
+def synthetic_month(rng, month="2024-03", transactions=80):
+    days = pd.Timestamp(f"{month}-01") + pd.to_timedelta(rng.integers(0, 28, transactions), unit="D")
+    cents = rng.integers(-150_000, 20_000, transactions)
+    cents[:2] = rng.integers(2_000_000, 4_000_000, 2)
+    return pd.DataFrame({
+        "transaction_date": days.sort_values(),
+        "cents": np.abs(cents),
+        "name": rng.choice(MERCHANTS, transactions),
+        "description": [None] * transactions,
+        "type": np.where(cents < 0, "expense", "income"),
+    })
+
+
+@contextmanager
+def quiet_stdout():
+    """Send stdout of this process and the workers it starts to /dev/null"""
+    sys.stdout.flush()
+    saved, devnull = os.dup(1), os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def cpu_seconds():
+    """User plus system time of this process and its finished children"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+async def render_all(renderer, frames, directory):
+    return await asyncio.gather(*(
+        renderer.render(user_id, "2024-03", os.path.join(directory, f"report_{user_id}.pdf"), df)
+        for user_id, df in enumerate(frames)
+    ))
+
+
+def run(workers, frames):
+    renderer = ReportRenderer(max_workers=workers, max_queue=len(frames), timeout=3600)
+    cpu_before = cpu_seconds()
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        results = asyncio.run(render_all(renderer, frames, directory))
+        elapsed = time.perf_counter() - started
+        # Workers are only counted in RUSAGE_CHILDREN once they have exited
+        if renderer._executor is not None:
+            renderer._executor.shutdown(wait=True)
+    assert all(results)
+    return elapsed, cpu_seconds() - cpu_before
+
+
+def main(argv):
+    reports = int(argv[0]) if argv else 1000
+    max_workers = int(argv[1]) if len(argv) > 1 else os.cpu_count() or 1
+
+    rng = np.random.default_rng(7)
+    frames = [synthetic_month(rng) for _ in range(reports)]
+    counts = [0] + [2 ** i for i in range(max_workers.bit_length()) if 2 ** i <= max_workers]
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    print(f"{reports} reports, {os.cpu_count()} CPUs")
+    print(f"{'workers':>10}{'wall s':>10}{'reports/s':>12}{'speedup':>10}{'cpu s':>10}")
+    single = None
+    for workers in counts:
+        # make_report prints a line per report
+        with quiet_stdout():
+            elapsed, cpu = run(workers, frames)
+        if workers == 1:
+            single = elapsed
+        speedup = f"{single / elapsed:.2f}x" if single else "-"
+        label = workers if workers else "threads"
+        print(f"{label:>10}{elapsed:>10.1f}{reports / elapsed:>12.1f}{speedup:>10}{cpu:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+"""
+Daily chart series for the monthly report: per-day mask loop vs one groupby
+
+Usage:
+    python -m benchmarks.bench_time_series [transactions per month...]
+
+The loop is the previous Monthly_Report.prepared_for_chart, kept here for
+comparison; it filtered the daily totals once for every day of the month.
+Nothing touches the database.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from Visuals.Monthly_Report import prepared_for_chart
+
+
+def prepared_for_chart_loop(df):
+    expenses_df = df[df['type'] == 'expense'].copy()
+    income_df = df[df['type'] == 'income'].copy()
+
+    daily_expenses = expenses_df.groupby('transaction_date')['amount'].sum().reset_index()
+    daily_income = income_df.groupby('transaction_date')['amount'].sum().reset_index()
+
+    first_date = df['transaction_date'].min()
+    last_day = pd.Period(first_date, freq='M').days_in_month
+    all_days = pd.date_range(start=first_date.replace(day=1), periods=last_day, freq='D')
+
+    expense_amounts = []
+    income_amounts = []
+    day_labels = []
+    for day in all_days:
+        expense_val = daily_expenses[daily_expenses['transaction_date'] == day]['amount'].sum()
+        income_val = daily_income[daily_income['transaction_date'] == day]['amount'].sum()
+        expense_amounts.append(float(expense_val) if expense_val > 0 else 0)
+        income_amounts.append(float(income_val) if income_val > 0 else 0)
+        day_labels.append(str(day.day))
+
+    return {'expense_amounts': expense_amounts, 'income_amounts': income_amounts,
+            'day_labels': day_labels, 'dates': all_days.tolist()}
+
+
+def make_month(rows, seed=42):
+    """A month of transactions shaped like Monthly_Report.get_data's frame, plus the old float amount"""
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(-200000, 100000, rows) / 100
+    return pd.DataFrame({
+        'transaction_date': pd.Timestamp("2025-03-01") + pd.to_timedelta(rng.integers(0, 31, rows), unit="D"),
+        'amount': np.abs(amounts),
+        'cents': np.rint(np.abs(amounts) * 100).astype(np.int64),
+        'type': np.where(amounts < 0, 'expense', 'income'),
+    })
+
+
+def best_of(func, df, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=(1000, 5000, 20000)):
+    print(f"{'rows':>7} {'loop ms':>9} {'groupby ms':>11} {'speedup':>8}")
+    for rows in sizes:
+        df = make_month(rows)
+        old, new = prepared_for_chart_loop(df), prepared_for_chart(df)
+        assert np.allclose(old['expense_amounts'], new['expense_amounts'])
+        assert np.allclose(old['income_amounts'], new['income_amounts'])
+        assert old['day_labels'] == new['day_labels']
+
+        loop = best_of(prepared_for_chart_loop, df)
+        grouped = best_of(prepared_for_chart, df)
+        print(f"{rows:>7} {loop * 1000:>9.1f} {grouped * 1000:>11.2f} {loop / grouped:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(tuple(int(size) for size in sys.argv[1:]) or (1000, 5000, 20000))
@@ -0,0 +1,110 @@
+"""
+Index size and insert throughput of hex vs binary transaction hashes
+
+Usage:
+    DB_HOST=127.0.0.1 DB_USER=root DB_PASSWORD=... DB_NAME=fintracker_test \\
+    python -m benchmarks.bench_transaction_hash [rows]
+
+Hashing speed of every format/algorithm is measured without a database.
+Then the same rows are inserted into two scratch tables shaped like
+transactions, one with the old VARCHAR(250) hex hash and one with
+BINARY(16), and the size of each uniq_user_tx index is read from
+mysql.innodb_index_stats. The scratch tables are dropped afterwards.
+"""
+import sys
+import time
+
+from databaseDAO.sqlConnector import db
+from databaseDAO.transaction.transaction_hash import (
+    generate_transaction_hash, HEX, BINARY16, BINARY32, SHA256, BLAKE2B
+)
+
+CHUNK_ROWS = 2000
+USERS = 100
+
+TABLES = {
+    "bench_hash_hex": ("VARCHAR(250)", HEX),
+    "bench_hash_bin16": ("BINARY(16)", BINARY16),
+}
+
+
+def make_keys(count):
+    return [f"{i % USERS + 1}|bench merchant {i % 500}|{-(i % 10000) / 100:.2f}|"
+            f"20{15 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}|{i}" for i in range(count)]
+
+
+def bench_hashing(keys):
+    print(f"{'format':<10} {'algorithm':<9} {'hashes/sec':>12}")
+    for hash_format, algorithm in [(HEX, SHA256), (BINARY32, SHA256), (BINARY16, SHA256),
+                                   (BINARY16, BLAKE2B)]:
+        start = time.perf_counter()
+        for key in keys:
+            generate_transaction_hash(key, hash_format, algorithm)
+        elapsed = time.perf_counter() - start
+        print(f"{hash_format:<10} {algorithm:<9} {len(keys) / elapsed:>12,.0f}")
+
+
+def create_table(cursor, name, column_type):
+    cursor.execute(f"DROP TABLE IF EXISTS {name}")
+    cursor.execute(f"""
+        CREATE TABLE {name}(
+            transaction_id INT PRIMARY KEY AUTO_INCREMENT,
+            user_id INT NOT NULL,
+            amount DECIMAL(12,2) NOT NULL,
+            transaction_date DATE,
+            transaction_hash {column_type} NULL,
+            CONSTRAINT uniq_user_tx UNIQUE (user_id, transaction_hash)
+        )""")
+
+
+def insert_rows(name, rows):
+    query = f"INSERT IGNORE INTO {name} (user_id, amount, transaction_date, transaction_hash) VALUES "
+    start = time.perf_counter()
+    for offset in range(0, len(rows), CHUNK_ROWS):
+        chunk = rows[offset:offset + CHUNK_ROWS]
+        with db() as (conn, cursor):
+            cursor.execute(query + ",".join(["(%s,%s,%s,%s)"] * len(chunk)),
+                           [value for row in chunk for value in row])
+    return time.perf_counter() - start
+
+
+def index_size(name):
+    with db() as (conn, cursor):
+        cursor.execute(f"ANALYZE TABLE {name}")
+        cursor.fetchall()
+        cursor.execute("""
+            SELECT stat_value * @@innodb_page_size
+            FROM mysql.innodb_index_stats
+            WHERE database_name = DATABASE() AND table_name = %s
+              AND index_name = 'uniq_user_tx' AND stat_name = 'size'
+            """, (name,))
+        row = cursor.fetchone()
+    return int(row[0]) if row else 0
+
+
+def main(count=200000):
+    keys = make_keys(count)
+    bench_hashing(keys)
+
+    print(f"\n{'table':<18} {'rows':>9} {'insert s':>9} {'rows/sec':>10} {'index MB':>9}")
+    try:
+        for name, (column_type, hash_format) in TABLES.items():
+            with db() as (conn, cursor):
+                create_table(cursor, name, column_type)
+
+            rows = []
+            for key in keys:
+                user_id, _, amount, date, _ = key.split("|")
+                rows.append((int(user_id), amount, date, generate_transaction_hash(key, hash_format)))
+
+            elapsed = insert_rows(name, rows)
+            size = index_size(name)
+            print(f"{name:<18} {count:>9} {elapsed:>9.2f} {count / elapsed:>10,.0f} {size / 1024 / 1024:>9.1f}")
+    finally:
+        with db() as (conn, cursor):
+            for name in TABLES:
+                cursor.execute(f"DROP TABLE IF EXISTS {name}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,114 @@
+"""
+Weekly income/expense chart over multi-year ranges: Python aggregators vs native reductions
+
+Usage:
+    python -m benchmarks.bench_weekly_chart [years...]
+
+The "before" path is the previous weekly chart pipeline, kept here for
+comparison: resample('W-MON') with Python-callable aggregators over Decimal
+amounts, then converter.convert() per week and per field. The "after" path
+converts amounts to float once, sums the clipped columns per week and
+converts the whole frame with one multiply. Rates are fixed in memory;
+nothing touches the network or the database.
+"""
+import contextlib
+import io
+import sys
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from Visuals.ExchangeRates import ExchangeRates
+from Visuals.time_series import income_expense_series, WEEKLY
+
+RATES = {"SEK": 10.87, "USD": 1.0}
+TRANSACTIONS_PER_DAY = 40
+
+
+def incoming_funds(amounts):
+    total = 0
+    for amount in amounts:
+        if amount >= 0:
+            total += amount
+    return total
+
+
+def outgoing_funds(amounts):
+    total = 0
+    for amount in amounts:
+        if amount < 0:
+            total += abs(amount)
+    return total
+
+
+def weekly_chart_before(dates, amounts, converter):
+    df = pd.DataFrame({"Date": dates, "Amount": amounts}).set_index("Date")
+    weekly = df.resample("W-MON").agg({"Amount": [incoming_funds, outgoing_funds]})
+    weekly = weekly.reset_index()
+    weekly.columns = ["Date", "Income", "Expenses"]
+    weekly["Net"] = weekly["Income"] - weekly["Expenses"]
+
+    weekly_data = []
+    for _, row in weekly.iterrows():
+        income = converter.convert(float(row["Income"]), "SEK", "USD")
+        expenses = converter.convert(float(row["Expenses"]), "SEK", "USD")
+        net = converter.convert(float(row["Net"]), "SEK", "USD")
+        weekly_data.append({"date": row["Date"].strftime("%Y-%m-%d"), "income": round(income, 2),
+                            "expenses": round(expenses, 2), "net": round(net, 2)})
+    return weekly_data
+
+
+def weekly_chart_after(dates, amounts, converter):
+    weekly = income_expense_series(dates, np.asarray(amounts, dtype=float), WEEKLY)
+    weekly["net"] = weekly["income"] - weekly["expenses"]
+    amounts = converter.convert_many(weekly[["income", "expenses", "net"]].to_numpy(), "SEK", "USD")
+    return [
+        {"date": week.strftime("%Y-%m-%d"), "income": income, "expenses": expenses, "net": net}
+        for week, (income, expenses, net) in zip(weekly.index, amounts.tolist())
+    ]
+
+
+def make_range(years, seed=42):
+    """Transactions as the DB returns them: dates and Decimal amounts"""
+    rng = np.random.default_rng(seed)
+    rows = int(years * 365 * TRANSACTIONS_PER_DAY)
+    days = rng.integers(0, int(years * 365), rows)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(days, unit="D")
+    amounts = [Decimal(cents) / 100 for cents in rng.integers(-200000, 100000, rows).tolist()]
+    return dates, amounts
+
+
+def best_of(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(years=(1, 3, 5)):
+    converter = ExchangeRates()
+    print(f"{'years':>5} {'rows':>8} {'weeks':>6} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+    with patch.object(converter, "get_rates", return_value=RATES):
+        for span in years:
+            dates, amounts = make_range(span)
+            with contextlib.redirect_stdout(io.StringIO()):
+                old = weekly_chart_before(dates, amounts, converter)
+                new = weekly_chart_after(dates, amounts, converter)
+            assert [w["date"] for w in old] == [w["date"] for w in new]
+            for field in ("income", "expenses", "net"):
+                assert np.allclose([w[field] for w in old], [w[field] for w in new], atol=0.011)
+
+            before = best_of(weekly_chart_before, dates, amounts, converter)
+            after = best_of(weekly_chart_after, dates, amounts, converter)
+            print(f"{span:>5g} {len(amounts):>8} {len(new):>6} {before * 1000:>10.1f} "
+                  f"{after * 1000:>9.2f} {before / after:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(tuple(float(span) for span in sys.argv[1:]) or (1, 3, 5))
@@ -43,14 +43,61 @@ CREATE TABLE IF NOT EXISTS transactions(
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     transaction_date DATE,
     balance decimal(15,2),
-    transaction_hash VARCHAR(250) NULL,
+    transaction_hash BINARY(16) NULL,
     CONSTRAINT uniq_user_tx UNIQUE (user_id, transaction_hash),
+    INDEX idx_tx_user_date (user_id, transaction_date, transaction_id),
+    INDEX idx_tx_user_category_date (user_id, category_id, transaction_date, transaction_id),
+    INDEX idx_tx_user_date_cover (user_id, transaction_date, amount, category_id, name, description),
     FOREIGN KEY (user_id) references users(user_id),
     FOREIGN KEY (category_id) references category(category_id)
 );
 
 
 
+-- Per-user income/expense aggregates, kept in step with transactions by
+-- databaseDAO/transaction/rollup_DAO.py. period is day, week or month;
+-- period_date is the day, the Monday closing the week, or the first of the month.
+CREATE TABLE IF NOT EXISTS transaction_rollups(
+    user_id INT NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_date DATE NOT NULL,
+    income DECIMAL(15,2) NOT NULL DEFAULT 0,
+    expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+    income_count INT NOT NULL DEFAULT 0,
+    expense_count INT NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    min_amount DECIMAL(12,2),
+    max_amount DECIMAL(12,2),
+    PRIMARY KEY (user_id, period, period_date),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS category_rollups(
+    user_id INT NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_date DATE NOT NULL,
+    category_id INT NOT NULL,
+    income DECIMAL(15,2) NOT NULL DEFAULT 0,
+    expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, period, period_date, category_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS merchant_rollups(
+    user_id INT NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_date DATE NOT NULL,
+    merchant VARCHAR(100) NOT NULL,
+    income DECIMAL(15,2) NOT NULL DEFAULT 0,
+    expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, period, period_date, merchant),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+
+
 CREATE TABLE IF NOT EXISTS budget(
     budget_id INT PRIMARY KEY AUTO_INCREMENT,
     user_id INT NOT NULL,
@@ -75,5 +122,19 @@ CREATE TABLE IF NOT EXISTS reports
     INDEX idx_user_date (user_id, generated_at DESC)
 );
 
+-- Units of currency per 1 USD on rate_date, for as-of conversions
+CREATE TABLE IF NOT EXISTS exchange_rate_history(
+    currency CHAR(3) NOT NULL,
+    rate_date DATE NOT NULL,
+    rate DECIMAL(20,10) NOT NULL,
+    PRIMARY KEY (currency, rate_date)
+);
 
-
+-- Login attempt counters for RATE_LIMIT_BACKEND=mysql
+CREATE TABLE IF NOT EXISTS login_rate_limits(
+    limit_key VARCHAR(255) NOT NULL PRIMARY KEY,
+    window_index BIGINT NOT NULL,
+    current_count INT NOT NULL DEFAULT 0,
+    previous_count INT NOT NULL DEFAULT 0,
+    INDEX idx_login_rate_limits_window (window_index)
+);
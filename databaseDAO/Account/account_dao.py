@@ -1,7 +1,20 @@
 
 from databaseDAO.sqlConnector import db
-from databaseDAO.userDAO import hashAgain
-
+from databaseDAO.statement_cache import prepared_statement
+from databaseDAO.password_hasher import verify_password
+
+GET_ACCOUNT_QUERY = prepared_statement("""
+    SELECT account_id,
+           account_name,
+           account_type,
+           account_balance,
+           currency,
+           platform_name,
+           created_at
+    FROM account
+    WHERE account_id = %s
+      AND user_id = %s
+    """)
 
 
 def addAccount(userid, name, type, balance, currency, platform_name):
@@ -91,11 +104,7 @@ def delete_account(current_user_id: int, account_id: int, password: str) -> bool
             print(f"No user found with ID {current_user_id}")
             return False
 
-        stored_pw = row["password"]
-        salt, real_hash_pw = stored_pw.split(":")
-        password_hash = hashAgain(salt, password)
-
-        if real_hash_pw != password_hash:
+        if not verify_password(password, row["password"]):
             print(f"Incorrect password for user {current_user_id}")
             return False
 
@@ -129,8 +138,8 @@ def update_account(account_id, userid, name=None, accountType=None, balance=None
             values.append(name)
 
         if accountType is not None:
-            is_valid, normalized_type = checkaccountType(accountType)
-            if not is_valid:
+            normalized_type, type_msg = checkaccountType(accountType)
+            if normalized_type is False:
                 return False
             update.append("account_type = %s")
             values.append(normalized_type)
@@ -233,18 +242,7 @@ def get_account(account_id: int, current_user_id: int):
     """
 
     with db(dictionary=True) as (conn, cursor):
-        cursor.execute("""
-                           SELECT account_id,
-                                  account_name,
-                                  account_type,
-                                  account_balance,
-                                  currency,
-                                  platform_name,
-                                  created_at
-                           FROM account
-                           WHERE account_id = %s
-                             AND user_id = %s
-                           """, (account_id, current_user_id))
+        cursor.execute(GET_ACCOUNT_QUERY, (account_id, current_user_id))
 
         account = cursor.fetchone()
 
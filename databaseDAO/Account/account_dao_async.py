@@ -0,0 +1,107 @@
+from databaseDAO.async_db import adb
+from databaseDAO.Account.account_dao import check_balance, checkaccountType, GET_ACCOUNT_QUERY
+from databaseDAO.password_hasher import verify_password_async
+
+
+async def addAccount(userid, name, type, balance, currency, platform_name):
+    balance, balance_msg = check_balance(balance)
+    if balance is False:
+        return False
+
+    type, type_msg = checkaccountType(type)
+    if type is False:
+        return False
+    async with adb() as (conn, cursor):
+        query = ("INSERT INTO account (user_id, account_name, account_type, account_balance, currency, platform_name) "
+                 "VALUES (%s,%s,%s,%s,%s,%s)")
+        await cursor.execute(query, (userid, name, type, balance, currency, platform_name))
+        return True
+
+
+async def delete_account(current_user_id: int, account_id: int, password: str) -> bool:
+    """Delete an account that belongs to current_user_id, after checking their password"""
+    async with adb(dictionary=True) as (conn, cursor):
+        await cursor.execute("SELECT user_id FROM account WHERE account_id = %s", (account_id,))
+        row = await cursor.fetchone()
+
+        if not row:
+            return False
+
+        if row["user_id"] != current_user_id:
+            return False
+
+        await cursor.execute("SELECT password FROM users WHERE user_id = %s", (current_user_id,))
+        row = await cursor.fetchone()
+
+        if not row:
+            return False
+
+        if not await verify_password_async(password, row["password"]):
+            return False
+
+        await cursor.execute("DELETE FROM account WHERE account_id = %s AND user_id = %s",
+                             (account_id, current_user_id))
+
+        if cursor.rowcount == 0:
+            return False
+
+        return True
+
+
+async def update_account(account_id, userid, name=None, accountType=None, balance=None, currency=None,
+                         platform_name=None):
+    update = []
+    values = []
+
+    if name is not None:
+        update.append("account_name = %s")
+        values.append(name)
+
+    if accountType is not None:
+        normalized_type, type_msg = checkaccountType(accountType)
+        if normalized_type is False:
+            return False
+        update.append("account_type = %s")
+        values.append(normalized_type)
+
+    if balance is not None:
+        normalized_balance, balance_msg = check_balance(balance)
+        if normalized_balance is False:
+            return False
+        update.append("account_balance = %s")
+        values.append(normalized_balance)
+
+    if currency is not None:
+        update.append("currency = %s")
+        values.append(currency)
+
+    if platform_name is not None:
+        update.append("platform_name = %s")
+        values.append(platform_name)
+
+    if not update:
+        return False
+
+    values.extend([account_id, userid])
+
+    async with adb() as (conn, cursor):
+        await cursor.execute("SELECT 1 FROM account WHERE account_id = %s AND user_id = %s", (account_id, userid))
+        if not await cursor.fetchone():
+            return False
+
+        await cursor.execute(f"UPDATE account SET {', '.join(update)} WHERE account_id = %s AND user_id = %s",
+                             tuple(values))
+        return cursor.rowcount > 0
+
+
+async def get_all_accounts(current_user_id: int):
+    async with adb(dictionary=True) as (_, cursor):
+        await cursor.execute("SELECT * FROM account WHERE user_id=%s", (current_user_id,))
+        return list(await cursor.fetchall())
+
+
+async def get_account(account_id: int, current_user_id: int):
+    """A single account of the user, or None"""
+    async with adb(dictionary=True) as (conn, cursor):
+        await cursor.execute(GET_ACCOUNT_QUERY, (account_id, current_user_id))
+        return await cursor.fetchone()
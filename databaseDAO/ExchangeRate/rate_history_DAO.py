@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+from datetime import date
+
+from databaseDAO.sqlConnector import db
+
+PIVOT_CURRENCY = "USD"
+
+SAVE_RATES_QUERY = """
+    INSERT INTO exchange_rate_history (currency, rate_date, rate)
+    VALUES (%s, %s, %s) AS new
+    ON DUPLICATE KEY UPDATE rate = new.rate
+    """
+
+# Rates from the latest one on or before start_date up to end_date, for one currency
+HISTORY_QUERY = """
+    SELECT currency, rate_date, rate
+    FROM exchange_rate_history
+    WHERE currency = %s
+      AND rate_date <= %s
+      AND rate_date >= COALESCE((SELECT MAX(rate_date) FROM exchange_rate_history
+                                 WHERE currency = %s AND rate_date <= %s), %s)
+    """
+
+
+def save_rates(rate_date, rates, base_currency=PIVOT_CURRENCY):
+    """
+    Store one day's rates, converted to units per 1 USD
+
+    Args:
+        rate_date: Day the rates are valid for
+        rates: Dictionary where 1 base_currency = X other_currency
+        base_currency: Base of rates; needs a USD rate unless it is USD
+
+    Returns:
+        Number of currencies stored
+    """
+    rates = dict(rates)
+    rates[base_currency] = 1.0
+    if PIVOT_CURRENCY not in rates:
+        raise ValueError(f"Rates based on {base_currency} have no {PIVOT_CURRENCY} rate")
+
+    pivot_rate = rates[PIVOT_CURRENCY]
+    rows = [(code.upper(), rate_date, rate / pivot_rate)
+            for code, rate in rates.items() if len(code) == 3 and rate]
+    with db() as (conn, cursor):
+        cursor.executemany(SAVE_RATES_QUERY, rows)
+    return len(rows)
+
+
+def get_rate_history(currencies, start_date, end_date):
+    """
+    Stored rates of the given currencies between start_date and end_date
+
+    Each currency also gets its latest rate before start_date, so every day
+    in the range has a rate to fall back on when one exists.
+
+    Returns:
+        List of (currency, rate_date, rate) tuples, rate per 1 USD
+    """
+    currencies = sorted({code.upper() for code in currencies})
+    if not currencies:
+        return []
+
+    query = " UNION ALL ".join([HISTORY_QUERY] * len(currencies)) + " ORDER BY rate_date"
+    values = []
+    for code in currencies:
+        values.extend([code, end_date, code, start_date, start_date])
+
+    with db() as (conn, cursor):
+        cursor.execute(query, values)
+        return cursor.fetchall()
+
+
+def load_snapshot(path):
+    """
+    Store a rate snapshot file shaped like the exchange rate API response
+
+    The file holds {"base": "USD", "date": "YYYY-MM-DD", "rates": {...}}.
+
+    Returns:
+        Number of currencies stored
+    """
+    with open(path, encoding='utf-8') as snapshot_file:
+        snapshot = json.load(snapshot_file)
+    rate_date = date.fromisoformat(snapshot['date'][:10])
+    count = save_rates(rate_date, snapshot['rates'], snapshot.get('base', PIVOT_CURRENCY).upper())
+    print(f"Loaded {count} rates for {rate_date} from {path}")
+    return count
+
+
+def load_snapshots(paths):
+    """Load snapshot files, and every .json file in the given directories"""
+    loaded = 0
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".json"))
+        else:
+            files = [path]
+        for file_path in files:
+            loaded += load_snapshot(file_path)
+    return loaded
+
+
+if __name__ == "__main__":
+    # python -m databaseDAO.ExchangeRate.rate_history_DAO snapshot.json|directory [...]
+    load_snapshots(sys.argv[1:])
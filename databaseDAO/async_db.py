@@ -0,0 +1,139 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+import aiomysql
+
+from databaseDAO.sqlConnector import DB_CONFIG
+
+# aiomysql pools belong to the event loop that created them, so one is
+# created on first use in each loop (in practice, the app's only loop).
+_pool = None
+_pool_loop = None
+_pool_lock = None
+
+
+async def get_pool():
+    global _pool, _pool_loop, _pool_lock
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop:
+        return _pool
+
+    if _pool_loop is not loop:
+        _pool, _pool_loop, _pool_lock = None, loop, asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await aiomysql.create_pool(
+                minsize=int(os.getenv('DB_ASYNC_POOL_MIN_SIZE', '1')),
+                maxsize=int(os.getenv('DB_ASYNC_POOL_MAX_SIZE', '20')),
+                pool_recycle=int(float(os.getenv('DB_POOL_MAX_LIFETIME_SECONDS', '3600'))),
+                host=DB_CONFIG['host'],
+                port=DB_CONFIG['port'],
+                user=DB_CONFIG['user'],
+                password=DB_CONFIG['password'] or '',
+                db=DB_CONFIG['database'],
+                charset='utf8mb4',
+                autocommit=False,
+            )
+    return _pool
+
+
+async def close_pool():
+    """Close the pool of the running loop, e.g. from the app lifespan"""
+    global _pool
+    if _pool is not None and _pool_loop is asyncio.get_running_loop():
+        pool, _pool = _pool, None
+        pool.close()
+        await pool.wait_closed()
+
+
+class AsyncUnitOfWork:
+    """UnitOfWork for adb(): one aiomysql connection and transaction, checked out on first use"""
+
+    def __init__(self):
+        self.conn = None
+        self.pool = None
+        self.closed = False
+
+    async def connection(self):
+        if self.conn is None:
+            self.pool = await get_pool()
+            self.conn = await self.pool.acquire()
+        return self.conn
+
+    async def finish(self, commit=True):
+        self.closed = True
+        conn, self.conn = self.conn, None
+        if conn is None:
+            return
+        try:
+            if commit:
+                await conn.commit()
+            else:
+                await conn.rollback()
+        finally:
+            self.pool.release(conn)
+
+
+current_async_unit_of_work = ContextVar("async_unit_of_work", default=None)
+
+
+@asynccontextmanager
+async def async_unit_of_work():
+    """Run the block as one unit of work for adb(); inside an existing unit, join it"""
+    work = current_async_unit_of_work.get()
+    if work is not None and not work.closed:
+        yield work
+        return
+
+    work = AsyncUnitOfWork()
+    token = current_async_unit_of_work.set(work)
+    succeeded = False
+    try:
+        yield work
+        succeeded = True
+    finally:
+        current_async_unit_of_work.reset(token)
+        await work.finish(commit=succeeded)
+
+
+@asynccontextmanager
+async def adb(dictionary=False):
+    """
+    Async counterpart of db(): yields (conn, cursor), commits on success
+    and rolls back on error; inside a unit of work the unit does both
+    """
+    work = current_async_unit_of_work.get()
+    if work is not None and not work.closed:
+        conn = await work.connection()
+        cursor = await conn.cursor(aiomysql.DictCursor if dictionary else aiomysql.Cursor)
+        try:
+            yield conn, cursor
+        finally:
+            try:
+                await cursor.close()
+            except Exception:
+                pass
+        return
+
+    pool = await get_pool()
+    conn = await pool.acquire()
+    cursor = None
+    try:
+        cursor = await conn.cursor(aiomysql.DictCursor if dictionary else aiomysql.Cursor)
+        yield conn, cursor
+        await conn.commit()
+    except BaseException:
+        try:
+            await conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        if cursor is not None:
+            try:
+                await cursor.close()
+            except Exception:
+                pass
+        pool.release(conn)
@@ -0,0 +1,260 @@
+import bisect
+import threading
+import time
+from collections import deque
+
+from mysql.connector.errors import PoolError
+
+
+# Upper bounds, in milliseconds, of the wait and checkout histogram buckets
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolTimeout(PoolError):
+    """No connection became free within the acquire timeout"""
+
+
+class Histogram:
+    """Counts of observed durations per bucket, plus their count and sum"""
+
+    def __init__(self, buckets_ms=HISTOGRAM_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds):
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+
+    def to_dict(self):
+        labels = [f"le_{bound}ms" for bound in self.buckets_ms] + ["le_inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+        }
+
+
+class PooledConnection:
+    """
+    A checked-out connection; close() hands it back to the pool
+
+    Everything else is passed through to the underlying connection, so DAO
+    code uses it like a plain mysql.connector connection.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+        self.checked_out_at = None
+        # StatementCache of the session, set up by sqlConnector on first use
+        self.statements = None
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self.checked_out_at is not None:
+            self._pool.release(self)
+
+
+class ManagedPool:
+    """
+    Connection pool that waits for a free connection instead of failing
+
+    Connections are opened lazily, up to max_size, and idle ones above
+    min_size are closed after max_idle seconds. Connections older than
+    max_lifetime are replaced, and idle ones are pinged before reuse once
+    they have sat for validate_after seconds.
+
+    Args:
+        connect: Callable returning a new DB-API connection
+        min_size: Idle connections kept open once created
+        max_size: Most connections open at once
+        timeout: Seconds acquire() waits before raising PoolTimeout
+        max_idle: Seconds an idle connection above min_size is kept
+        max_lifetime: Seconds after which a connection is replaced
+        validate_after: Idle seconds after which a connection is pinged
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=30.0, max_idle=300.0, max_lifetime=3600.0,
+                 validate_after=30.0):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._queue = deque()
+
+        self.acquire_wait = Histogram()
+        self.checkout_duration = Histogram()
+        self.counters = {"acquired": 0, "timeouts": 0, "created": 0, "closed_idle": 0, "closed_expired": 0,
+                         "closed_invalid": 0, "connect_errors": 0}
+
+    def acquire(self, timeout=None):
+        """
+        Check out a connection, waiting up to timeout seconds for one to free up
+
+        Raises:
+            PoolTimeout: If none became free in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            connection = None
+            with self._condition:
+                expired = self._shrink(time.monotonic())
+                # First come, first served: a caller only proceeds from the head
+                # of the queue, so a thread that just released cannot barge ahead
+                ticket = object()
+                self._queue.append(ticket)
+                try:
+                    while self._queue[0] is not ticket or (not self._idle and self._size >= self.max_size):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.counters["timeouts"] += 1
+                            raise PoolTimeout(f"No connection free after {timeout:.1f}s "
+                                              f"(pool size {self._size}, in use {self._in_use})")
+                        self._condition.wait(remaining)
+                finally:
+                    self._queue.remove(ticket)
+                    self._condition.notify_all()
+
+                if self._idle:
+                    connection = self._idle.pop()
+                else:
+                    # Reserve the slot, then connect outside the lock
+                    self._size += 1
+
+            for stale in expired:
+                self._close_raw(stale)
+            if connection is None:
+                connection = self._open()
+            elif not self._usable(connection):
+                continue
+
+            with self._condition:
+                self._in_use += 1
+                self.counters["acquired"] += 1
+                now = time.monotonic()
+                connection.checked_out_at = now
+                self.acquire_wait.observe(now - started)
+            return connection
+
+    def release(self, connection):
+        """Return a checked-out connection; any open transaction is rolled back"""
+        try:
+            if connection._raw.in_transaction:
+                connection._raw.rollback()
+        except Exception:
+            self._discard(connection, "closed_invalid", in_use=True)
+            return
+
+        with self._condition:
+            now = time.monotonic()
+            self.checkout_duration.observe(now - connection.checked_out_at)
+            connection.checked_out_at = None
+            connection.released_at = now
+            self._in_use -= 1
+            self._idle.append(connection)
+            expired = self._shrink(now)
+            self._condition.notify_all()
+
+        for stale in expired:
+            self._close_raw(stale)
+
+    def metrics(self):
+        with self._condition:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": len(self._queue),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self.counters,
+                "acquire_wait": self.acquire_wait.to_dict(),
+                "checkout_duration": self.checkout_duration.to_dict(),
+            }
+
+    def close_all(self):
+        """Close every idle connection, e.g. on shutdown; checked-out ones are left alone"""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for connection in idle:
+            self._close_raw(connection)
+
+    def _open(self):
+        try:
+            connection = PooledConnection(self, self.connect())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self.counters["connect_errors"] += 1
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self.counters["created"] += 1
+        return connection
+
+    def _usable(self, connection):
+        """Drop an idle connection that is too old or fails a ping; it is not in use yet"""
+        now = time.monotonic()
+        if now - connection.created_at >= self.max_lifetime:
+            self._discard(connection, "closed_expired")
+            return False
+        if now - connection.released_at >= self.validate_after:
+            try:
+                alive = connection._raw.is_connected()
+            except Exception:
+                alive = False
+            if not alive:
+                self._discard(connection, "closed_invalid")
+                return False
+        return True
+
+    def _shrink(self, now):
+        """Take idle connections above min_size that sat for max_idle; call with the lock held"""
+        expired = []
+        # The oldest idle connections are at the left, the next to be reused at the right
+        while self._size > self.min_size and self._idle and now - self._idle[0].released_at >= self.max_idle:
+            expired.append(self._idle.popleft())
+            self._size -= 1
+            self.counters["closed_idle"] += 1
+        return expired
+
+    def _discard(self, connection, reason, in_use=False):
+        with self._condition:
+            self._size -= 1
+            if in_use:
+                self._in_use -= 1
+            self.counters[reason] += 1
+            self._condition.notify_all()
+        self._close_raw(connection)
+
+    @staticmethod
+    def _close_raw(connection):
+        try:
+            connection._raw.close()
+        except Exception:
+            pass
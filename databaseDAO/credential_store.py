@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from mysql.connector import errorcode
+from mysql.connector.errors import IntegrityError
+
+from databaseDAO.statement_cache import prepared_statement
+
+CREDENTIALS_QUERY = prepared_statement("SELECT user_id, password FROM users WHERE email = %s")
+INSERT_USER_QUERY = "INSERT INTO users(name, email, password) VALUES (%s,%s,%s)"
+# Only replaces the hash that was verified, so a concurrent password change wins
+REHASH_QUERY = "UPDATE users SET password = %s WHERE user_id = %s AND password = %s"
+
+
+class NegativeLookups:
+    """
+    Emails recently looked up and not found, least recently used dropped first
+
+    Lets repeated failed logins for unknown emails be answered without a
+    query. Each process has its own, so a user registered through another
+    process is only found once their entry expires after ttl seconds; keep
+    ttl short. A capacity of 0 turns the cache off.
+    """
+
+    def __init__(self, capacity=1024, ttl=5.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(email):
+        # users.email compares case-insensitively
+        return email.strip().lower()
+
+    def __contains__(self, email):
+        key = self._key(email)
+        with self._lock:
+            added = self._entries.get(key)
+            if added is None:
+                return False
+            if time.monotonic() - added >= self.ttl:
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, email):
+        if self.capacity <= 0:
+            return
+        key = self._key(email)
+        with self._lock:
+            self._entries[key] = time.monotonic()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def discard(self, email):
+        with self._lock:
+            self._entries.pop(self._key(email), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Off unless LOGIN_NEGATIVE_CACHE_SIZE is set
+unknown_emails = NegativeLookups(int(os.getenv("LOGIN_NEGATIVE_CACHE_SIZE", "0")),
+                                 float(os.getenv("LOGIN_NEGATIVE_CACHE_SECONDS", "5")))
+
+
+def remember_lookup(email, row):
+    """
+    Record the outcome of a credentials lookup
+
+    Returns:
+        (user_id, password_hash), or None if the email is unknown
+    """
+    if row is None:
+        unknown_emails.add(email)
+        return None
+    return row[0], row[1]
+
+
+def fetch_credentials(cursor, email):
+    """
+    Fetch the user id and password hash for an email in one indexed lookup
+
+    Returns:
+        (user_id, password_hash), or None if the email is unknown
+    """
+    cursor.execute(CREDENTIALS_QUERY, (email,))
+    return remember_lookup(email, cursor.fetchone())
+
+
+def insert_user(cursor, name, email, password_hash):
+    """
+    Insert a user; the unique key on users.email decides whether the email is taken
+
+    Returns:
+        True if the user was inserted, False if the email is already registered
+    """
+    try:
+        cursor.execute(INSERT_USER_QUERY, (name, email, password_hash))
+    except IntegrityError as e:
+        if e.errno != errorcode.ER_DUP_ENTRY:
+            raise
+        return False
+    unknown_emails.discard(email)
+    return True
+
+
+def store_rehash(cursor, user_id, old_hash, new_hash):
+    """Replace a verified password hash with one using the current scheme and cost"""
+    cursor.execute(REHASH_QUERY, (new_hash, user_id, old_hash))
@@ -0,0 +1,39 @@
+from mysql.connector import errorcode
+from pymysql.err import IntegrityError
+
+from databaseDAO.credential_store import (
+    CREDENTIALS_QUERY, INSERT_USER_QUERY, REHASH_QUERY, remember_lookup, unknown_emails
+)
+
+
+async def fetch_credentials(cursor, email):
+    """
+    Fetch the user id and password hash for an email in one indexed lookup
+
+    Returns:
+        (user_id, password_hash), or None if the email is unknown
+    """
+    await cursor.execute(CREDENTIALS_QUERY, (email,))
+    return remember_lookup(email, await cursor.fetchone())
+
+
+async def insert_user(cursor, name, email, password_hash):
+    """
+    Insert a user; the unique key on users.email decides whether the email is taken
+
+    Returns:
+        True if the user was inserted, False if the email is already registered
+    """
+    try:
+        await cursor.execute(INSERT_USER_QUERY, (name, email, password_hash))
+    except IntegrityError as e:
+        if e.args[0] != errorcode.ER_DUP_ENTRY:
+            raise
+        return False
+    unknown_emails.discard(email)
+    return True
+
+
+async def store_rehash(cursor, user_id, old_hash, new_hash):
+    """Replace a verified password hash with one using the current scheme and cost"""
+    await cursor.execute(REHASH_QUERY, (new_hash, user_id, old_hash))
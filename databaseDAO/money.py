@@ -0,0 +1,125 @@
+from decimal import Decimal, InvalidOperation
+from functools import total_ordering
+
+import numpy as np
+
+
+MINOR_UNITS = 100
+CENT = Decimal("0.01")
+
+
+def cents_sql(expression):
+    """SQL that returns a DECIMAL(…, 2) expression as a whole number of cents"""
+    return f"CAST(ROUND({expression} * {MINOR_UNITS}) AS SIGNED)"
+
+
+@total_ordering
+class Money:
+    """
+    An amount as a whole number of minor units (öre/cents)
+
+    DAOs emit and accept Money, so amounts are parsed once and added as
+    integers. Use str() for the DB and CSV wire format ("-12.50"),
+    format() for display and float() only at the JSON boundary.
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        self.cents = int(cents)
+
+    @classmethod
+    def of(cls, value):
+        """
+        Money from a Money, Decimal, int, float or numeric string
+
+        Raises:
+            ValueError: If value is not a number
+        """
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, (float, np.floating)):
+            value = repr(float(value))
+        try:
+            amount = Decimal(str(value).replace(',', '').strip()).quantize(CENT)
+        except InvalidOperation as e:
+            raise ValueError(f"Invalid amount: {value!r}") from e
+        return cls(amount.scaleb(2))
+
+    def to_decimal(self):
+        return Decimal(self.cents).scaleb(-2)
+
+    def __str__(self):
+        sign = "-" if self.cents < 0 else ""
+        units, cents = divmod(abs(self.cents), MINOR_UNITS)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self):
+        return f"Money({str(self)})"
+
+    def __format__(self, spec):
+        return format(self.to_decimal(), spec) if spec else str(self)
+
+    def __float__(self):
+        return self.cents / MINOR_UNITS
+
+    def __int__(self):
+        return self.cents
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        if isinstance(other, (int, Decimal)):
+            return self.to_decimal() == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        if isinstance(other, (int, Decimal)):
+            return self.to_decimal() < other
+        return NotImplemented
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        if other == 0:
+            # Lets sum() start from 0
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+
+def cents_array(values):
+    """
+    Amounts as an int64 NumPy array of cents, for bulk analytics
+
+    Accepts Money, Decimal, int or float values. Decimals with two places
+    survive the float step exactly; rint removes the binary fraction.
+    """
+    if isinstance(next(iter(values), None), Money):
+        return np.fromiter((value.cents for value in values), dtype=np.int64, count=len(values))
+    return np.rint(np.asarray(values, dtype=np.float64) * MINOR_UNITS).astype(np.int64)
+
+
+def to_units(cents):
+    """Cents (scalar, array, Series or DataFrame) as float units, for charts and JSON"""
+    return np.divide(cents, MINOR_UNITS)
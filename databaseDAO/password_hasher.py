@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+# Stored hashes are "<scheme>$<cost parameters>$<salt>$<hash>", hex encoded.
+# Hashes from before this module are "<salt>:<sha256 hex>" and are only verified,
+# then replaced on the next successful login.
+
+
+class PasswordHasher(ABC):
+    """Hashes passwords with one scheme and cost; verifies any supported format"""
+
+    scheme = None
+
+    @abstractmethod
+    def hash(self, password):
+        """Hash password with a new salt, as "<scheme>$<params>$<salt>$<hash>" """
+
+    @classmethod
+    @abstractmethod
+    def verify(cls, password, encoded):
+        """Check password against a hash of this scheme, with the cost stored in it"""
+
+    @abstractmethod
+    def params(self):
+        """Cost parameters, as stored between the scheme and the salt"""
+
+    def needs_rehash(self, encoded):
+        """True if encoded uses another scheme or cost than this hasher"""
+        return encoded.split("$")[:-2] != [self.scheme, *map(str, self.params())]
+
+
+class ScryptHasher(PasswordHasher):
+    """Memory-hard scrypt; memory use is about 128 * n * r bytes per hash"""
+
+    scheme = "scrypt"
+
+    def __init__(self, n=2 ** 14, r=8, p=1):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def params(self):
+        return self.n, self.r, self.p
+
+    def _derive(self, password, salt):
+        return hashlib.scrypt(password.encode(), salt=salt, n=self.n, r=self.r, p=self.p,
+                              maxmem=128 * self.r * (self.n + self.p + 2) + 1024, dklen=32)
+
+    def hash(self, password):
+        salt = os.urandom(16)
+        return f"{self.scheme}${self.n}${self.r}${self.p}${salt.hex()}${self._derive(password, salt).hex()}"
+
+    @classmethod
+    def verify(cls, password, encoded):
+        _, n, r, p, salt, digest = encoded.split("$")
+        derived = cls(int(n), int(r), int(p))._derive(password, bytes.fromhex(salt))
+        return hmac.compare_digest(derived.hex(), digest)
+
+
+class Pbkdf2Hasher(PasswordHasher):
+    """Iterated PBKDF2-HMAC-SHA256, for hosts where scrypt's memory use is too much"""
+
+    scheme = "pbkdf2_sha256"
+
+    def __init__(self, iterations=600_000):
+        self.iterations = iterations
+
+    def params(self):
+        return (self.iterations,)
+
+    def _derive(self, password, salt):
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations)
+
+    def hash(self, password):
+        salt = os.urandom(16)
+        return f"{self.scheme}${self.iterations}${salt.hex()}${self._derive(password, salt).hex()}"
+
+    @classmethod
+    def verify(cls, password, encoded):
+        _, iterations, salt, digest = encoded.split("$")
+        derived = cls(int(iterations))._derive(password, bytes.fromhex(salt))
+        return hmac.compare_digest(derived.hex(), digest)
+
+
+def verify_legacy(password, encoded):
+    """Check a "<salt>:<sha256 hex>" hash"""
+    salt, digest = encoded.split(":")
+    return hmac.compare_digest(hashlib.sha256((salt + password).encode()).hexdigest(), digest)
+
+
+HASHERS = {hasher.scheme: hasher for hasher in (ScryptHasher, Pbkdf2Hasher)}
+
+
+def hasher_from_env():
+    """
+    The hasher for new hashes, from PASSWORD_HASHER (scrypt or pbkdf2_sha256)
+    and its cost variables
+    """
+    scheme = os.getenv("PASSWORD_HASHER", ScryptHasher.scheme)
+    if scheme == ScryptHasher.scheme:
+        return ScryptHasher(int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14))),
+                            int(os.getenv("PASSWORD_SCRYPT_R", "8")),
+                            int(os.getenv("PASSWORD_SCRYPT_P", "1")))
+    if scheme == Pbkdf2Hasher.scheme:
+        return Pbkdf2Hasher(int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000")))
+    raise ValueError(f"Unknown PASSWORD_HASHER {scheme!r}, expected one of {', '.join(HASHERS)}")
+
+
+hasher = hasher_from_env()
+
+# hashlib releases the GIL while scrypt and PBKDF2 run, so worker threads hash in
+# parallel; the bound keeps a burst of logins from taking every core
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+def hash_password(password):
+    return hasher.hash(password)
+
+
+def verify_password(password, encoded):
+    """Check a password against a stored hash in any supported format"""
+    scheme = encoded.split("$", 1)[0]
+    if scheme in HASHERS:
+        return HASHERS[scheme].verify(password, encoded)
+    if ":" in encoded:
+        return verify_legacy(password, encoded)
+    return False
+
+
+# One throwaway hash per hasher, made on first use
+_dummy_hashes = {}
+
+
+def verify_dummy(password):
+    """
+    Verify password against a throwaway hash from the current hasher, always False
+
+    Logins for unknown emails call this so they take as long as a wrong
+    password for a registered one, and timing does not reveal which
+    emails have accounts.
+    """
+    current = hasher
+    if current not in _dummy_hashes:
+        _dummy_hashes[current] = current.hash(os.urandom(16).hex())
+    verify_password(password, _dummy_hashes[current])
+    return False
+
+
+def check_password(password, encoded):
+    """
+    Verify a password and upgrade its hash if the scheme or cost changed
+
+    Returns:
+        (matches, new_hash); new_hash is None unless the stored hash should be replaced
+    """
+    if not verify_password(password, encoded):
+        return False, None
+    return True, hasher.hash(password) if hasher.needs_rehash(encoded) else None
+
+
+async def hash_password_async(password):
+    """hash_password() on the hashing executor, off the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(executor, hash_password, password)
+
+
+async def verify_password_async(password, encoded):
+    return await asyncio.get_running_loop().run_in_executor(executor, verify_password, password, encoded)
+
+
+async def verify_dummy_async(password):
+    return await asyncio.get_running_loop().run_in_executor(executor, verify_dummy, password)
+
+
+async def check_password_async(password, encoded):
+    return await asyncio.get_running_loop().run_in_executor(executor, check_password, password, encoded)
@@ -0,0 +1,241 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from databaseDAO.sqlConnector import db
+
+# Sliding window counter: each key keeps the attempt count of the current fixed
+# window and of the one before it. The previous count is weighted by how much
+# of it still overlaps the sliding window, which bounds the state per key to
+# three numbers however many attempts are made.
+
+
+def roll(window, current, previous, now_window):
+    """Move a key's counts forward to now_window; returns (current, previous)"""
+    if window == now_window:
+        return current, previous
+    if window == now_window - 1:
+        return 0, current
+    return 0, 0
+
+
+def allows(current, previous, overlap, limit):
+    """True if one more attempt stays under limit"""
+    return previous * overlap + current < limit
+
+
+class RateLimitStore(ABC):
+    """Where attempt counts live; attempt() must be atomic per key"""
+
+    # Whether attempt() does I/O, so async callers run it in a thread
+    blocking = False
+
+    @abstractmethod
+    def attempt(self, key, now_window, overlap, limit):
+        """
+        Count an attempt for key if it is allowed
+
+        Args:
+            now_window: Index of the current fixed window
+            overlap: Share of the previous window still inside the sliding window
+            limit: Attempts allowed per sliding window
+
+        Returns:
+            True if the attempt was allowed and counted
+        """
+
+    @abstractmethod
+    def reset(self, key):
+        """Forget key's attempts, e.g. after a successful login"""
+
+
+class MemoryStore(RateLimitStore):
+    """
+    Counts in this process, for a single worker
+
+    Keys untouched for two windows are dropped and at most capacity keys are
+    kept, least recently used dropped first, so memory stays flat however
+    many distinct emails are tried. A flood of new keys can push out an older
+    key's count early; use a shared store where that matters.
+    """
+
+    def __init__(self, capacity=100_000):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def attempt(self, key, now_window, overlap, limit):
+        with self._lock:
+            entry = self._entries.get(key)
+            current, previous = roll(*entry, now_window) if entry else (0, 0)
+            allowed = allows(current, previous, overlap, limit)
+            if allowed:
+                current += 1
+            self._entries[key] = (now_window, current, previous)
+            self._entries.move_to_end(key)
+            self._evict(now_window)
+            return allowed
+
+    def _evict(self, now_window):
+        # The least recently touched keys are at the left
+        while self._entries and (len(self._entries) > self.capacity or
+                                 next(iter(self._entries.values()))[0] < now_window - 1):
+            self._entries.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteStore(RateLimitStore):
+    """Counts in a SQLite file, shared by the workers of one host"""
+
+    blocking = True
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS rate_limits("
+                               "limit_key TEXT PRIMARY KEY, window_index INTEGER NOT NULL, "
+                               "current_count INTEGER NOT NULL, previous_count INTEGER NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_window ON rate_limits(window_index)")
+        self._purged_window = None
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def attempt(self, key, now_window, overlap, limit):
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front, so the read and update are atomic across processes
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self._purged_window != now_window:
+                connection.execute("DELETE FROM rate_limits WHERE window_index < ?", (now_window - 1,))
+                self._purged_window = now_window
+            row = connection.execute("SELECT window_index, current_count, previous_count FROM rate_limits "
+                                     "WHERE limit_key = ?", (key,)).fetchone()
+            current, previous = roll(*row, now_window) if row else (0, 0)
+            allowed = allows(current, previous, overlap, limit)
+            connection.execute("INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?)",
+                               (key, now_window, current + allowed, previous))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed
+
+    def reset(self, key):
+        self._connection().execute("DELETE FROM rate_limits WHERE limit_key = ?", (key,))
+
+
+class MySQLStore(RateLimitStore):
+    """Counts in the login_rate_limits table, shared by every worker and host"""
+
+    blocking = True
+
+    # Rolls the row forward (or creates it) and locks it for the rest of the transaction.
+    # ON DUPLICATE KEY UPDATE assigns left to right, so later columns still see the old window_index.
+    ROLL_QUERY = """
+        INSERT INTO login_rate_limits (limit_key, window_index, current_count, previous_count)
+        VALUES (%s, %s, 0, 0) AS new
+        ON DUPLICATE KEY UPDATE
+            previous_count = IF(window_index = new.window_index, previous_count,
+                                IF(window_index = new.window_index - 1, current_count, 0)),
+            current_count = IF(window_index = new.window_index, current_count, 0),
+            window_index = new.window_index
+    """
+
+    def __init__(self, purge_every=1000):
+        self.purge_every = purge_every
+        self._attempts = 0
+
+    def attempt(self, key, now_window, overlap, limit):
+        with db() as (conn, cursor):
+            cursor.execute(self.ROLL_QUERY, (key, now_window))
+            cursor.execute("SELECT current_count, previous_count FROM login_rate_limits WHERE limit_key = %s",
+                           (key,))
+            current, previous = cursor.fetchone()
+            allowed = allows(current, previous, overlap, limit)
+            if allowed:
+                cursor.execute("UPDATE login_rate_limits SET current_count = current_count + 1 "
+                               "WHERE limit_key = %s", (key,))
+
+        self._attempts += 1
+        if self._attempts % self.purge_every == 0:
+            with db() as (conn, cursor):
+                cursor.execute("DELETE FROM login_rate_limits WHERE window_index < %s", (now_window - 1,))
+        return allowed
+
+    def reset(self, key):
+        with db() as (conn, cursor):
+            cursor.execute("DELETE FROM login_rate_limits WHERE limit_key = %s", (key,))
+
+
+class RateLimiter:
+    """
+    Allows limit attempts per key in any window of window_seconds
+
+    Args:
+        store: RateLimitStore holding the counts
+        limit: Attempts allowed per sliding window
+        window_seconds: Length of the sliding window
+    """
+
+    def __init__(self, store, limit=5, window_seconds=900):
+        self.store = store
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    @staticmethod
+    def _key(key):
+        # Emails compare case-insensitively in users, so they share a counter
+        return key.strip().lower()
+
+    def hit(self, key, now=None):
+        """Count an attempt; returns False if key is over its limit"""
+        now_window, into = divmod(time.time() if now is None else now, self.window_seconds)
+        return self.store.attempt(self._key(key), int(now_window), 1 - into / self.window_seconds, self.limit)
+
+    def reset(self, key):
+        self.store.reset(self._key(key))
+
+    async def hit_async(self, key):
+        if self.store.blocking:
+            return await asyncio.to_thread(self.hit, key)
+        return self.hit(key)
+
+    async def reset_async(self, key):
+        if self.store.blocking:
+            return await asyncio.to_thread(self.reset, key)
+        return self.reset(key)
+
+
+def get_rate_limit_store() -> RateLimitStore:
+    """
+    The store named by RATE_LIMIT_BACKEND: memory (default), sqlite
+    (RATE_LIMIT_SQLITE_PATH) or mysql
+    """
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if backend == "memory":
+        return MemoryStore(int(os.getenv("RATE_LIMIT_MEMORY_SIZE", "100000")))
+    if backend == "sqlite":
+        return SQLiteStore(os.getenv("RATE_LIMIT_SQLITE_PATH", "rate_limits.sqlite3"))
+    if backend == "mysql":
+        return MySQLStore()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend!r}, expected memory, sqlite or mysql")
+
+
+login_limiter = RateLimiter(get_rate_limit_store(), int(os.getenv("LOGIN_RATE_LIMIT", "5")),
+                            int(os.getenv("LOGIN_RATE_WINDOW_SECONDS", "900")))
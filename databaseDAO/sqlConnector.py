@@ -1,34 +1,130 @@
 import os
+import tempfile
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
 
+import mysql.connector
 from dotenv import load_dotenv
-from mysql.connector.pooling import MySQLConnectionPool
+
+from databaseDAO.connection_pool import ManagedPool
+from databaseDAO.statement_cache import StatementCache, StatementCursor
 
 
 load_dotenv()
 
+# LOAD DATA LOCAL INFILE is only allowed for files in the temp directory,
+# which is where the bulk import writer stages its rows.
+LOAD_DATA_LOCAL = os.getenv('DB_LOAD_DATA_LOCAL', '0') == '1'
 
-pool = MySQLConnectionPool(
-    pool_name="mypool",
-    pool_size=int(os.getenv('DB_POOL_SIZE', 1)),
-    pool_reset_session=True,
+DB_CONFIG = dict(
     host=os.getenv('DB_HOST', 'localhost'),
     port=int(os.getenv('DB_PORT', '3306')),
     user=os.getenv('DB_USER', os.environ.get("MYSQL_USER")),
     password=os.getenv('DB_PASSWORD', os.environ.get("MYSQL_PASSWORD")),
     database=os.getenv('DB_NAME', os.environ.get("MYSQL_DB")),
+    allow_local_infile_in_path=tempfile.gettempdir() if LOAD_DATA_LOCAL else None,
+)
+
+# Connections are opened on first use; DB_POOL_SIZE is the old name of the maximum
+pool = ManagedPool(
+    partial(mysql.connector.connect, **DB_CONFIG),
+    min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+    max_size=int(os.getenv('DB_POOL_MAX_SIZE', os.getenv('DB_POOL_SIZE', '10'))),
+    timeout=float(os.getenv('DB_POOL_TIMEOUT', '30')),
+    max_idle=float(os.getenv('DB_POOL_MAX_IDLE_SECONDS', '300')),
+    max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME_SECONDS', '3600')),
+    validate_after=float(os.getenv('DB_POOL_VALIDATE_AFTER_SECONDS', '30')),
 )
 
+# Prepared statements kept per connection for queries registered with prepared_statement()
+PREPARED_CACHE_SIZE = int(os.getenv('DB_PREPARED_CACHE_SIZE', '32'))
+
 def get_connection():
-    return pool.get_connection()
+    return pool.acquire()
+
+
+def _cursor(conn, dictionary):
+    statements = getattr(conn, "statements", None)
+    if not isinstance(statements, StatementCache):
+        statements = conn.statements = StatementCache(conn, PREPARED_CACHE_SIZE)
+    return StatementCursor(conn.cursor(dictionary=dictionary), statements, dictionary)
+
+
+class UnitOfWork:
+    """
+    One pooled connection and transaction shared by every db() call made
+    while the unit is current
+
+    The connection is checked out on first use and committed, or rolled
+    back, by finish(). DAO calls in a unit must run one at a time.
+    """
+
+    def __init__(self):
+        self.conn = None
+        self.closed = False
+
+    def connection(self):
+        if self.conn is None:
+            self.conn = get_connection()
+        return self.conn
+
+    def finish(self, commit=True):
+        self.closed = True
+        conn, self.conn = self.conn, None
+        if conn is None:
+            return
+        try:
+            if commit:
+                conn.commit()
+            else:
+                conn.rollback()
+        finally:
+            conn.close()
+
+
+current_unit_of_work = ContextVar("unit_of_work", default=None)
+
+
+@contextmanager
+def unit_of_work():
+    """Run the block as one unit of work; inside an existing unit, join it"""
+    work = current_unit_of_work.get()
+    if work is not None and not work.closed:
+        yield work
+        return
+
+    work = UnitOfWork()
+    token = current_unit_of_work.set(work)
+    succeeded = False
+    try:
+        yield work
+        succeeded = True
+    finally:
+        current_unit_of_work.reset(token)
+        work.finish(commit=succeeded)
+
 
 @contextmanager
 def db(dictionary=False):
+    work = current_unit_of_work.get()
+    if work is not None and not work.closed:
+        # Commit and rollback are left to the unit of work
+        cursor = _cursor(work.connection(), dictionary)
+        try:
+            yield work.conn, cursor
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        return
+
     conn = None
     cursor = None
     try:
         conn = get_connection()
-        cursor = conn.cursor(dictionary=dictionary)
+        cursor = _cursor(conn, dictionary)
         yield conn, cursor
         conn.commit()
     except Exception:
@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict
+
+# Registered hot queries, keyed by their text. The value is the one string
+# object executed for that text: mysql-connector reuses a prepared cursor's
+# statement only when it is handed the very same object again.
+_statements = {}
+
+
+def prepared_statement(query):
+    """
+    Register a hot query; db() cursors run it as a server-side prepared statement
+
+    Returns:
+        The query, to be kept as a module constant and executed as usual
+    """
+    return _statements.setdefault(query, query)
+
+
+class StatementStats:
+    """Hit, miss and eviction counts per registered query, over all connections"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, query, outcome):
+        with self._lock:
+            counts = self._counts.setdefault(query, {"hits": 0, "misses": 0, "evictions": 0})
+            counts[outcome] += 1
+
+    def to_dict(self):
+        with self._lock:
+            statements = [{"query": " ".join(query.split()), **counts} for query, counts in self._counts.items()]
+        hits = sum(statement["hits"] for statement in statements)
+        lookups = hits + sum(statement["misses"] for statement in statements)
+        return {
+            "hits": hits,
+            "misses": lookups - hits,
+            "evictions": sum(statement["evictions"] for statement in statements),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "statements": sorted(statements, key=lambda statement: -(statement["hits"] + statement["misses"])),
+        }
+
+
+stats = StatementStats()
+
+
+class StatementCache:
+    """
+    Prepared statements of one connection, least recently used evicted first
+
+    Each registered query gets its own prepared cursor, so it is parsed by
+    the server once per connection and then only executed through the
+    binary protocol. Evicting a cursor closes it, which deallocates the
+    statement on the server.
+    """
+
+    def __init__(self, connection, capacity=32):
+        self.connection = connection
+        self.capacity = capacity
+        self._cursors = OrderedDict()
+
+    def run(self, query, params=None, dictionary=False):
+        """
+        Execute a registered query and fetch all its rows
+
+        Returns:
+            (rows, rowcount, lastrowid)
+        """
+        statement = _statements[query]
+        key = (statement, dictionary)
+        cursor = self._cursors.get(key)
+        if cursor is None:
+            stats.record(statement, "misses")
+            cursor = self.connection.cursor(prepared=True, dictionary=dictionary)
+            self._cursors[key] = cursor
+            if len(self._cursors) > self.capacity:
+                (evicted, _), evicted_cursor = self._cursors.popitem(last=False)
+                stats.record(evicted, "evictions")
+                evicted_cursor.close()
+        else:
+            stats.record(statement, "hits")
+            self._cursors.move_to_end(key)
+
+        try:
+            cursor.execute(statement, tuple(params or ()))
+            # Rows are read right away so the connection is free for the next statement
+            rows = cursor.fetchall() if cursor.description else []
+        except Exception:
+            # The statement may be gone, e.g. after a lost connection; prepare it again next time
+            self._cursors.pop(key, None)
+            try:
+                cursor.close()
+            except Exception:
+                pass
+            raise
+        return rows, cursor.rowcount, cursor.lastrowid
+
+    def __len__(self):
+        return len(self._cursors)
+
+
+class StatementCursor:
+    """
+    Cursor handed out by db(): registered queries go through the
+    connection's StatementCache, everything else through a plain cursor
+    """
+
+    def __init__(self, cursor, statements, dictionary=False):
+        self._cursor = cursor
+        self._statements = statements
+        self._dictionary = dictionary
+        self._rows = None
+        self._position = 0
+        self._rowcount = -1
+        self._lastrowid = None
+
+    def execute(self, query, params=None):
+        if isinstance(query, str) and query in _statements:
+            self._rows, self._rowcount, self._lastrowid = self._statements.run(query, params, self._dictionary)
+            self._position = 0
+            return None
+        self._rows = None
+        return self._cursor.execute(query, params)
+
+    def executemany(self, query, seq_params):
+        self._rows = None
+        return self._cursor.executemany(query, seq_params)
+
+    def fetchone(self):
+        if self._rows is None:
+            return self._cursor.fetchone()
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    def fetchall(self):
+        if self._rows is None:
+            return self._cursor.fetchall()
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    @property
+    def rowcount(self):
+        return self._rowcount if self._rows is not None else self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._lastrowid if self._rows is not None else self._cursor.lastrowid
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
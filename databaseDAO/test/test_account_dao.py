@@ -12,11 +12,12 @@ class TestAccountFunctions(unittest.TestCase):
         self.conn_mock.cursor.return_value = self.cursor_mock
 
         patcher1 = patch('databaseDAO.sqlConnector.get_connection', return_value=self.conn_mock)
-        patcher2 = patch('databaseDAO.Account.account_dao.hashAgain', side_effect=lambda salt, pw: "hashedpassword")
+        patcher2 = patch('databaseDAO.Account.account_dao.verify_password',
+                         side_effect=lambda pw, stored: stored == "salt:hashedpassword")
         self.addCleanup(patcher1.stop)
         self.addCleanup(patcher2.stop)
         self.mock_get_connection = patcher1.start()
-        self.mock_hashAgain = patcher2.start()
+        self.mock_verify_password = patcher2.start()
 
         # Rebind connection and cursor in the module to the mocks
         account_dao.conn = self.conn_mock
@@ -0,0 +1,84 @@
+import unittest
+from datetime import date
+
+from databaseDAO.async_db import close_pool
+from databaseDAO.sqlConnector import db
+from databaseDAO import userDAO_async
+from databaseDAO.Account import account_dao_async
+from databaseDAO.transaction import transaction_DAO, transaction_DAO_async
+from databaseDAO.transaction.rollup_DAO import get_rollups, MONTH
+from databaseDAO.transaction.rollup_DAO_async import get_rollups as get_rollups_async
+
+EMAIL = "async-dao@example.com"
+
+
+def _delete_test_user():
+    with db() as (conn, cursor):
+        cursor.execute("SELECT user_id FROM users WHERE email = %s", (EMAIL,))
+        row = cursor.fetchone()
+        if row:
+            for table in ("transaction_rollups", "category_rollups", "merchant_rollups", "transactions", "account"):
+                cursor.execute(f"DELETE FROM {table} WHERE user_id = %s", (row[0],))
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (row[0],))
+
+
+class TestAsyncDAO(unittest.IsolatedAsyncioTestCase):
+    """Runs against the local MySQL database, like test_user_dao"""
+
+    async def asyncSetUp(self):
+        _delete_test_user()
+        ok, message = await userDAO_async.register("AsyncTester", EMAIL, "Password123!")
+        self.assertTrue(ok, message)
+        ok, self.user_id = await userDAO_async.logIn(EMAIL, "Password123!")
+        self.assertTrue(ok)
+
+    async def asyncTearDown(self):
+        await close_pool()
+        _delete_test_user()
+
+    async def test_register_and_login_checks(self):
+        self.assertFalse((await userDAO_async.register("AsyncTester", EMAIL, "Password123!"))[0])
+        self.assertEqual(await userDAO_async.logIn(EMAIL, "WrongPassword!"), (False, None))
+        self.assertTrue(await userDAO_async.update_password(EMAIL, "Password123!", "NewPassword123!",
+                                                            "NewPassword123!"))
+        self.assertTrue((await userDAO_async.logIn(EMAIL, "NewPassword123!"))[0])
+
+    async def test_accounts_round_trip(self):
+        self.assertTrue(await account_dao_async.addAccount(self.user_id, "Async Savings", "savings", 100, "SEK",
+                                                           "Bank"))
+        accounts = await account_dao_async.get_all_accounts(self.user_id)
+        self.assertEqual([account["account_name"] for account in accounts], ["Async Savings"])
+
+        account_id = accounts[0]["account_id"]
+        self.assertTrue(await account_dao_async.update_account(account_id, self.user_id, accountType="Joint"))
+        self.assertEqual((await account_dao_async.get_account(account_id, self.user_id))["account_type"], "joint")
+        self.assertIsNone(await account_dao_async.get_account(account_id, self.user_id + 1))
+
+        self.assertFalse(await account_dao_async.delete_account(self.user_id, account_id, "WrongPassword!"))
+        self.assertTrue(await account_dao_async.delete_account(self.user_id, account_id, "Password123!"))
+
+    async def test_transactions_match_sync_dao(self):
+        for day, amount in ((1, "-10.50"), (2, "250.00"), (3, "-4.25")):
+            await transaction_DAO_async.register_transaction(self.user_id, None, f"Shop {day}", amount, None,
+                                                             date(2024, 3, day))
+        await transaction_DAO_async.register_transaction(self.user_id, None, "Undated", "-1.00", None)
+
+        page, next_cursor = await transaction_DAO_async.list_transactions(self.user_id, limit=2)
+        rest, last_cursor = await transaction_DAO_async.list_transactions(self.user_id, limit=2, cursor=next_cursor)
+        self.assertEqual((page, next_cursor), transaction_DAO.list_transactions(self.user_id, limit=2))
+        self.assertEqual([row["name"] for row in page + rest], ["Shop 3", "Shop 2", "Shop 1", "Undated"])
+        self.assertIsNone(last_cursor)
+
+        self.assertEqual(await get_rollups_async(self.user_id, MONTH), get_rollups(self.user_id, MONTH))
+        summary = await transaction_DAO_async.get_dashboard_summary(self.user_id)
+        self.assertEqual(summary, transaction_DAO.get_dashboard_summary(self.user_id))
+
+        transaction_id = page[0]["transaction_id"]
+        self.assertTrue(await transaction_DAO_async.update_transaction(transaction_id, self.user_id, amount=-5))
+        self.assertFalse(await transaction_DAO_async.update_transaction(transaction_id, self.user_id + 1, amount=1))
+        self.assertTrue(await transaction_DAO_async.delete_transaction(transaction_id, self.user_id))
+        self.assertFalse(await transaction_DAO_async.get_transaction(transaction_id, self.user_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from databaseDAO.transaction.bulk_writer import MultiRowWriter, LoadDataWriter, bulk_writer, _tsv_value
+
+
+def make_rows(count):
+    return [(1, 1, f"shop {i}", "-10.00", f"shop {i}", "2025-10-15", 0.0, f"{i:064x}") for i in range(count)]
+
+
+class TestBulkWriter(unittest.TestCase):
+
+    def test_multirow_statements_respect_packet_size(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (4096,)
+        cursor.rowcount = 3
+        writer = MultiRowWriter(cursor, max_rows=1000)
+
+        inserted = writer.write(make_rows(50))
+
+        statements = [c for c in cursor.execute.call_args_list if "INSERT IGNORE" in c.args[0]]
+        self.assertGreater(len(statements), 1)
+        self.assertEqual(sum(len(c.args[1]) for c in statements), 50 * 8)
+        self.assertTrue(all(len(c.args[0]) + sum(len(str(v)) for v in c.args[1]) < 4096 for c in statements))
+        self.assertEqual(inserted, 3 * len(statements))
+
+    def test_multirow_statements_respect_row_cap(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (64 * 1024 * 1024,)
+        writer = MultiRowWriter(cursor, max_rows=20)
+
+        writer.write(make_rows(50))
+
+        sizes = [len(c.args[1]) // 8 for c in cursor.execute.call_args_list if "INSERT IGNORE" in c.args[0]]
+        self.assertEqual(sizes, [20, 20, 10])
+
+    def test_load_data_stages_and_merges(self):
+        cursor = MagicMock()
+        cursor.rowcount = 4
+        writer = LoadDataWriter(cursor)
+
+        inserted = writer.write(make_rows(5))
+        writer.close()
+
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        self.assertTrue(statements[2].startswith("LOAD DATA LOCAL INFILE"))
+        self.assertTrue(statements[3].startswith("INSERT IGNORE INTO transactions"))
+        self.assertIn("DROP TEMPORARY TABLE", statements[-1])
+        self.assertEqual(inserted, 4)
+
+    def test_tsv_escaping(self):
+        self.assertEqual(_tsv_value(None), r"\N")
+        self.assertEqual(_tsv_value("a\tb\nc\\d"), "a\\tb\\nc\\\\d")
+        self.assertEqual(_tsv_value(b"\x00\t\xff"), "0009ff")
+
+    @patch('databaseDAO.transaction.bulk_writer.db')
+    def test_bulk_writer_uses_one_connection(self, mock_db):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (64 * 1024 * 1024,)
+        mock_db.return_value.__enter__.return_value = (MagicMock(), cursor)
+
+        with bulk_writer("multirow") as writer:
+            writer.write(make_rows(10))
+            writer.write(make_rows(10))
+
+        mock_db.assert_called_once()
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            with bulk_writer("nope"):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
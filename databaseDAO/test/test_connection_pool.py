@@ -0,0 +1,103 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from databaseDAO.connection_pool import ManagedPool, PoolTimeout
+
+
+def fake_connection():
+    connection = MagicMock()
+    connection.in_transaction = False
+    connection.is_connected.return_value = True
+    return connection
+
+
+class TestManagedPool(unittest.TestCase):
+
+    def setUp(self):
+        self.connect = MagicMock(side_effect=fake_connection)
+        self.clock = 1000.0
+        patcher = patch('databaseDAO.connection_pool.time.monotonic', side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_connections_up_to_max_size_then_times_out(self):
+        pool = ManagedPool(self.connect, max_size=2, timeout=0)
+
+        first = pool.acquire()
+        first.close()
+        self.assertIs(pool.acquire(), first)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(self.connect.call_count, 2)
+        metrics = pool.metrics()
+        self.assertEqual((metrics["size"], metrics["in_use"], metrics["timeouts"]), (2, 2, 1))
+
+    def test_waiter_gets_released_connection(self):
+        pool = ManagedPool(self.connect, max_size=1, timeout=5)
+        held = pool.acquire()
+        got = []
+
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+        waiter.start()
+        while pool.metrics()["waiting"] == 0:
+            pass
+        held.close()
+        waiter.join(timeout=5)
+
+        self.assertEqual(got, [held])
+        self.assertEqual(self.connect.call_count, 1)
+
+    def test_release_rolls_back_open_transaction(self):
+        pool = ManagedPool(self.connect)
+        connection = pool.acquire()
+        connection._raw.in_transaction = True
+        connection.close()
+        connection._raw.rollback.assert_called_once()
+        self.assertEqual(pool.metrics()["idle"], 1)
+
+    def test_expired_and_dead_connections_are_replaced(self):
+        pool = ManagedPool(self.connect, max_lifetime=100, validate_after=10)
+
+        old = pool.acquire()
+        old.close()
+        self.clock += 100
+        self.assertIsNot(pool.acquire(), old)
+        old._raw.close.assert_called_once()
+
+        pool = ManagedPool(self.connect, validate_after=10)
+        dead = pool.acquire()
+        dead.close()
+        dead._raw.is_connected.return_value = False
+        self.clock += 10
+        self.assertIsNot(pool.acquire(), dead)
+        self.assertEqual(pool.metrics()["closed_invalid"], 1)
+
+    def test_idle_connections_shrink_to_min_size(self):
+        pool = ManagedPool(self.connect, min_size=1, max_size=3, max_idle=60)
+        connections = [pool.acquire() for _ in range(3)]
+        for connection in connections:
+            connection.close()
+
+        self.clock += 60
+        pool.acquire().close()
+
+        metrics = pool.metrics()
+        self.assertEqual((metrics["size"], metrics["idle"], metrics["closed_idle"]), (1, 1, 2))
+
+    def test_histograms_record_waits_and_checkouts(self):
+        pool = ManagedPool(self.connect)
+        connection = pool.acquire()
+        self.clock += 0.02
+        connection.close()
+
+        metrics = pool.metrics()
+        self.assertEqual(metrics["acquire_wait"]["buckets"]["le_1ms"], 1)
+        self.assertEqual(metrics["checkout_duration"]["buckets"]["le_25ms"], 1)
+        self.assertEqual(metrics["checkout_duration"]["count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
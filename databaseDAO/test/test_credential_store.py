@@ -0,0 +1,97 @@
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from mysql.connector.errors import IntegrityError
+
+from databaseDAO import userDAO
+from databaseDAO.credential_store import CREDENTIALS_QUERY, NegativeLookups, fetch_credentials, insert_user
+from databaseDAO.password_hasher import hash_password
+from databaseDAO.rate_limiter import MemoryStore, RateLimiter
+
+STORED = hash_password("Password123!")
+
+
+class TestNegativeLookups(unittest.TestCase):
+
+    def test_least_recently_used_email_is_dropped(self):
+        lookups = NegativeLookups(capacity=2)
+        lookups.add("a@example.com")
+        lookups.add("b@example.com")
+        self.assertIn("A@Example.com ", lookups)
+        lookups.add("c@example.com")
+
+        self.assertIn("a@example.com", lookups)
+        self.assertNotIn("b@example.com", lookups)
+        self.assertEqual(len(lookups), 2)
+
+    def test_entries_expire_and_can_be_disabled(self):
+        lookups = NegativeLookups(capacity=4, ttl=0)
+        lookups.add("a@example.com")
+        self.assertNotIn("a@example.com", lookups)
+
+        disabled = NegativeLookups(capacity=0)
+        disabled.add("a@example.com")
+        self.assertEqual(len(disabled), 0)
+
+
+class TestCredentialStore(unittest.TestCase):
+
+    def setUp(self):
+        self.cursor = MagicMock()
+        self.unknown = NegativeLookups()
+        patcher = patch('databaseDAO.credential_store.unknown_emails', self.unknown)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('databaseDAO.userDAO.unknown_emails', self.unknown)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        @contextmanager
+        def fake_db(dictionary=False):
+            yield MagicMock(), self.cursor
+
+        patcher = patch('databaseDAO.userDAO.db', fake_db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('databaseDAO.userDAO.login_limiter', RateLimiter(MemoryStore()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_login_is_one_query(self):
+        self.cursor.fetchone.return_value = (7, STORED)
+
+        self.assertEqual(userDAO.logIn("dave@example.com", "Password123!"), (True, 7))
+        self.cursor.execute.assert_called_once_with(CREDENTIALS_QUERY, ("dave@example.com",))
+
+    def test_unknown_email_is_not_queried_again(self):
+        self.cursor.fetchone.return_value = None
+
+        self.assertEqual(userDAO.logIn("ghost@example.com", "Password123!"), (False, None))
+        self.assertEqual(userDAO.logIn("ghost@example.com", "Password123!"), (False, None))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_duplicate_email_is_reported_by_the_insert(self):
+        self.cursor.execute.side_effect = IntegrityError(msg="Duplicate entry", errno=1062)
+
+        self.assertEqual(userDAO.register("BobTester", "bob@example.com", "Password123!"),
+                         (False, "Email already registered"))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+    def test_registering_forgets_the_negative_lookup(self):
+        self.cursor.fetchone.return_value = None
+        self.assertIsNone(fetch_credentials(self.cursor, "new@example.com"))
+        self.assertIn("new@example.com", self.unknown)
+
+        self.assertTrue(insert_user(self.cursor, "NewTester", "new@example.com", STORED))
+        self.assertNotIn("new@example.com", self.unknown)
+
+    def test_other_integrity_errors_are_raised(self):
+        self.cursor.execute.side_effect = IntegrityError(msg="Column cannot be null", errno=1048)
+
+        with self.assertRaises(IntegrityError):
+            insert_user(self.cursor, "NewTester", "new@example.com", STORED)
+
+
+if __name__ == '__main__':
+    unittest.main()
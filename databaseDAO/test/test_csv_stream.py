@@ -0,0 +1,89 @@
+import io
+import unittest
+
+from databaseDAO.transaction.csv_stream import CsvChunkReader
+
+
+class TestCsvChunkReader(unittest.TestCase):
+
+    def read_all(self, content, **kwargs):
+        reader = CsvChunkReader(io.BytesIO(content), **kwargs)
+        frames = list(reader)
+        return reader, frames
+
+    def test_chunks_cover_every_row(self):
+        lines = ["Value date,Text,Amount,Balance"]
+        lines += [f"2024-01-{i % 28 + 1:02d},Shop {i},-{i}.50,{i}" for i in range(250)]
+        content = "\n".join(lines).encode()
+
+        reader, frames = self.read_all(content, block_size=64, chunk_rows=100)
+
+        self.assertEqual([len(f) for f in frames], [100, 100, 50])
+        self.assertEqual(reader.rows_read, 250)
+        self.assertEqual(frames[2].iloc[-1]['Text'], "Shop 249")
+        self.assertEqual(list(frames[0].columns), ["Value date", "Text", "Amount", "Balance"])
+
+    def test_semicolon_dialect_is_sniffed(self):
+        content = b'Value date;Text;Amount\n2024-01-05;"Cafe; Bar";-1,50\n2024-01-06;Shop;-2,00\n'
+
+        reader, frames = self.read_all(content)
+
+        self.assertEqual(reader.delimiter, ';')
+        self.assertEqual(frames[0].iloc[0]['Text'], "Cafe; Bar")
+        self.assertEqual(frames[0].iloc[1]['Amount'], "-2,00")
+
+    def test_utf8_split_across_blocks(self):
+        content = "Value date,Text,Amount\n2024-01-05,Café Åre,-10\n".encode('utf-8-sig')
+
+        _, frames = self.read_all(content, block_size=3)
+
+        self.assertEqual(frames[0].iloc[0]['Text'], "Café Åre")
+
+    def test_latin1_fallback(self):
+        content = "Value date,Text,Amount\n2024-01-05,Café,-10\n".encode('latin-1')
+
+        _, frames = self.read_all(content)
+
+        self.assertEqual(frames[0].iloc[0]['Text'], "Café")
+
+    def test_latin1_after_the_first_block(self):
+        lines = ["Value date,Text,Amount"] + [f"2024-01-{i + 1:02d},Shop {i},-{i}" for i in range(20)]
+        lines.append("2024-01-21,Café Åre,-10")
+        content = "\n".join(lines).encode('latin-1')
+
+        # Every split of the non-ASCII bytes across block boundaries
+        for block_size in range(32, 48):
+            reader, frames = self.read_all(content, block_size=block_size)
+            self.assertEqual(reader.rows_read, 21)
+            self.assertEqual(frames[0].iloc[-1]['Text'], "Café Åre")
+
+    def test_quoted_newline_and_outer_quotes(self):
+        content = (b'"Value date,Text,Amount"\n'
+                   b'2024-01-05,"two\nlines",-10\n'
+                   b'\n'
+                   b'"2024-01-06,Shop,-5"\n')
+
+        _, frames = self.read_all(content, block_size=8)
+
+        self.assertEqual(len(frames[0]), 2)
+        self.assertEqual(frames[0].iloc[0]['Text'], "two\nlines")
+        self.assertEqual(frames[0].iloc[1]['Amount'], "-5")
+
+    def test_rejects_null_bytes(self):
+        with self.assertRaises(ValueError):
+            self.read_all(b"Value date,Text,Amount\n2024-01-05,\x00,-10\n")
+
+    def test_rejects_files_over_limit(self):
+        content = b"Value date,Text,Amount\n" + b"2024-01-05,Shop,-10\n" * 100
+
+        with self.assertRaises(ValueError):
+            self.read_all(content, block_size=256, max_bytes=1024)
+
+    def test_empty_file_has_no_header(self):
+        reader = CsvChunkReader(io.BytesIO(b"\n\n"))
+        self.assertIsNone(reader.read_header())
+        self.assertEqual(list(reader), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
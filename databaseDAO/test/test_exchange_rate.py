@@ -1,7 +1,18 @@
+import asyncio
+import os
+import threading
+import time
 import unittest
-from unittest.mock import patch
 
-from Visuals.ExchangeRates import ExchangeRates
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from Visuals.ExchangeRates import ExchangeRates, asof_factors, refresh_rates_periodically
+from Visuals.rate_providers import FileRateProvider
+
+RATES_FILE = os.path.join(os.path.dirname(__file__), "exchange_rates.json")
 
 
 class Test_exchangeRate(unittest.TestCase):
@@ -24,3 +35,102 @@ class Test_exchangeRate(unittest.TestCase):
         mock_get_rates.return_value = {}
         ans = exchanger.convert(amount=100, to_currency='USD', from_currency='IDK')
         self.assertEqual(ans, 100)
+
+    @patch('Visuals.ExchangeRates.ExchangeRates.get_rates')
+    def test_convert_many_matches_convert(self, mock_get_rates):
+        exchanger = ExchangeRates()
+        mock_get_rates.return_value = {"SEK": 10.87, "EUR": 0.92, "USD": 1.0}
+        amounts = [100, 250.5, -40, 7]
+        codes = ['SEK', 'eur', 'USD', 'IDK']
+
+        converted = exchanger.convert_many(amounts, codes, 'USD')
+
+        expected = [exchanger.convert(amount, code, 'USD') for amount, code in zip(amounts, codes)]
+        self.assertEqual(converted.tolist(), expected)
+        mock_get_rates.assert_called_with('USD')
+
+    def test_cross_rates_come_from_one_fetch(self):
+        provider = MagicMock()
+        provider.fetch.return_value = {"SEK": 10.0, "EUR": 0.5}
+        exchanger = ExchangeRates(provider)
+
+        self.assertEqual(exchanger.get_rates('SEK')['EUR'], 0.05)
+        self.assertEqual(exchanger.get_rates('EUR')['USD'], 2.0)
+        self.assertEqual(exchanger.convert(100, 'SEK', 'EUR'), 5.0)
+        provider.fetch.assert_called_once_with('USD')
+
+    def test_file_provider(self):
+        exchanger = ExchangeRates(FileRateProvider(RATES_FILE))
+        self.assertEqual(exchanger.convert(100, 'SEK', 'EUR'), 5.0)
+        self.assertEqual(FileRateProvider(RATES_FILE).fetch('EUR')['GBP'], 1.6)
+
+    def test_concurrent_refreshes_share_one_fetch(self):
+        release = threading.Event()
+        provider = MagicMock()
+        provider.fetch.side_effect = lambda base: release.wait(5) and {"SEK": 10.0}
+        exchanger = ExchangeRates(provider)
+
+        threads = [threading.Thread(target=exchanger.get_rates, args=('SEK',)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        provider.fetch.assert_called_once()
+        self.assertEqual(exchanger.get_rates('USD')['SEK'], 10.0)
+
+    def test_stale_rates_served_while_refreshing(self):
+        release = threading.Event()
+        provider = MagicMock()
+        provider.fetch.return_value = {"SEK": 10.0}
+        exchanger = ExchangeRates(provider)
+        exchanger.refresh()
+
+        provider.fetch.side_effect = lambda base: release.wait(5) and {"SEK": 11.0}
+        exchanger.cache_time -= timedelta(hours=exchanger.cache_hours)
+        exchanger._last_attempt = None
+
+        # Returns the old rates without waiting for the provider
+        self.assertEqual(exchanger.get_rates('USD')['SEK'], 10.0)
+        release.set()
+        for _ in range(500):
+            if exchanger._is_cache_valid():
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(exchanger.get_rates('USD')['SEK'], 11.0)
+        self.assertEqual(provider.fetch.call_count, 2)
+
+    @patch('Visuals.ExchangeRates.save_rates')
+    def test_failed_refresh_is_not_saved_as_history(self, mock_save):
+        provider = MagicMock()
+        provider.fetch.side_effect = [{"SEK": 10.0}, RuntimeError("provider down")]
+        exchanger = ExchangeRates(provider)
+
+        # Two refreshes, then stop the loop during the second sleep
+        sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+        with patch('Visuals.ExchangeRates.asyncio.sleep', sleep), self.assertRaises(asyncio.CancelledError):
+            asyncio.run(refresh_rates_periodically(exchanger, 60))
+
+        self.assertEqual(provider.fetch.call_count, 2)
+        mock_save.assert_called_once_with(date.today(), {"SEK": 10.0, "USD": 1.0}, "USD")
+
+    def test_asof_factors_use_latest_rate_on_or_before_each_date(self):
+        history = [("SEK", date(2025, 3, 1), 10.0), ("SEK", date(2025, 3, 10), 5.0), ("EUR", date(2025, 3, 1), 0.5)]
+        dates = pd.DatetimeIndex(["2025-03-10", "2025-02-28", "2025-03-05"])
+
+        np.testing.assert_allclose(asof_factors(dates, "SEK", "USD", history), [0.2, np.nan, 0.1])
+        np.testing.assert_allclose(asof_factors(dates, "SEK", "EUR", history), [0.1, np.nan, 0.05])
+
+    @patch('Visuals.ExchangeRates.get_rate_history')
+    def test_convert_many_asof_falls_back_to_spot(self, mock_history):
+        mock_history.return_value = [("SEK", date(2025, 3, 10), 5.0)]
+        provider = MagicMock()
+        provider.fetch.return_value = {"SEK": 10.0}
+        exchanger = ExchangeRates(provider)
+
+        converted = exchanger.convert_many_asof([[100, 50], [100, 50]], ["2025-03-01", "2025-03-11"], "SEK", "USD")
+
+        self.assertEqual(converted.tolist(), [[10.0, 5.0], [20.0, 10.0]])
+        mock_history.assert_called_once_with(["SEK", "USD"], date(2025, 3, 1), date(2025, 3, 11))
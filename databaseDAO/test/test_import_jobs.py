@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from databaseDAO.transaction.bulk_writer import EXECUTEMANY
+from databaseDAO.transaction.import_jobs import (
+    ImportJobManager, ImportLimitError, COMPLETED, CANCELLED, QUEUED
+)
+
+
+CSV_CONTENT = (b"Value date,Text,Amount\n"
+               b"2025-10-15,grocery store,-50.00\n"
+               b"2025-10-16,gas station,-30.00\n"
+               b"2025-10-17,coffee shop,-5.00\n")
+
+
+def write_csv(content=CSV_CONTENT):
+    with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as f:
+        f.write(content)
+        return f.name
+
+
+def wait_for(job, timeout=5):
+    deadline = time.time() + timeout
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestImportJobManager(unittest.TestCase):
+
+    def setUp(self):
+        # The rollup refresh at the end of each import
+        patcher = patch("databaseDAO.transaction.importcsv.db")
+        patcher.start().return_value.__enter__.return_value = (MagicMock(), MagicMock())
+        self.addCleanup(patcher.stop)
+        self.manager = ImportJobManager(max_workers=1, max_jobs_per_user=1, max_queued=1,
+                                        write_strategy=EXECUTEMANY)
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    @patch("databaseDAO.transaction.importcsv.get_transaction_hashes", return_value=[])
+    @patch("databaseDAO.transaction.importcsv.add_transaction_batch")
+    def test_job_completes_with_counts(self, mock_batch, mock_hashes):
+        mock_batch.side_effect = lambda batch, **kwargs: len(batch) - 1
+        path = write_csv()
+
+        job = self.manager.submit(1, path)
+        wait_for(job)
+
+        result = job.to_dict()
+        self.assertEqual(result["status"], COMPLETED)
+        self.assertEqual(result["rows_parsed"], 3)
+        self.assertEqual(result["imported"], 2)
+        self.assertEqual(result["duplicates"], 1)
+        self.assertFalse(os.path.exists(path))
+
+    @patch("databaseDAO.transaction.importcsv.get_transaction_hashes", return_value=[])
+    @patch("databaseDAO.transaction.importcsv.add_transaction_batch")
+    def test_limits_and_cancel(self, mock_batch, mock_hashes):
+        release = threading.Event()
+        mock_batch.side_effect = lambda batch, **kwargs: release.wait(5) and len(batch)
+
+        running = self.manager.submit(1, write_csv())
+        with self.assertRaises(ImportLimitError):
+            self.manager.submit(1, write_csv())
+
+        queued = self.manager.submit(2, write_csv())
+        with self.assertRaises(ImportLimitError):
+            self.manager.submit(3, write_csv())
+
+        self.assertEqual(queued.status, QUEUED)
+        self.manager.cancel(queued.job_id, 2)
+        self.assertEqual(queued.status, CANCELLED)
+
+        self.assertIsNone(self.manager.get(running.job_id, 2))
+        release.set()
+        wait_for(running)
+        self.assertEqual(running.status, COMPLETED)
+
+    @patch("databaseDAO.transaction.importcsv.get_transaction_hashes", return_value=[])
+    @patch("databaseDAO.transaction.importcsv.add_transaction_batch")
+    def test_shutdown_finalises_jobs(self, mock_batch, mock_hashes):
+        started, release = threading.Event(), threading.Event()
+        mock_batch.side_effect = lambda batch, **kwargs: started.set() or release.wait(5) and len(batch)
+        rows = b"".join(b"2025-10-%02d,shop %d,-1.00\n" % (i % 28 + 1, i) for i in range(150))
+
+        running = self.manager.submit(1, write_csv(b"Value date,Text,Amount\n" + rows))
+        queued = self.manager.submit(2, write_csv())
+        started.wait(5)
+
+        stopping = threading.Thread(target=self.manager.shutdown)
+        stopping.start()
+        while not running.cancel_event.is_set():
+            time.sleep(0.01)
+        release.set()
+        stopping.join(5)
+
+        # The running job stops before its second batch
+        self.assertEqual((running.status, queued.status), (CANCELLED, CANCELLED))
+        self.assertEqual(mock_batch.call_count, 1)
+        self.assertIsNotNone(running.finished_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
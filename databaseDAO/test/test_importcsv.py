@@ -1,9 +1,11 @@
 import unittest
+import warnings
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
 from databaseDAO.transaction.importcsv import bankImporter
+from databaseDAO.transaction.transaction_hash import generate_transaction_hash, HEX, BINARY16, BLAKE2B
 
 from databaseDAO.transaction.importcsv import bankImporter
 
@@ -27,9 +29,19 @@ class Test_importCSV(unittest.TestCase):
         fail2 = importer._generate_hash("1|grocery|-90.00|2025-10-15")
         self.assertNotEqual(fail1, fail2)
 
+    def test_binary_hash_matches_migrated_hex_hash(self):
+        key = "1|grocery|-50.00|2025-10-15"
+        hex_hash = generate_transaction_hash(key, HEX)
+        binary_hash = generate_transaction_hash(key, BINARY16)
+        self.assertEqual(len(binary_hash), 16)
+        # migrations/001_binary_transaction_hash.sql stores UNHEX(LEFT(hash, 32))
+        self.assertEqual(binary_hash, bytes.fromhex(hex_hash[:32]))
+        self.assertEqual(len(generate_transaction_hash(key, BINARY16, BLAKE2B)), 16)
+
+    @patch("databaseDAO.transaction.importcsv.get_transaction_hashes", return_value=[])
     @patch("databaseDAO.transaction.importcsv.add_transaction_batch")
     @patch("databaseDAO.transaction.importcsv.pd.read_csv")
-    def test_add_transaction_batch_is_zero(self, mock_csv, mock_batch):
+    def test_add_transaction_batch_is_zero(self, mock_csv, mock_batch, mock_hashes):
         mock_csv.return_value = pd.DataFrame({
             'Value date': ['2025-10-15', '2025-10-16', '2025-10-17'],
             'Text': ['grocery store', 'gas station', 'coffee shop'],
@@ -40,3 +52,60 @@ class Test_importCSV(unittest.TestCase):
         importer.import_csv("fake.csv")
         self.assertEqual(importer.imported_count, 0)
         self.assertEqual(importer.duplicate_count, 3)
+
+    def test_columnar_rows_match_iterrows(self):
+        frame = pd.DataFrame({
+            'Value date': ['2025-10-15', '2025-10-16', 'not a date', '2025-10-18', '2025-10-19'],
+            'Text': ['Grocery  Store', '   ', 'gas station', 'coffee shop', 'Rent'],
+            'Amount': ['-1,050.5', '-30.00', '-5.00', 'abc', '0.165'],
+            'Balance': ['100', None, '90', '80', '70']
+        })
+        importer = bankImporter(user_id=1)
+        rows, errors = importer._prepare_rows(frame)
+        legacy_rows, legacy_errors = importer._prepare_rows_iterrows(frame)
+
+        self.assertEqual(errors, legacy_errors)
+        self.assertEqual(rows, legacy_rows)
+        self.assertEqual([row[3] for row in rows], ["-1050.50", "0.16"])
+
+        # A day-first column must not be read with one format inferred for all rows
+        ambiguous = pd.DataFrame({
+            'Value date': ['13/01/2025', '01/02/2025', '05/03/2025', '2025-03-06'],
+            'Text': ['Shop A', 'Shop B', 'Shop C', 'Shop D'],
+            'Amount': ['-1', '-2', '-3', '-4'],
+        })
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            rows, _ = importer._prepare_rows(ambiguous)
+            legacy_rows, _ = importer._prepare_rows_iterrows(ambiguous)
+
+        self.assertEqual(rows, legacy_rows)
+        self.assertEqual([row[5] for row in rows], ["2025-01-13", "2025-01-02", "2025-05-03", "2025-03-06"])
+
+    @patch("databaseDAO.transaction.importcsv.get_transaction_hashes")
+    @patch("databaseDAO.transaction.importcsv.add_transaction_batch")
+    def test_duplicates_filtered_before_insert(self, mock_batch, mock_hashes):
+        frame = pd.DataFrame({
+            'Value date': ['2025-10-15', '2025-10-16', '2025-10-16', '2025-10-17'],
+            'Text': ['grocery store', 'gas station', 'gas station', 'coffee shop'],
+            'Amount': ['-50.00', '-30.00', '-30.00', '-5.00']
+        })
+        importer = bankImporter(user_id=1)
+        stored = importer._generate_hash("1|grocery store|-50.00|2025-10-15")
+        mock_hashes.return_value = [stored]
+        mock_batch.side_effect = len
+
+        importer._reset()
+        importer.import_frame(frame)
+
+        mock_hashes.assert_called_once_with(1, '2025-10-15', '2025-10-17')
+        written = mock_batch.call_args.args[0]
+        self.assertEqual([row[2] for row in written], ['gas station', 'coffee shop'])
+        self.assertEqual(importer.imported_count, 2)
+        self.assertEqual(importer.file_duplicate_count, 1)
+        self.assertEqual(importer.existing_duplicate_count, 1)
+        self.assertEqual(importer.duplicate_count, 2)
+
+        # A later chunk only fetches the dates not loaded yet
+        importer.import_frame(frame.assign(**{'Value date': '2025-10-20'}))
+        mock_hashes.assert_called_with(1, '2025-10-18', '2025-10-20')
@@ -0,0 +1,36 @@
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from databaseDAO.money import Money, cents_array, to_units
+
+
+class TestMoney(unittest.TestCase):
+
+    def test_parse_and_wire_format(self):
+        self.assertEqual(Money.of("-1,050.5").cents, -105050)
+        self.assertEqual(Money.of(Decimal("0.165")).cents, 16)
+        self.assertEqual(Money.of(0.1).cents, 10)
+        self.assertEqual(str(Money(-5)), "-0.05")
+        self.assertEqual(Money.of("12.50").to_decimal(), Decimal("12.50"))
+        with self.assertRaises(ValueError):
+            Money.of("abc")
+
+    def test_arithmetic_stays_in_cents(self):
+        total = sum([Money.of("0.10")] * 3)
+        self.assertEqual(total, Money(30))
+        self.assertEqual(total - Money(45), Money(-15))
+        self.assertEqual(abs(Money(-15)), Money(15))
+        self.assertEqual(f"{Money(123456789):,.2f}", "1,234,567.89")
+        self.assertEqual(float(Money(1999)), 19.99)
+
+    def test_arrays(self):
+        np.testing.assert_array_equal(cents_array([Decimal("10.01"), Decimal("-0.29")]), [1001, -29])
+        np.testing.assert_array_equal(cents_array([Money(5), Money(-7)]), [5, -7])
+        self.assertEqual(cents_array([Decimal("10.01")]).dtype, np.int64)
+        np.testing.assert_allclose(to_units(np.array([1001, -29])), [10.01, -0.29])
+
+
+if __name__ == '__main__':
+    unittest.main()
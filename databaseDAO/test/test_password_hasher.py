@@ -0,0 +1,83 @@
+import hashlib
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from databaseDAO import userDAO
+from databaseDAO.credential_store import NegativeLookups, REHASH_QUERY
+from databaseDAO.password_hasher import Pbkdf2Hasher, ScryptHasher, check_password, verify_password
+from databaseDAO.rate_limiter import MemoryStore, RateLimiter
+
+LEGACY = "salt:" + hashlib.sha256(("salt" + "Password123!").encode()).hexdigest()
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def test_hashes_verify_with_their_own_parameters(self):
+        for hasher in (ScryptHasher(n=2 ** 10, r=8, p=1), Pbkdf2Hasher(iterations=1000)):
+            encoded = hasher.hash("Password123!")
+            self.assertTrue(encoded.startswith(hasher.scheme + "$"))
+            self.assertTrue(verify_password("Password123!", encoded))
+            self.assertFalse(verify_password("Password124!", encoded))
+            self.assertFalse(hasher.needs_rehash(encoded))
+
+    def test_legacy_hashes_verify_and_need_rehash(self):
+        self.assertTrue(verify_password("Password123!", LEGACY))
+        self.assertFalse(verify_password("WrongPassword!", LEGACY))
+        self.assertTrue(ScryptHasher().needs_rehash(LEGACY))
+
+    def test_changed_cost_triggers_rehash(self):
+        old = Pbkdf2Hasher(iterations=1000).hash("Password123!")
+
+        with patch('databaseDAO.password_hasher.hasher', Pbkdf2Hasher(iterations=2000)):
+            matches, new_hash = check_password("Password123!", old)
+            self.assertTrue(matches)
+            self.assertTrue(new_hash.startswith("pbkdf2_sha256$2000$"))
+            self.assertEqual(check_password("WrongPassword!", old), (False, None))
+
+    def test_login_stores_the_upgraded_hash(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (7, LEGACY)
+
+        @contextmanager
+        def fake_db(dictionary=False):
+            yield MagicMock(), cursor
+
+        with patch('databaseDAO.userDAO.db', fake_db), \
+                patch('databaseDAO.userDAO.unknown_emails', NegativeLookups()), \
+                patch('databaseDAO.userDAO.login_limiter', RateLimiter(MemoryStore())), \
+                patch('databaseDAO.password_hasher.hasher', Pbkdf2Hasher(iterations=1000)):
+            self.assertEqual(userDAO.logIn("dave@example.com", "Password123!"), (True, 7))
+
+        query, (new_hash, user_id, old_hash) = cursor.execute.call_args.args
+        self.assertEqual(query, REHASH_QUERY)
+        self.assertEqual((user_id, old_hash), (7, LEGACY))
+        self.assertTrue(verify_password("Password123!", new_hash))
+
+    def test_unknown_email_costs_a_verification(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+
+        @contextmanager
+        def fake_db(dictionary=False):
+            yield MagicMock(), cursor
+
+        unknown = NegativeLookups(capacity=4)
+        with patch('databaseDAO.userDAO.db', fake_db), \
+                patch('databaseDAO.userDAO.unknown_emails', unknown), \
+                patch('databaseDAO.credential_store.unknown_emails', unknown), \
+                patch('databaseDAO.userDAO.login_limiter', RateLimiter(MemoryStore())), \
+                patch('databaseDAO.password_hasher.hasher', Pbkdf2Hasher(iterations=1000)), \
+                patch('databaseDAO.password_hasher.verify_password', wraps=verify_password) as verify:
+            # Found missing in the database, then skipped by the negative cache
+            self.assertEqual(userDAO.logIn("ghost@example.com", "Password123!"), (False, None))
+            self.assertEqual(userDAO.logIn("ghost@example.com", "Password123!"), (False, None))
+
+        self.assertEqual(verify.call_count, 2)
+        password, encoded = verify.call_args.args
+        self.assertEqual(password, "Password123!")
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$1000$"))
+
+
+if __name__ == '__main__':
+    unittest.main()
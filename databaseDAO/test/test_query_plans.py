@@ -0,0 +1,129 @@
+import unittest
+from contextlib import contextmanager
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from databaseDAO.sqlConnector import db
+from databaseDAO.transaction import transaction_DAO
+from databaseDAO.transaction.rollup_DAO import refresh_rollups
+from databaseDAO.transaction.transaction_hash import generate_transaction_hash
+from Visuals import BarChart, Monthly_Report
+
+PLAN_EMAILS = ("plan-target@example.com", "plan-noise@example.com")
+
+
+class ExplainingCursor:
+    """Stands in for a DAO cursor: every statement is EXPLAINed instead of run"""
+
+    rowcount = 0
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.plans = []
+
+    def execute(self, query, params=None):
+        self.cursor.execute("EXPLAIN " + query, params)
+        self.plans.append((query, self.cursor.fetchall()))
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+
+def _delete_plan_users(cursor):
+    for email in PLAN_EMAILS:
+        cursor.execute("SELECT user_id FROM users WHERE email = %s", (email,))
+        row = cursor.fetchone()
+        if row:
+            cursor.execute("DELETE FROM transactions WHERE user_id = %s", (row[0],))
+            cursor.execute("DELETE FROM category WHERE user_id = %s", (row[0],))
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (row[0],))
+
+
+class TestQueryPlans(unittest.TestCase):
+    """The hot date-range queries must be index range scans, not scans of the user's rows"""
+
+    @classmethod
+    def setUpClass(cls):
+        with db() as (conn, cursor):
+            _delete_plan_users(cursor)
+            user_ids = []
+            for email, rows in zip(PLAN_EMAILS, (300, 3000)):
+                cursor.execute("INSERT INTO users (name, email, password) VALUES (%s, %s, %s)",
+                               ("PlanUser", email, "plan:plan"))
+                user_id = cursor.lastrowid
+                cursor.execute("INSERT INTO category (user_id, name, type) VALUES (%s, %s, %s)",
+                               (user_id, "Plan", "expense"))
+                category_id = cursor.lastrowid
+
+                values = []
+                for i in range(rows):
+                    day = date(2024, 1, 1) + timedelta(days=i % 700)
+                    key = f"{user_id}|plan merchant {i % 40}|{i - 150}.00|{day}|{i}"
+                    values.extend([user_id, category_id, f"plan merchant {i % 40}", i - 150, day,
+                                   generate_transaction_hash(key)])
+                cursor.execute("INSERT INTO transactions (user_id, category_id, name, amount, transaction_date, "
+                               "transaction_hash) VALUES " + ",".join(["(%s,%s,%s,%s,%s,%s)"] * rows), values)
+                user_ids.append(user_id)
+            cursor.execute("ANALYZE TABLE transactions")
+            cursor.fetchall()
+        cls.user_id = user_ids[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        with db() as (conn, cursor):
+            _delete_plan_users(cursor)
+
+    @contextmanager
+    def explain(self, module):
+        with db(dictionary=True) as (conn, cursor):
+            explaining = ExplainingCursor(cursor)
+
+            @contextmanager
+            def explaining_db(dictionary=False):
+                yield conn, explaining
+
+            with patch.object(module, "db", explaining_db):
+                yield explaining.plans
+
+    def assertRangeScans(self, plans, expected_queries):
+        checked = 0
+        for query, plan in plans:
+            for step in plan:
+                if step["table"] != "transactions":
+                    continue
+                checked += 1
+                self.assertEqual(step["type"], "range", f"{query}\n{plan}")
+                self.assertIsNotNone(step["key"], f"{query}\n{plan}")
+        self.assertEqual(checked, expected_queries)
+
+    def test_monthly_report_query(self):
+        with self.explain(Monthly_Report) as plans, \
+                patch.object(Monthly_Report, "user_exists", return_value=True):
+            Monthly_Report.get_data(self.user_id, "2024-03")
+        self.assertRangeScans(plans, 1)
+
+    def test_weekly_chart_query(self):
+        with self.explain(BarChart) as plans:
+            BarChart.weekly_expenses(self.user_id, 8)
+        self.assertRangeScans(plans, 1)
+
+    def test_rollup_refresh_queries(self):
+        with db(dictionary=True) as (conn, cursor):
+            explaining = ExplainingCursor(cursor)
+            refresh_rollups(explaining, self.user_id, [date(2024, 3, 5), date(2024, 3, 20)])
+        # One INSERT ... SELECT per rollup table and period
+        self.assertRangeScans(explaining.plans, 7)
+
+    def test_listing_and_hash_queries(self):
+        with self.explain(transaction_DAO) as plans:
+            transaction_DAO.list_transactions(self.user_id, limit=50, start_date=date(2024, 3, 1),
+                                              end_date=date(2024, 3, 31))
+            transaction_DAO.get_transaction_hashes(self.user_id, date(2024, 3, 1), date(2024, 3, 31))
+        self.assertRangeScans(plans, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
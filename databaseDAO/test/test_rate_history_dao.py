@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from databaseDAO.ExchangeRate.rate_history_DAO import save_rates, get_rate_history, load_snapshots
+
+
+class TestRateHistoryDAO(unittest.TestCase):
+    def setUp(self):
+        self.db_patcher = patch('databaseDAO.ExchangeRate.rate_history_DAO.db')
+        self.mock_db = self.db_patcher.start()
+
+        self.mock_cursor = MagicMock()
+        mock_db_cm = MagicMock()
+        mock_db_cm.__enter__ = MagicMock(return_value=(MagicMock(), self.mock_cursor))
+        mock_db_cm.__exit__ = MagicMock(return_value=False)
+        self.mock_db.return_value = mock_db_cm
+
+    def test_save_rates_stores_units_per_usd(self):
+        save_rates(date(2025, 3, 1), {"USD": 0.1, "EUR": 0.05}, "SEK")
+
+        rows = sorted(self.mock_cursor.executemany.call_args.args[1])
+        self.assertEqual(rows, [("EUR", date(2025, 3, 1), 0.5), ("SEK", date(2025, 3, 1), 10.0),
+                                ("USD", date(2025, 3, 1), 1.0)])
+
+    def test_save_rates_needs_a_usd_rate(self):
+        with self.assertRaises(ValueError):
+            save_rates(date(2025, 3, 1), {"EUR": 0.05}, "SEK")
+
+    def test_history_query_per_currency(self):
+        get_rate_history(["sek", "EUR", "SEK"], date(2025, 3, 1), date(2025, 3, 31))
+
+        query, values = self.mock_cursor.execute.call_args.args
+        self.assertEqual(query.count("UNION ALL"), 1)
+        self.assertEqual(values[:5], ["EUR", date(2025, 3, 31), "EUR", date(2025, 3, 1), date(2025, 3, 1)])
+        self.assertEqual(values[5], "SEK")
+
+    def test_load_snapshot_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for day in ("2025-03-01", "2025-03-02"):
+                with open(os.path.join(directory, f"{day}.json"), "w") as snapshot:
+                    json.dump({"base": "USD", "date": day, "rates": {"SEK": 10.0}}, snapshot)
+
+            self.assertEqual(load_snapshots([directory]), 4)
+        self.assertEqual(self.mock_cursor.executemany.call_count, 2)
+
+    def tearDown(self):
+        self.db_patcher.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
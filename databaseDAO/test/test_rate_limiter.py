@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from databaseDAO.rate_limiter import MemoryStore, RateLimiter, RateLimitStore, SQLiteStore
+
+WINDOW = 900
+START = 1_000 * WINDOW
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_blocks_after_limit_and_reset_clears(self):
+        limiter = RateLimiter(MemoryStore(), limit=5, window_seconds=WINDOW)
+
+        self.assertEqual([limiter.hit("Eve@Example.com", START + i) for i in range(6)], [True] * 5 + [False])
+        self.assertFalse(limiter.hit("eve@example.com", START + 10))
+
+        limiter.reset("eve@example.com")
+        self.assertTrue(limiter.hit("eve@example.com", START + 11))
+
+    def test_previous_window_counts_while_it_overlaps(self):
+        limiter = RateLimiter(MemoryStore(), limit=5, window_seconds=WINDOW)
+        for _ in range(5):
+            limiter.hit("eve@example.com", START + WINDOW - 1)
+
+        # A fifth of the way into the next window, 80% of the 5 earlier attempts still count
+        self.assertTrue(limiter.hit("eve@example.com", START + WINDOW + WINDOW // 5))
+        self.assertFalse(limiter.hit("eve@example.com", START + WINDOW + WINDOW // 5))
+        # Two windows later nothing is left
+        self.assertTrue(limiter.hit("eve@example.com", START + 3 * WINDOW))
+
+    def test_memory_store_stays_bounded(self):
+        store = MemoryStore(capacity=100)
+        limiter = RateLimiter(store, limit=5, window_seconds=WINDOW)
+
+        for i in range(1000):
+            limiter.hit(f"user{i}@example.com", START)
+        self.assertEqual(len(store), 100)
+
+        # Keys two windows old are dropped as soon as anything is counted
+        limiter.hit("late@example.com", START + 2 * WINDOW)
+        self.assertEqual(len(store), 1)
+
+    def test_sqlite_store_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "limits.sqlite3")
+            first = RateLimiter(SQLiteStore(path), limit=3, window_seconds=WINDOW)
+            second = RateLimiter(SQLiteStore(path), limit=3, window_seconds=WINDOW)
+
+            self.assertTrue(first.hit("eve@example.com", START))
+            self.assertTrue(second.hit("eve@example.com", START + 1))
+            self.assertTrue(first.hit("eve@example.com", START + 2))
+            self.assertFalse(second.hit("eve@example.com", START + 3))
+
+            second.reset("eve@example.com")
+            self.assertTrue(first.hit("eve@example.com", START + 4))
+
+    def test_incomplete_store_cannot_be_created(self):
+        class CountOnly(RateLimitStore):
+            def attempt(self, key, now_window, overlap, limit):
+                return True
+
+        with self.assertRaisesRegex(TypeError, "reset"):
+            CountOnly()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from Visuals.report_renderer import RenderRejected, ReportRenderer, pack_frame, unpack_frame
+
+
+class ExitOnUnpickle:
+    """Kills the worker process that unpickles it, like an out of memory kill"""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def month_frame():
+    cents = np.array([-1250, 50000, -8900, -420])
+    return pd.DataFrame({
+        "transaction_date": pd.to_datetime(["2024-03-01", "2024-03-02", "2024-03-15", "2024-03-28"]),
+        "cents": np.abs(cents),
+        "name": ["Shop", "Salary", "Rent", "Coffee"],
+        "description": [None, "March", "", None],
+        "type": np.where(cents < 0, "expense", "income"),
+    })
+
+
+class TestReportRenderer(unittest.TestCase):
+
+    def test_frame_round_trip(self):
+        df = month_frame()
+        restored = unpack_frame(pack_frame(df))
+
+        pd.testing.assert_frame_equal(restored[df.columns].reset_index(drop=True), df,
+                                      check_dtype=False, check_index_type=False)
+
+    def test_renders_in_a_worker_process(self):
+        renderer = ReportRenderer(max_workers=1)
+        self.addCleanup(renderer.shutdown)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.pdf")
+            self.assertTrue(asyncio.run(renderer.render(1, "2024-03", path, month_frame())))
+            with open(path, "rb") as pdf:
+                self.assertEqual(pdf.read(5), b"%PDF-")
+
+        self.assertEqual(renderer.metrics()["rendered"], 1)
+
+    def test_crashed_worker_pool_is_replaced(self):
+        renderer = ReportRenderer(max_workers=1)
+        self.addCleanup(renderer.shutdown)
+
+        with patch("Visuals.report_renderer.pack_frame", lambda df: pickle.dumps(ExitOnUnpickle())):
+            with self.assertRaises(BrokenProcessPool):
+                asyncio.run(renderer.render(1, "2024-03", "unused.pdf", None))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.pdf")
+            self.assertTrue(asyncio.run(renderer.render(1, "2024-03", path, month_frame())))
+
+        metrics = renderer.metrics()
+        self.assertEqual((metrics["restarts"], metrics["failed"], metrics["rendered"], metrics["pending"]),
+                         (1, 1, 1, 0))
+
+    def test_per_user_and_queue_limits(self):
+        release = threading.Event()
+
+        def slow_render(*args):
+            release.wait(5)
+            return True
+
+        renderer = ReportRenderer(max_workers=0, max_queue=1, per_user=1)
+
+        async def scenario():
+            first = asyncio.ensure_future(renderer.render(1, "2024-03", "unused.pdf", None))
+            second = asyncio.ensure_future(renderer.render(2, "2024-03", "unused.pdf", None))
+            await asyncio.sleep(0.05)
+            with self.assertRaisesRegex(RenderRejected, "this user"):
+                await renderer.render(1, "2024-04", "unused.pdf", None)
+            with self.assertRaisesRegex(RenderRejected, "Too many"):
+                await renderer.render(3, "2024-03", "unused.pdf", None)
+            release.set()
+            return await asyncio.gather(first, second)
+
+        with patch("Visuals.report_renderer.make_report", slow_render):
+            self.assertEqual(asyncio.run(scenario()), [True, True])
+        self.assertEqual(renderer.metrics()["rejected"], 2)
+        self.assertEqual(renderer.metrics()["pending"], 0)
+
+    def test_timeout(self):
+        release = threading.Event()
+        renderer = ReportRenderer(max_workers=0, timeout=0.05)
+
+        async def scenario():
+            try:
+                await renderer.render(1, "2024-03", "unused.pdf", None)
+            finally:
+                release.set()
+
+        with patch("Visuals.report_renderer.make_report", lambda *args: release.wait(5)):
+            with self.assertRaises(TimeoutError):
+                asyncio.run(scenario())
+        self.assertEqual(renderer.metrics()["timeouts"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import threading
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from databaseDAO.transaction.rollup_DAO import (
+    bucket_range, first_whole_week, refresh_rollups, get_rollups, rollup_delta_statements, rollup_statements,
+    WEEK, MONTH, DAY
+)
+from databaseDAO.sqlConnector import db, unit_of_work
+from databaseDAO.transaction.transaction_DAO import add_transaction_batch, register_transaction
+from databaseDAO.transaction.bulk_writer import EXECUTEMANY
+from databaseDAO.transaction.importcsv import bankImporter
+
+
+class TestRollupDAO(unittest.TestCase):
+
+    def test_week_buckets_match_pandas_w_mon(self):
+        days = pd.date_range("2025-09-01", "2025-10-31", freq="D")
+        labels = pd.Series(1, index=days).resample("W-MON").sum().index
+
+        for day in days:
+            start, end = bucket_range(WEEK, day.date(), day.date())
+            self.assertIn(pd.Timestamp(end), labels)
+            self.assertEqual(end - start, timedelta(days=6))
+            self.assertTrue(start <= day.date() <= end)
+
+    def test_first_whole_week_starts_on_or_after_the_day(self):
+        for offset in range(14):
+            day = date(2025, 9, 1) + timedelta(days=offset)
+            start, end = bucket_range(WEEK, first_whole_week(day), first_whole_week(day))
+
+            self.assertEqual(end, first_whole_week(day))
+            # The week before it would reach back past day
+            self.assertTrue(start >= day > start - timedelta(days=7))
+
+    def test_month_bucket_range(self):
+        self.assertEqual(bucket_range(MONTH, date(2024, 2, 10), date(2024, 3, 31)),
+                         (date(2024, 2, 1), date(2024, 3, 31)))
+        self.assertEqual(bucket_range(DAY, date(2024, 2, 10), date(2024, 2, 12)),
+                         (date(2024, 2, 10), date(2024, 2, 12)))
+
+    def test_refresh_recomputes_only_affected_buckets(self):
+        cursor = MagicMock()
+
+        refresh_rollups(cursor, 7, ["2025-10-15", None, date(2025, 10, 16)])
+
+        statements = [c.args for c in cursor.execute.call_args_list]
+        deletes = [params for query, params in statements if query.startswith("DELETE")]
+        self.assertEqual(len(deletes), 7)
+        self.assertIn((7, MONTH, date(2025, 10, 1), date(2025, 11, 1)), deletes)
+        self.assertIn((7, DAY, date(2025, 10, 15), date(2025, 10, 17)), deletes)
+        self.assertTrue(all("INSERT INTO" in query for query, _ in statements if not query.startswith("DELETE")))
+
+    def test_refresh_without_dates_does_nothing(self):
+        cursor = MagicMock()
+        refresh_rollups(cursor, 7, [None])
+        cursor.execute.assert_not_called()
+
+    @patch("databaseDAO.transaction.importcsv.get_transaction_hashes", return_value=[])
+    @patch("databaseDAO.transaction.importcsv.add_transaction_batch")
+    @patch("databaseDAO.transaction.importcsv.db")
+    def test_import_rebuilds_rollups_once_for_partial_batches(self, mock_db, mock_batch, mock_hashes):
+        cursor = MagicMock()
+        mock_db.return_value.__enter__.return_value = (MagicMock(), cursor)
+        # The second and third batches each skip a duplicate
+        inserted = iter([100, 99, 49])
+        mock_batch.side_effect = lambda batch, **kwargs: next(inserted)
+        days = pd.date_range("2023-01-01", periods=250, freq="5D")
+        frame = pd.DataFrame({'Value date': days.strftime("%Y-%m-%d"), 'Text': 'shop', 'Amount': '-1.00'})
+
+        importer = bankImporter(user_id=1, write_strategy=EXECUTEMANY)
+        with patch("databaseDAO.transaction.importcsv.pd.read_csv", return_value=frame):
+            importer.import_csv("fake.csv")
+
+        self.assertEqual(mock_batch.call_count, 3)
+        self.assertTrue(all(c.kwargs == {"update_rollups": False} for c in mock_batch.call_args_list))
+        # The fully inserted batch got its deltas in add_transaction_batch; one rebuild covers the rest
+        expected = list(rollup_statements(1, [days[100].date(), days[-1].date()]))
+        self.assertEqual([c.args for c in cursor.execute.call_args_list], expected)
+
+    def test_delta_statements_sum_rows_per_bucket(self):
+        rows = [(1, 4, "Shop", "-12.50", None, "2025-10-14", None, b"a"),
+                (1, 4, "Shop", "-2.50", None, "2025-10-15", None, b"b"),
+                (1, 5, "Salary", "100.00", None, "2025-10-21", None, b"c"),
+                (1, 5, "Salary", "1.00", None, None, None, b"d")]
+        statements = dict((query.split()[2], (query, params)) for query, params in rollup_delta_statements(rows))
+
+        query, params = statements["transaction_rollups"]
+        self.assertIn("AS new ON DUPLICATE KEY UPDATE", query)
+        self.assertNotIn("DELETE", query)
+        buckets = [tuple(params[i:i + 10]) for i in range(0, len(params), 10)]
+        # Three days, two weeks (closing Mondays 20th and 27th), one month
+        self.assertEqual(len(buckets), 6)
+        self.assertIn((1, MONTH, date(2025, 10, 1), Decimal("100.00"), Decimal("15.00"), 1, 2, 3,
+                       Decimal("-12.50"), Decimal("100.00")), buckets)
+        self.assertIn((1, WEEK, date(2025, 10, 20), Decimal("0.00"), Decimal("15.00"), 0, 2, 2,
+                       Decimal("-12.50"), Decimal("-2.50")), buckets)
+
+        query, params = statements["merchant_rollups"]
+        buckets = [tuple(params[i:i + 7]) for i in range(0, len(params), 7)]
+        self.assertIn((1, MONTH, date(2025, 10, 1), "Shop", Decimal("0.00"), Decimal("15.00"), 2), buckets)
+        self.assertEqual(len(buckets), 4)
+
+    def test_batch_applies_deltas_only_when_every_row_was_inserted(self):
+        rows = [(1, 4, "Shop", "-12.50", None, "2025-10-14", None, b"a"),
+                (1, 4, "Shop", "-2.50", None, "2025-10-15", None, b"b")]
+        deltas = [query for query, _ in rollup_delta_statements(rows)]
+        rebuild = [query for query, _ in rollup_statements(1, [date(2025, 10, 14), date(2025, 10, 15)])]
+
+        for inserted, expected in ((2, deltas), (1, rebuild), (0, [])):
+            with self.subTest(inserted=inserted), patch("databaseDAO.transaction.transaction_DAO.db") as mock_db:
+                cursor = MagicMock(rowcount=inserted)
+                mock_db.return_value.__enter__.return_value = (MagicMock(), cursor)
+                self.assertEqual(add_transaction_batch(rows), inserted)
+                self.assertEqual([c.args[0] for c in cursor.execute.call_args_list], expected)
+
+    @patch('databaseDAO.transaction.rollup_DAO.db')
+    def test_get_rollups_rejects_unknown_period(self, mock_db):
+        with self.assertRaises(ValueError):
+            get_rollups(1, "year")
+        mock_db.assert_not_called()
+
+
+CONCURRENT_EMAIL = "rollup-concurrent@example.com"
+
+
+def _delete_concurrent_user(cursor):
+    cursor.execute("SELECT user_id FROM users WHERE email = %s", (CONCURRENT_EMAIL,))
+    row = cursor.fetchone()
+    if row:
+        cursor.execute("DELETE FROM transactions WHERE user_id = %s", (row[0],))
+        cursor.execute("DELETE FROM category WHERE user_id = %s", (row[0],))
+        cursor.execute("DELETE FROM users WHERE user_id = %s", (row[0],))
+
+
+class TestConcurrentRollups(unittest.TestCase):
+    """Registers on two connections at once, against the database"""
+
+    def setUp(self):
+        with db() as (conn, cursor):
+            _delete_concurrent_user(cursor)
+            cursor.execute("INSERT INTO users (name, email, password) VALUES (%s, %s, %s)",
+                           ("RollupUser", CONCURRENT_EMAIL, "plan:plan"))
+            self.user_id = cursor.lastrowid
+            cursor.execute("INSERT INTO category (user_id, name, type) VALUES (%s, %s, %s)",
+                           (self.user_id, "Rollup", "expense"))
+            self.category_id = cursor.lastrowid
+
+    def tearDown(self):
+        with db() as (conn, cursor):
+            _delete_concurrent_user(cursor)
+
+    def test_concurrent_registers_do_not_deadlock(self):
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def register(offset):
+            # Both transactions write into the same week and month buckets, each on its own connection
+            try:
+                with unit_of_work():
+                    barrier.wait()
+                    for i in range(20):
+                        register_transaction(self.user_id, self.category_id, "Shop", f"-{offset + i}.00", None,
+                                             date(2025, 10, 14) + timedelta(days=(offset + i) % 6))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=register, args=(offset,)) for offset in (1, 100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+        by_delta = {period: get_rollups(self.user_id, period) for period in (DAY, WEEK, MONTH)}
+        with db() as (conn, cursor):
+            refresh_rollups(cursor, self.user_id, [date(2025, 10, 14), date(2025, 10, 19)])
+        self.assertEqual(by_delta, {period: get_rollups(self.user_id, period) for period in (DAY, WEEK, MONTH)})
+        self.assertEqual(by_delta[MONTH][0]["transaction_count"], 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
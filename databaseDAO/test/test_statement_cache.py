@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from databaseDAO import sqlConnector
+from databaseDAO.connection_pool import ManagedPool
+from databaseDAO.statement_cache import StatementCache, StatementCursor, StatementStats, prepared_statement
+
+LOOKUP = prepared_statement("SELECT name FROM transactions WHERE transaction_id = %s AND user_id = %s")
+OTHER = prepared_statement("SELECT 1 FROM users WHERE user_id = %s")
+THIRD = prepared_statement("SELECT 2 FROM users WHERE user_id = %s")
+
+
+def fake_connection():
+    connection = MagicMock()
+    connection.in_transaction = False
+    connection.is_connected.return_value = True
+
+    def cursor(prepared=False, dictionary=False):
+        made = MagicMock()
+        made.fetchall.return_value = [("Coffee",)]
+        made.rowcount = 1
+        return made
+
+    connection.cursor.side_effect = cursor
+    return connection
+
+
+class TestStatementCache(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('databaseDAO.statement_cache.stats', StatementStats())
+        self.stats = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_query_is_prepared_once_per_connection(self):
+        connection = fake_connection()
+        cache = StatementCache(connection)
+
+        # An equal string built at runtime still maps to the registered object
+        rows, rowcount, _ = cache.run("SELECT name FROM transactions WHERE transaction_id = %s "
+                                      "AND user_id = %s", (1, 2))
+        cache.run(LOOKUP, (3, 2))
+
+        connection.cursor.assert_called_once_with(prepared=True, dictionary=False)
+        prepared = cache._cursors[(LOOKUP, False)]
+        self.assertTrue(all(call.args[0] is LOOKUP for call in prepared.execute.call_args_list))
+        self.assertEqual((rows, rowcount), ([("Coffee",)], 1))
+        self.assertEqual((self.stats.to_dict()["hits"], self.stats.to_dict()["misses"]), (1, 1))
+
+    def test_least_recently_used_statement_is_evicted(self):
+        cache = StatementCache(fake_connection(), capacity=2)
+        cache.run(LOOKUP, (1, 1))
+        cache.run(OTHER, (1,))
+        cache.run(LOOKUP, (1, 1))
+        first_other = cache._cursors[(OTHER, False)]
+        cache.run(THIRD, (1,))
+
+        first_other.close.assert_called_once()
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(self.stats.to_dict()["evictions"], 1)
+
+    def test_failed_statement_is_prepared_again(self):
+        connection = fake_connection()
+        cache = StatementCache(connection)
+        cache.run(LOOKUP, (1, 1))
+        cache._cursors[(LOOKUP, False)].execute.side_effect = RuntimeError("lost connection")
+
+        with self.assertRaises(RuntimeError):
+            cache.run(LOOKUP, (1, 1))
+        cache.run(LOOKUP, (1, 1))
+        self.assertEqual(connection.cursor.call_count, 2)
+
+    def test_cursor_routes_only_registered_queries(self):
+        text_cursor = MagicMock()
+        cursor = StatementCursor(text_cursor, StatementCache(fake_connection()))
+
+        cursor.execute(LOOKUP, (1, 1))
+        self.assertEqual(cursor.fetchone(), ("Coffee",))
+        self.assertIsNone(cursor.fetchone())
+        self.assertEqual(cursor.rowcount, 1)
+
+        cursor.execute("UPDATE transactions SET name = %s", ("Tea",))
+        text_cursor.execute.assert_called_once_with("UPDATE transactions SET name = %s", ("Tea",))
+        self.assertIs(cursor.fetchone(), text_cursor.fetchone.return_value)
+
+    def test_db_reuses_statements_of_a_pooled_connection(self):
+        raw = fake_connection()
+        pool = ManagedPool(lambda: raw, max_size=1)
+        with patch.object(sqlConnector, "pool", pool):
+            for _ in range(3):
+                with sqlConnector.db() as (conn, cursor):
+                    cursor.execute(LOOKUP, (1, 1))
+                    self.assertEqual(cursor.fetchall(), [("Coffee",)])
+
+        prepared_calls = [call for call in raw.cursor.call_args_list if call.kwargs.get("prepared")]
+        self.assertEqual(len(prepared_calls), 1)
+        self.assertEqual(self.stats.to_dict()["hit_ratio"], round(2 / 3, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from Visuals.time_series import income_expense_series, densify, DAILY, WEEKLY, MONTHLY
+from Visuals.Monthly_Report import prepared_for_chart
+
+
+class TestTimeSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = pd.to_datetime(["2025-03-03", "2025-03-04", "2025-03-04", "2025-03-19", "2025-04-02"])
+        self.amounts = [100.0, -20.0, -5.5, 40.0, -10.0]
+
+    def test_weekly_matches_resample(self):
+        frame = pd.DataFrame({"amount": self.amounts}, index=self.dates)
+        expected = frame.resample("W-MON")["amount"].agg([lambda a: a[a > 0].sum(), lambda a: -a[a < 0].sum()])
+
+        weekly = income_expense_series(self.dates, self.amounts, WEEKLY)
+
+        self.assertEqual(list(weekly.index), list(expected.index))
+        np.testing.assert_allclose(weekly["income"], expected.iloc[:, 0])
+        np.testing.assert_allclose(weekly["expenses"], expected.iloc[:, 1])
+
+    def test_daily_and_monthly_are_dense(self):
+        daily = income_expense_series(self.dates, self.amounts, DAILY, "2025-03-01", "2025-03-31")
+        self.assertEqual(len(daily), 31)
+        self.assertEqual(daily.loc["2025-03-04", "expenses"], 25.5)
+        self.assertEqual(daily.loc["2025-03-02", "income"], 0)
+
+        monthly = income_expense_series(self.dates, self.amounts, MONTHLY)
+        self.assertEqual(list(monthly.index), list(pd.to_datetime(["2025-03-01", "2025-04-01"])))
+        self.assertEqual(monthly["income"].tolist(), [140.0, 0.0])
+
+    def test_densify_empty_frame(self):
+        empty = pd.DataFrame(columns=["income", "expenses"])
+        self.assertTrue(densify(empty, WEEKLY).empty)
+
+    def test_prepared_for_chart_fills_every_day(self):
+        df = pd.DataFrame({
+            'transaction_date': self.dates[:4],
+            'cents': [round(abs(a) * 100) for a in self.amounts[:4]],
+            'type': ['income', 'expense', 'expense', 'income'],
+        })
+
+        chart_data = prepared_for_chart(df)
+
+        self.assertEqual(len(chart_data['day_labels']), 31)
+        self.assertEqual(chart_data['day_labels'][0], '1')
+        self.assertEqual(chart_data['expense_amounts'][3], 25.5)
+        self.assertEqual(chart_data['income_amounts'][18], 40.0)
+        self.assertEqual(sum(chart_data['income_amounts']), 140.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
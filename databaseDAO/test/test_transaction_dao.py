@@ -4,8 +4,11 @@ from databaseDAO.transaction.transaction_DAO import (
     register_transaction,
     delete_transaction,
     update_transaction,
-    get_transaction, get_all_transactions
+    get_transaction, get_all_transactions,
+    list_transactions, encode_cursor, decode_cursor, get_dashboard_summary
 )
+from databaseDAO.money import Money
+from datetime import date
 
 
 class TestTransactionDAO(unittest.TestCase):
@@ -20,6 +23,9 @@ class TestTransactionDAO(unittest.TestCase):
         mock_db_cm.__exit__ = MagicMock(return_value=False)
         self.mock_db.return_value = mock_db_cm
 
+        self.rollup_patcher = patch('databaseDAO.transaction.transaction_DAO.refresh_rollups')
+        self.mock_refresh_rollups = self.rollup_patcher.start()
+
     def test_register_transaction_success(self):
         result = register_transaction(
             user_id=1,
@@ -120,7 +126,71 @@ class TestTransactionDAO(unittest.TestCase):
         self.assertEqual(check1, user1_data)
         self.assertNotIn({"transaction_id": 3, "user_id": 2, "name": "Coffee", "amount": 5.00}, check1)
 
+    def test_list_transactions_first_page(self):
+        self.mock_cursor.fetchall.return_value = [
+            {"transaction_id": 9, "transaction_date": date(2025, 10, 17)},
+            {"transaction_id": 7, "transaction_date": date(2025, 10, 16)},
+            {"transaction_id": 8, "transaction_date": date(2025, 10, 15)},
+        ]
+
+        rows, next_cursor = list_transactions(user_id=1, limit=2, category_id=3, search="50%")
+
+        query, params = self.mock_cursor.execute.call_args.args
+        self.assertIn("ORDER BY transaction_date DESC, transaction_id DESC", query)
+        self.assertIn("category_id = %s", query)
+        self.assertEqual(params, [1, 3, "%50\\%%", "%50\\%%", 3])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(decode_cursor(next_cursor), (date(2025, 10, 16), 7))
+
+    def test_list_transactions_continues_after_cursor(self):
+        self.mock_cursor.fetchall.side_effect = [
+            [{"transaction_id": 3, "transaction_date": date(2025, 10, 1)}],
+            [{"transaction_id": 2, "transaction_date": None}],
+        ]
+
+        rows, next_cursor = list_transactions(user_id=1, limit=5,
+                                              cursor=encode_cursor(date(2025, 10, 16), 7))
+
+        dated_query, dated_params = self.mock_cursor.execute.call_args_list[0].args
+        self.assertIn("(transaction_date, transaction_id) < (%s, %s)", dated_query)
+        self.assertEqual(dated_params, [1, date(2025, 10, 16), 7, 6])
+        undated_query, undated_params = self.mock_cursor.execute.call_args_list[1].args
+        self.assertIn("transaction_date IS NULL", undated_query)
+        self.assertEqual(undated_params, [1, 5])
+        self.assertEqual([row["transaction_id"] for row in rows], [3, 2])
+        self.assertIsNone(next_cursor)
+
+    def test_list_transactions_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            list_transactions(user_id=1, fields=["transaction_hash"])
+        with self.assertRaises(ValueError):
+            list_transactions(user_id=1, cursor="not-a-cursor")
+
+    def test_dashboard_summary_reads_rollups(self):
+        self.mock_cursor.fetchall.side_effect = [
+            [(10000, 2000, 1, 1, 2), (0, 1550, 0, 1, 1), (1025, 0, 1, 0, 1)],
+            [{"transaction_id": 3, "transaction_date": date(2025, 10, 17)}],
+            [],
+        ]
+
+        summary = get_dashboard_summary(user_id=1, recent_limit=5)
+
+        totals_query = self.mock_cursor.execute.call_args_list[0].args[0]
+        self.assertIn("FROM transaction_rollups", totals_query)
+        self.assertEqual(summary["total_income"], Money(11025))
+        self.assertEqual(summary["total_expenses"], Money(3550))
+        self.assertEqual(summary["transaction_count"], 4)
+        self.assertEqual(len(summary["recent_transactions"]), 1)
+
+    def test_writes_refresh_rollups_in_same_transaction(self):
+        self.mock_cursor.fetchone.return_value = (date(2025, 10, 15),)
+
+        delete_transaction(transaction_id=1, user_id=1)
+
+        self.mock_refresh_rollups.assert_called_once_with(self.mock_cursor, 1, [date(2025, 10, 15)])
+
     def tearDown(self):
+        self.rollup_patcher.stop()
         self.db_patcher.stop()
 
 
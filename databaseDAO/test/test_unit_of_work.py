@@ -0,0 +1,155 @@
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.testclient import TestClient
+
+from databaseDAO import async_db, sqlConnector
+from databaseDAO.sqlConnector import db, unit_of_work
+from databaseDAO.transaction import transaction_DAO, transaction_DAO_async
+from databaseDAO.transaction.rollup_DAO import rollup_statements
+from databaseDAO.user_context import UserContext, UserContextCache
+from dependencies import unit_of_work as unit_of_work_dependency
+from routers import accounts, currency, reports, transactions
+from Visuals import Monthly_Report
+
+ROLLUP_ROUND_TRIPS = len(list(rollup_statements(1, [date(2024, 3, 1)])))
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Pool checkouts and round trips per operation, with a mocked connection"""
+
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cursor = self.conn.cursor.return_value
+        patcher = patch.object(sqlConnector, "get_connection", return_value=self.conn)
+        self.get_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_update_transaction_uses_one_checkout(self):
+        self.cursor.fetchone.return_value = (date(2024, 3, 1),)
+        with unit_of_work():
+            self.assertTrue(transaction_DAO.update_transaction(1, 1, name="New name"))
+            self.assertEqual(self.conn.commit.call_count, 0)
+
+        self.assertEqual(self.get_connection.call_count, 1)
+        self.assertEqual(self.cursor.execute.call_count, 2 + ROLLUP_ROUND_TRIPS)
+        self.conn.commit.assert_called_once()
+        self.conn.close.assert_called_once()
+
+    def test_delete_report_service_uses_one_checkout(self):
+        self.conn.cursor.return_value.fetchone.return_value = {"report_month": "2024-03"}
+        self.cursor.rowcount = 1
+        with unit_of_work():
+            Monthly_Report.delete_report_service(7, 1)
+
+        self.assertEqual((self.get_connection.call_count, self.cursor.execute.call_count), (1, 2))
+
+    def test_generate_report_reads_month_once(self):
+        self.cursor.fetchone.return_value = (1,)
+        self.cursor.fetchall.return_value = [(date(2024, 3, 1), -1250, "Shop", None),
+                                             (date(2024, 3, 2), 50000, "Salary", None)]
+        self.cursor.lastrowid = 3
+        # The request's get_user_context dependency has already cached the user
+        contexts = UserContextCache()
+        contexts.put(1, UserContext(1, "Tester", "tester@example.com", "legacy"))
+        with unit_of_work(), patch.object(Monthly_Report, "SimpleDocTemplate"), \
+                patch("databaseDAO.user_context.user_contexts", contexts):
+            result = Monthly_Report.generate_monthly_report_service(1, "2024-03")
+
+        self.assertEqual(result["report_id"], 3)
+        # The month's transactions and the report upsert
+        self.assertEqual((self.get_connection.call_count, self.cursor.execute.call_count), (1, 2))
+
+    def test_error_rolls_back_whole_unit(self):
+        with self.assertRaises(RuntimeError), unit_of_work():
+            with db() as (conn, cursor):
+                cursor.execute("UPDATE account SET account_balance = 0")
+            raise RuntimeError("later step failed")
+
+        self.conn.rollback.assert_called_once()
+        self.conn.commit.assert_not_called()
+
+    def test_dependency_shares_connection_across_threads(self):
+        def read():
+            with db() as (conn, cursor):
+                cursor.execute("SELECT 1")
+
+        router = APIRouter(dependencies=[Depends(unit_of_work_dependency, scope="function")])
+
+        @router.get("/work")
+        async def work():
+            await run_in_threadpool(read)
+            await run_in_threadpool(read)
+            return {}
+
+        app = FastAPI()
+        app.include_router(router)
+        with TestClient(app) as client:
+            self.assertEqual(client.get("/work").status_code, 200)
+
+        self.assertEqual((self.get_connection.call_count, self.cursor.execute.call_count), (1, 2))
+        self.conn.commit.assert_called_once()
+        # Nothing leaks into code that runs after the request
+        read()
+        self.assertEqual(self.get_connection.call_count, 2)
+
+    def test_commit_happens_before_response_is_sent(self):
+        events = []
+        self.conn.commit.side_effect = lambda: events.append("commit")
+
+        def write():
+            with db() as (conn, cursor):
+                cursor.execute("UPDATE account SET account_balance = 0")
+
+        async def handler():
+            await run_in_threadpool(write)
+            return {}
+
+        # The dependency exactly as the routers declare it
+        declared = [dependency for module in (accounts, currency, reports, transactions)
+                    for dependency in module.router.dependencies]
+        self.assertTrue(all(dependency.scope == "function" for dependency in declared))
+        router = APIRouter(dependencies=[declared[0]])
+        router.post("/work")(handler)
+
+        app = FastAPI()
+        app.include_router(router)
+
+        async def record_send(scope, receive, send):
+            async def sending(message):
+                if message["type"] == "http.response.start":
+                    events.append("sent")
+                await send(message)
+            await app(scope, receive, sending)
+
+        with TestClient(record_send) as client:
+            self.assertEqual(client.post("/work").status_code, 200)
+
+        self.assertEqual(events, ["commit", "sent"])
+
+
+class TestAsyncUnitOfWork(unittest.IsolatedAsyncioTestCase):
+
+    async def test_async_daos_share_one_checkout(self):
+        cursor = MagicMock(execute=AsyncMock(), close=AsyncMock(), fetchone=AsyncMock(return_value=(date(2024, 3, 1),)),
+                           fetchall=AsyncMock(return_value=[]))
+        conn = MagicMock(cursor=AsyncMock(return_value=cursor), commit=AsyncMock(), rollback=AsyncMock())
+        pool = MagicMock(acquire=AsyncMock(return_value=conn))
+
+        with patch.object(async_db, "get_pool", AsyncMock(return_value=pool)):
+            async with async_db.async_unit_of_work():
+                await transaction_DAO_async.update_transaction(1, 1, name="New name")
+                await transaction_DAO_async.get_dashboard_summary(1)
+
+        pool.acquire.assert_awaited_once()
+        conn.commit.assert_awaited_once()
+        pool.release.assert_called_once_with(conn)
+        # update: 2 + rollups; dashboard: totals, dated and undated listing pages
+        self.assertEqual(cursor.execute.await_count, 2 + ROLLUP_ROUND_TRIPS + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
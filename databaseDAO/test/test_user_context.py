@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import HTTPException
+
+import dependencies
+from databaseDAO import userDAO, user_context
+from databaseDAO.user_context import USER_CONTEXT_QUERY, UserContext, UserContextCache
+
+
+class TestUserContext(unittest.TestCase):
+
+    def setUp(self):
+        self.cursor = MagicMock()
+        self.contexts = UserContextCache()
+        patcher = patch('databaseDAO.user_context.user_contexts', self.contexts)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        @contextmanager
+        def fake_db(dictionary=False):
+            yield MagicMock(), self.cursor
+
+        for module in ('databaseDAO.user_context', 'databaseDAO.userDAO'):
+            patcher = patch(f'{module}.db', fake_db)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_context_is_loaded_once(self):
+        self.cursor.fetchone.return_value = ("FrankTest", "frank@example.com", "scrypt$16384$8$1$aa$bb")
+
+        context = user_context.get_user_context(4)
+        self.assertEqual((context.name, context.email, context.hash_version),
+                         ("FrankTest", "frank@example.com", "scrypt$16384$8$1"))
+        self.assertNotIn("scrypt$16384$8$1$aa$bb", vars(context).values())
+        self.assertIs(user_context.get_user_context(4), context)
+        self.cursor.execute.assert_called_once_with(USER_CONTEXT_QUERY, (4,))
+
+    def test_missing_users_are_cached_and_rejected(self):
+        self.cursor.fetchone.return_value = None
+
+        self.assertIsNone(user_context.get_user_context(5))
+        self.assertIsNone(user_context.get_user_context(5))
+        self.assertEqual(self.cursor.execute.call_count, 1)
+
+        with patch('databaseDAO.user_context_async.get_user_context', AsyncMock(return_value=None)):
+            with self.assertRaises(HTTPException) as raised:
+                asyncio.run(dependencies.get_user_context(5))
+        self.assertEqual(raised.exception.status_code, 401)
+
+    def test_update_userinfo_skips_lookup_and_invalidates(self):
+        self.contexts.put(4, UserContext(4, "FrankTest", "frank@example.com", "legacy"))
+
+        self.assertTrue(userDAO.update_userinfo("frank@example.com", name="FrankNew", user_id=4))
+        self.cursor.execute.assert_called_once_with("UPDATE users SET name = %s WHERE user_id = %s", ("FrankNew", 4))
+        self.assertEqual(self.contexts.get(4), (False, None))
+
+    def test_lookup_racing_an_invalidation_is_not_cached(self):
+        generation = self.contexts.generation
+        self.contexts.invalidate(4)
+        self.contexts.put(4, UserContext(4, "FrankTest", "frank@example.com", "legacy"), generation)
+
+        self.assertEqual(self.contexts.get(4), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from databaseDAO.sqlConnector import db, LOAD_DATA_LOCAL
+from databaseDAO.transaction.transaction_DAO import TRANSACTION_COLUMNS, INSERT_BATCH_QUERY
+from databaseDAO.transaction.transaction_hash import is_binary
+from databaseDAO.transaction.rollup_DAO import WrittenDates, apply_rollup_deltas
+
+
+EXECUTEMANY = "executemany"
+MULTIROW = "multirow"
+LOAD_DATA = "load_data"
+
+MULTIROW_MAX_ROWS = int(os.getenv("BULK_MULTIROW_MAX_ROWS", "5000"))
+LOAD_DATA_MIN_BYTES = int(os.getenv("BULK_LOAD_DATA_MIN_MB", "50")) * 1024 * 1024
+STAGING_TABLE = "import_staging"
+
+COLUMN_LIST = ", ".join(TRANSACTION_COLUMNS)
+ROW_PLACEHOLDER = "(" + ",".join(["%s"] * len(TRANSACTION_COLUMNS)) + ")"
+MULTIROW_PREFIX = f"INSERT IGNORE INTO transactions ({COLUMN_LIST}) VALUES "
+
+# Binary hashes are written to the staging file as hex and decoded by the server
+if is_binary():
+    LOAD_DATA_COLUMNS = COLUMN_LIST.replace("transaction_hash", "@transaction_hash")
+    LOAD_DATA_SET = " SET transaction_hash = UNHEX(@transaction_hash)"
+else:
+    LOAD_DATA_COLUMNS = COLUMN_LIST
+    LOAD_DATA_SET = ""
+
+
+class BulkWriter:
+    """
+    Keeps rollups up to date: rows that were all inserted are added by
+    delta; for writes that skipped duplicates the date range is tracked
+    per user and rebuilt once per import
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.written_dates = WrittenDates()
+
+    def _track(self, rows, inserted):
+        if inserted == len(rows):
+            apply_rollup_deltas(self.cursor, rows)
+        elif inserted:
+            self.written_dates.add(rows)
+
+    def refresh_rollups(self):
+        self.written_dates.refresh(self.cursor)
+
+    def close(self):
+        pass
+
+
+class ExecutemanyWriter(BulkWriter):
+    """INSERT IGNORE with executemany in batches of 100, on the shared connection"""
+
+    def __init__(self, cursor, batch_size=100):
+        super().__init__(cursor)
+        self.batch_size = batch_size
+
+    def write(self, rows):
+        inserted = 0
+        for start in range(0, len(rows), self.batch_size):
+            self.cursor.executemany(INSERT_BATCH_QUERY, rows[start:start + self.batch_size])
+            inserted += self.cursor.rowcount
+        self._track(rows, inserted)
+        return inserted
+
+
+class MultiRowWriter(BulkWriter):
+    """
+    INSERT IGNORE with one multi-row VALUES list per statement
+
+    Statements are cut before they reach half of the server's
+    max_allowed_packet (escaping can at most double a value) or
+    MULTIROW_MAX_ROWS rows, whichever comes first.
+    """
+
+    def __init__(self, cursor, max_rows=MULTIROW_MAX_ROWS):
+        super().__init__(cursor)
+        self.max_rows = max_rows
+
+        cursor.execute("SELECT @@max_allowed_packet")
+        self.max_bytes = int(cursor.fetchone()[0]) // 2
+
+    def write(self, rows):
+        inserted = 0
+        statement_rows = []
+        size = len(MULTIROW_PREFIX)
+
+        for row in rows:
+            # Each value is quoted and separated by a comma, each row adds "()," too
+            row_size = sum(len(str(value)) + 3 for value in row) + 3
+            if statement_rows and (size + row_size > self.max_bytes or len(statement_rows) >= self.max_rows):
+                inserted += self._execute(statement_rows)
+                statement_rows = []
+                size = len(MULTIROW_PREFIX)
+
+            statement_rows.append(row)
+            size += row_size
+
+        if statement_rows:
+            inserted += self._execute(statement_rows)
+        self._track(rows, inserted)
+        return inserted
+
+    def _execute(self, rows):
+        query = MULTIROW_PREFIX + ",".join([ROW_PLACEHOLDER] * len(rows))
+        self.cursor.execute(query, [value for row in rows for value in row])
+        return self.cursor.rowcount
+
+
+def _tsv_value(value):
+    if value is None:
+        return r"\N"
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class LoadDataWriter(BulkWriter):
+    """
+    Stage rows with LOAD DATA LOCAL INFILE, then merge them into transactions
+
+    Each write() loads its rows into a temporary staging table and merges
+    them with INSERT IGNORE ... SELECT, so rows whose (user_id,
+    transaction_hash) already exists are skipped by the unique key. Needs
+    DB_LOAD_DATA_LOCAL=1 and local_infile enabled on the server.
+    """
+
+    def __init__(self, cursor):
+        super().__init__(cursor)
+
+        # Copy column types without indexes, so the staging load never rejects rows
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(f"CREATE TEMPORARY TABLE {STAGING_TABLE} AS "
+                       f"SELECT {COLUMN_LIST} FROM transactions LIMIT 0")
+
+    def write(self, rows):
+        if not rows:
+            return 0
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.tsv', delete=False,
+                                         encoding='utf-8', newline='\n') as staging_file:
+            for row in rows:
+                staging_file.write("\t".join(_tsv_value(value) for value in row) + "\n")
+
+        try:
+            self.cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {STAGING_TABLE} CHARACTER SET utf8mb4 "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({LOAD_DATA_COLUMNS})"
+                f"{LOAD_DATA_SET}",
+                (staging_file.name,)
+            )
+            self.cursor.execute(f"INSERT IGNORE INTO transactions ({COLUMN_LIST}) "
+                                f"SELECT {COLUMN_LIST} FROM {STAGING_TABLE}")
+            inserted = self.cursor.rowcount
+            self.cursor.execute(f"DELETE FROM {STAGING_TABLE}")
+        finally:
+            os.unlink(staging_file.name)
+
+        self._track(rows, inserted)
+        return inserted
+
+    def close(self):
+        self.cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}")
+
+
+WRITERS = {
+    EXECUTEMANY: ExecutemanyWriter,
+    MULTIROW: MultiRowWriter,
+    LOAD_DATA: LoadDataWriter,
+}
+
+
+def choose_strategy(file_size=None):
+    """Pick LOAD DATA for very large files when the connection allows it, multi-row INSERT otherwise"""
+    if LOAD_DATA_LOCAL and file_size is not None and file_size >= LOAD_DATA_MIN_BYTES:
+        return LOAD_DATA
+    return MULTIROW
+
+
+@contextmanager
+def bulk_writer(strategy=MULTIROW):
+    """
+    Open one connection and transaction for a whole import
+
+    Yields a writer whose write(rows) returns the number of rows inserted.
+    Everything written is committed when the block exits, together with the
+    refreshed rollups, and rolled back if it raises.
+    """
+    if strategy not in WRITERS:
+        raise ValueError(f"Unknown bulk write strategy: {strategy}")
+
+    with db() as (conn, cursor):
+        writer = WRITERS[strategy](cursor)
+        try:
+            yield writer
+            writer.refresh_rollups()
+        finally:
+            writer.close()
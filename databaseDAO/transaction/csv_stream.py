@@ -0,0 +1,144 @@
+import codecs
+import csv
+import io
+
+import pandas as pd
+
+
+BLOCK_SIZE = 1024 * 1024  # bytes read from the upload at a time
+CHUNK_ROWS = 10000  # rows parsed into one DataFrame
+SNIFF_DELIMITERS = ',;\t|'
+
+
+class CsvChunkReader:
+    """
+    Read a CSV file object in fixed-size blocks and yield DataFrames
+
+    Only one block of raw bytes and one chunk of rows are held in memory at
+    a time, so memory use does not depend on the size of the upload.
+
+    Args:
+        fileobj: Binary file object (e.g. UploadFile.file)
+        block_size: Bytes read per call to fileobj.read
+        chunk_rows: Maximum number of rows in each yielded DataFrame
+        max_bytes: Optional upper bound on the total file size
+
+    Raises:
+        ValueError: If the file is too large or contains NUL bytes
+    """
+
+    def __init__(self, fileobj, block_size=BLOCK_SIZE, chunk_rows=CHUNK_ROWS, max_bytes=None):
+        self.fileobj = fileobj
+        self.block_size = block_size
+        self.chunk_rows = chunk_rows
+        self.max_bytes = max_bytes
+
+        self.header = None
+        self.delimiter = ','
+        self.quotechar = '"'
+        self.bytes_read = 0
+        self.rows_read = 0
+
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._pending = ""
+        self._record = []
+        self._records = []
+        self._eof = False
+
+    def _read_block(self):
+        raw = self.fileobj.read(self.block_size)
+        if not raw:
+            self._eof = True
+            return self._decoder.decode(b"", final=True)
+
+        self.bytes_read += len(raw)
+        if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+            raise ValueError(f"File too large. Maximum size: {self.max_bytes / (1024 * 1024):.1f} MB")
+        if b'\x00' in raw:
+            raise ValueError("File contains invalid characters")
+
+        try:
+            return self._decoder.decode(raw)
+        except UnicodeDecodeError:
+            # Not UTF-8: decode the rest as latin-1 like before, starting with
+            # the bytes the UTF-8 decoder held back from the previous block.
+            # Earlier blocks were plain ASCII or valid UTF-8 and are kept as read.
+            held_back, _ = self._decoder.getstate()
+            self._decoder = codecs.getincrementaldecoder('latin-1')()
+            return self._decoder.decode(held_back + raw)
+
+    def _split_records(self, text):
+        """Turn decoded text into complete CSV records, keeping partial lines"""
+        lines = (self._pending + text).split('\n')
+        self._pending = "" if self._eof else lines.pop()
+
+        for line in lines:
+            line = line.rstrip('\r')
+            if not self._record:
+                if not line.strip():
+                    continue
+                # Some banks quote every whole line; strip those outer quotes
+                if line.startswith('"') and line.endswith('"') and line.count('"') == 2:
+                    line = line[1:-1]
+
+            self._record.append(line)
+            # A quoted field may contain a newline, wait for the closing quote
+            if sum(part.count(self.quotechar) for part in self._record) % 2 == 0:
+                self._records.append('\n'.join(self._record))
+                self._record = []
+
+        if self._eof and self._record:
+            self._records.append('\n'.join(self._record))
+            self._record = []
+
+    def _fill(self):
+        while len(self._records) < self.chunk_rows and not self._eof:
+            self._split_records(self._read_block())
+
+    def read_header(self):
+        """
+        Read the first block, detect the dialect and return the header line
+
+        Returns:
+            The header line, or None if the file has no content
+        """
+        if self.header is not None:
+            return self.header
+
+        self._split_records(self._read_block())
+        while not self._records and not self._eof:
+            self._split_records(self._read_block())
+        if not self._records:
+            return None
+
+        sample = '\n'.join(self._records[:20])
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=SNIFF_DELIMITERS)
+            self.delimiter = dialect.delimiter
+            self.quotechar = dialect.quotechar or '"'
+        except csv.Error:
+            pass
+
+        self.header = self._records.pop(0)
+        return self.header
+
+    def __iter__(self):
+        if self.read_header() is None:
+            return
+
+        while True:
+            self._fill()
+            if not self._records:
+                return
+
+            records = self._records[:self.chunk_rows]
+            self._records = self._records[self.chunk_rows:]
+            self.rows_read += len(records)
+
+            yield pd.read_csv(
+                io.StringIO('\n'.join([self.header] + records)),
+                sep=self.delimiter,
+                quotechar=self.quotechar,
+                skipinitialspace=True,
+                dtype=str,
+            )
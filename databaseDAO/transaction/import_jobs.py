@@ -0,0 +1,259 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from databaseDAO.transaction.bulk_writer import choose_strategy, EXECUTEMANY
+from databaseDAO.transaction.csv_stream import CsvChunkReader
+from databaseDAO.transaction.importcsv import bankImporter, ImportCancelled
+
+
+# Each running import holds one pooled MySQL connection at a time, so the
+# worker count bounds how much of the pool imports can take away from requests.
+MAX_WORKERS = int(os.getenv("IMPORT_MAX_WORKERS", "2"))
+MAX_JOBS_PER_USER = int(os.getenv("IMPORT_MAX_JOBS_PER_USER", "1"))
+MAX_QUEUED_JOBS = int(os.getenv("IMPORT_MAX_QUEUED_JOBS", "20"))
+JOB_RETENTION_SECONDS = int(os.getenv("IMPORT_JOB_RETENTION_SECONDS", "3600"))
+MAX_REPORTED_ERRORS = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = {QUEUED, RUNNING}
+
+
+class ImportLimitError(Exception):
+    """Raised when a user or the server already has too many imports in progress"""
+
+
+class ImportJob:
+    def __init__(self, user_id, file_path, max_bytes=None, write_strategy=None):
+        self.job_id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.file_path = file_path
+        self.status = QUEUED
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        if write_strategy is None:
+            write_strategy = choose_strategy(os.path.getsize(file_path))
+
+        self.cancel_event = threading.Event()
+        self.importer = bankImporter(user_id=user_id, default_category_id=1, cancel_event=self.cancel_event,
+                                     write_strategy=write_strategy)
+        self.reader = None
+        self.max_bytes = max_bytes
+
+    def to_dict(self):
+        """Progress and, once finished, results in the shape the import page expects"""
+        importer = self.importer
+        rows_parsed = self.reader.rows_read if self.reader is not None else 0
+
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "write_strategy": importer.write_strategy,
+            "rows_parsed": rows_parsed,
+            "imported": importer.imported_count,
+            "duplicates": importer.duplicate_count,
+            "file_duplicates": importer.file_duplicate_count,
+            "existing_duplicates": importer.existing_duplicate_count,
+            "total": importer.imported_count + importer.duplicate_count,
+            "error_count": len(importer.errors),
+            "errors": importer.errors[:MAX_REPORTED_ERRORS],
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "user_id": self.user_id
+        }
+
+
+class ImportJobManager:
+    """
+    Run CSV imports on a bounded worker pool
+
+    Jobs are kept in memory until JOB_RETENTION_SECONDS after they finish.
+    A user can have at most max_jobs_per_user imports queued or running, and
+    at most max_workers + max_queued imports are accepted server-wide.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, max_jobs_per_user=MAX_JOBS_PER_USER,
+                 max_queued=MAX_QUEUED_JOBS, retention_seconds=JOB_RETENTION_SECONDS, write_strategy=None):
+        self.write_strategy = write_strategy
+        self.max_workers = max_workers
+        self.max_jobs_per_user = max_jobs_per_user
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="csv-import")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user_id, file_path, max_bytes=None):
+        """
+        Queue an import of a CSV file that is already on disk
+
+        The job owns file_path and deletes it when it finishes.
+
+        Raises:
+            ImportLimitError: If the per-user or global limit is reached
+        """
+        with self._lock:
+            self._purge_finished()
+
+            active = [job for job in self._jobs.values() if job.status in ACTIVE_STATUSES]
+            if sum(1 for job in active if job.user_id == user_id) >= self.max_jobs_per_user:
+                raise ImportLimitError("You already have an import in progress")
+            if len(active) >= self.max_workers + self.max_queued:
+                raise ImportLimitError("Too many imports in progress, try again later")
+
+            job = ImportJob(user_id, file_path, max_bytes, self.write_strategy)
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id, user_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def list(self, user_id):
+        with self._lock:
+            self._purge_finished()
+            jobs = [job for job in self._jobs.values() if job.user_id == user_id]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id, user_id):
+        """
+        Ask a queued or running job to stop
+
+        Returns:
+            The job, or None if it does not exist for this user
+        """
+        job = self.get(job_id, user_id)
+        if job is None:
+            return None
+
+        job.cancel_event.set()
+        with self._lock:
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        return job
+
+    def shutdown(self):
+        """Cancel every job and wait until the running ones have stopped and recorded their status"""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_event.set()
+                if job.status == QUEUED:
+                    job.status = CANCELLED
+                    job.finished_at = time.time()
+        self._executor.shutdown(wait=True, cancel_futures=False)
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _run(self, job):
+        try:
+            with self._lock:
+                if job.status != QUEUED:
+                    return
+                job.status = RUNNING
+                job.started_at = time.time()
+
+            with open(job.file_path, 'rb') as f:
+                job.reader = CsvChunkReader(f, max_bytes=job.max_bytes)
+                result = job.importer.import_stream(job.reader)
+
+            if result is None:
+                job.status = FAILED
+                job.error = "Missing required columns"
+            else:
+                job.status = COMPLETED
+
+        except ImportCancelled:
+            job.status = CANCELLED
+            if job.importer.write_strategy != EXECUTEMANY:
+                job.error = "Import cancelled, rows written before cancelling were rolled back"
+        except ValueError as e:
+            job.status = FAILED
+            job.error = str(e)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.status = FAILED
+            job.error = f"Error processing file: {str(e)}"
+        finally:
+            if job.finished_at is None:
+                job.finished_at = time.time()
+            try:
+                os.unlink(job.file_path)
+            except OSError:
+                pass
+
+
+def spool_upload(fileobj, max_bytes=None, block_size=1024 * 1024):
+    """
+    Copy an uploaded file to a temporary file the import worker can read later
+
+    Returns:
+        Path of the temporary file
+
+    Raises:
+        ValueError: If the upload is larger than max_bytes
+    """
+    temp_file = tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False)
+    try:
+        with temp_file:
+            copied = 0
+            while True:
+                block = fileobj.read(block_size)
+                if not block:
+                    break
+                copied += len(block)
+                if max_bytes is not None and copied > max_bytes:
+                    raise ValueError(f"File too large. Maximum size: {max_bytes / (1024 * 1024):.1f} MB")
+                temp_file.write(block)
+    except Exception:
+        os.unlink(temp_file.name)
+        raise
+    return temp_file.name
+
+
+_import_job_manager_instance = None
+
+
+def get_import_job_manager() -> ImportJobManager:
+    """
+    Get the global import job manager instance (Singleton Pattern)
+    """
+    global _import_job_manager_instance
+
+    if _import_job_manager_instance is None:
+        _import_job_manager_instance = ImportJobManager()
+
+    return _import_job_manager_instance
+
+
+def shutdown_import_job_manager():
+    """Shut down the global manager if one was started, e.g. from the app lifespan"""
+    global _import_job_manager_instance
+
+    manager, _import_job_manager_instance = _import_job_manager_instance, None
+    if manager is not None:
+        manager.shutdown()
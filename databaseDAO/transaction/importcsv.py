@@ -1,23 +1,48 @@
-from databaseDAO.sqlConnector import get_connection
+from databaseDAO.sqlConnector import db, get_connection
 from mysql.connector import Error
+import numpy as np
 import pandas as pd
-import hashlib
-from decimal import Decimal, InvalidOperation
+from contextlib import contextmanager
+from datetime import date, timedelta
 
-from databaseDAO.transaction.transaction_DAO import register_transaction, add_transaction_batch
+from databaseDAO.money import Money, cents_array
+from databaseDAO.transaction.transaction_DAO import register_transaction, add_transaction_batch, get_transaction_hashes
+from databaseDAO.transaction.bulk_writer import bulk_writer, EXECUTEMANY
+from databaseDAO.transaction.rollup_DAO import WrittenDates
+from databaseDAO.transaction.transaction_hash import generate_transaction_hash, digest_key
+
+
+# Amounts with at most two decimals survive a float round trip unchanged,
+# so they can be parsed to cents as a whole column; anything else goes
+# through Money.of one by one.
+PLAIN_AMOUNT_PATTERN = r'-?\d+(?:\.\d{1,2})?'
+
+
+def _shift_day(day, days):
+    return (date.fromisoformat(str(day)) + timedelta(days=days)).isoformat()
+
+
+class ImportCancelled(Exception):
+    """Raised inside an import when its cancel_event has been set"""
 
 
 class bankImporter:
-    def __init__(self, user_id, default_category_id=1):
+    def __init__(self, user_id, default_category_id=1, columnar=True, cancel_event=None,
+                 write_strategy=EXECUTEMANY, prefilter_duplicates=True):
         self.user_id = user_id
         self.category_id = default_category_id
+        self.columnar = columnar
+        self.cancel_event = cancel_event
+        self.write_strategy = write_strategy
+        self.prefilter_duplicates = prefilter_duplicates
+        self._writer = None
+        self._written = None
 
         # Initialize counters
-        self.imported_count = 0
-        self.duplicate_count = 0
+        self._reset()
 
     def _generate_hash(self, transaction):
-        return hashlib.sha256(transaction.encode()).hexdigest()
+        return generate_transaction_hash(transaction)
 
     def _clean_amount(self, amount):
         if pd.isna(amount):
@@ -25,140 +50,285 @@ class bankImporter:
         amount_clean = str(amount).replace(',', '').strip()
         return amount_clean
 
-    def import_csv(self, file_path: str):
-        try:
-            file = pd.read_csv(file_path, sep=None, engine='python', skipinitialspace=True, quotechar='"')
-
-            file.columns = file.columns.str.strip().str.strip('"\'')
-
-            print(f"DEBUG: All CSV columns detected: {list(file.columns)}")
-            print(f"DEBUG: Total rows read by pandas: {len(file)}")
-
-            # Show first few rows for debugging
-            if len(file) > 0:
-                print(f"DEBUG: First row data:")
-                print(file.head(1).to_dict('records'))
-
-            # Check for required columns (but allow extra columns)
-            required_columns = ['Value date', 'Text', 'Amount']
-            missing_columns = []
-
-            for col in required_columns:
-                if col not in file.columns:
-                    missing_columns.append(col)
-
-            if missing_columns:
-                print(f"Error: Missing required columns: {missing_columns}")
-                print(f"Available columns: {list(file.columns)}")
-                print(f"Expected columns: {required_columns}")
-                return None
-
-            print(f"DEBUG: All required columns found! Extra columns will be ignored.")
-
-            # Check for NA values in required columns before dropping
-            print(f"DEBUG: NA counts in required columns:")
-            for col in required_columns:
-                na_count = file[col].isna().sum()
-                print(f"  {col}: {na_count} NA values")
-
-            initial_count = len(file)
-            file = file.dropna(subset=required_columns)
-            dropped_count = initial_count - len(file)
-
-            if dropped_count > 0:
-                print(f"DEBUG: Dropped {dropped_count} rows with missing data in required columns")
+    def _prepare_rows(self, file, first_row=1):
+        """
+        Build insert rows for a whole frame with column operations
+
+        Produces the same rows, hashes and per-row error messages as
+        _prepare_rows_iterrows, but only falls back to per-row parsing for
+        amounts and dates the column parsers could not handle.
+
+        Returns:
+            (rows, errors) where rows are tuples for add_transaction_batch
+        """
+        count = len(file)
+        if count == 0:
+            return [], []
+
+        row_numbers = np.arange(first_row, first_row + count)
+        errors = {}
+
+        # Normalize descriptions: lowercase and collapse whitespace
+        text = file['Text']
+        description = text.astype(str).str.lower().str.split().str.join(" ")
+        valid = (~text.isna() & (description != "")).to_numpy(dtype=bool, copy=True)
+        for index in row_numbers[~valid]:
+            errors[index] = f"Row {index}: Skipping - missing description"
+
+        # Parse amounts, plain numbers as one float column
+        amount_raw = file['Amount']
+        missing_amount = amount_raw.isna().to_numpy() & valid
+        for index in row_numbers[missing_amount]:
+            errors[index] = f"Row {index}: Skipping - missing amount"
+        valid &= ~missing_amount
+
+        amount_clean = amount_raw.astype(str).str.replace(',', '', regex=False).str.strip()
+        plain = amount_clean.str.fullmatch(PLAIN_AMOUNT_PATTERN).to_numpy(dtype=bool)
+        amount_cents = np.zeros(count, dtype=np.int64)
+        amount_cents[plain] = cents_array(pd.to_numeric(amount_clean[plain]).to_numpy())
+
+        for position in np.flatnonzero(valid & ~plain):
+            index = position + first_row
+            try:
+                amount_cents[position] = Money.of(amount_clean.iat[position]).cents
+            except ValueError as e:
+                errors[index] = f"Row {index}: Invalid amount - {e}"
+                valid[position] = False
+
+        # Parse each distinct date string once, exactly as the per-row path does.
+        # pd.to_datetime on the whole column would infer one format for all rows
+        # and read ambiguous day-first dates differently, changing the hashes.
+        date_raw = file['Value date']
+        missing_date = date_raw.isna().to_numpy() & valid
+        for index in row_numbers[missing_date]:
+            errors[index] = f"Row {index}: Missing date"
+        valid &= ~missing_date
+
+        parsed_dates = {}
+        for value in pd.unique(date_raw[valid]):
+            try:
+                parsed_dates[value] = pd.to_datetime(value, errors="raise").strftime("%Y-%m-%d")
+            except Exception as e:
+                parsed_dates[value] = e
+        transaction_date = date_raw.map(parsed_dates)
+
+        for position in np.flatnonzero(valid):
+            parsed = transaction_date.iat[position]
+            if isinstance(parsed, Exception):
+                index = position + first_row
+                errors[index] = f"Row {index}: Invalid date - {parsed}"
+                valid[position] = False
+
+        # Parse balance (optional)
+        if 'Balance' in file.columns:
+            balance_raw = file['Balance']
+            balance = balance_raw.astype(str).str.replace(',', '', regex=False).str.strip()
+            balance = balance.astype(object).where(~balance_raw.isna(), 0.0)
+        else:
+            balance = pd.Series(0.0, index=file.index, dtype=object)
+
+        description = description[valid]
+        amount_text = pd.Series([str(Money(cents)) for cents in amount_cents[valid].tolist()],
+                                index=description.index, dtype=object)
+        transaction_date = transaction_date[valid]
+        hash_keys = f"{self.user_id}|" + description + "|" + amount_text + "|" + transaction_date
+        hashes = map(self._generate_hash, hash_keys)
+
+        rows = list(zip(
+            [self.user_id] * len(description),
+            [self.category_id] * len(description),
+            description.str[:25],
+            amount_text,
+            description.str[:225],
+            transaction_date,
+            balance[valid],
+            hashes,
+        ))
+        return rows, [errors[index] for index in sorted(errors)]
+
+    def _prepare_rows_iterrows(self, file, first_row=1):
+        """Build insert rows one DataFrame row at a time (original import path)"""
+        rows = []
+        errors = []
+
+        for index, (idx, row) in enumerate(file.iterrows(), start=first_row):
+            try:
+                if pd.isna(row['Text']) or str(row['Text']).strip() == "":
+                    errors.append(f"Row {index}: Skipping - missing description")
+                    continue
+                description = " ".join(str(row['Text']).lower().split())
 
-            print(f"Processing {len(file)} transactions...")
+                # Parse amount
+                if pd.isna(row['Amount']):
+                    errors.append(f"Row {index}: Skipping - missing amount")
+                    continue
+                amount_clean = self._clean_amount(row['Amount'])
+                try:
+                    amount = Money.of(amount_clean)
+                except ValueError as e:
+                    errors.append(f"Row {index}: Invalid amount - {e}")
+                    continue
 
-            # Reset counters
-            self.imported_count = 0
-            self.duplicate_count = 0
+                # Parse date
+                if pd.isna(row['Value date']):
+                    errors.append(f"Row {index}: Missing date")
+                    continue
 
-            batch = []
-            batch_count = 100
-            errors = []
+                try:
+                    transaction_date = pd.to_datetime(row['Value date'], errors="raise").strftime("%Y-%m-%d")
+                except Exception as e:
+                    errors.append(f"Row {index}: Invalid date - {e}")
+                    continue
 
-            for index, (idx, row) in enumerate(file.iterrows(), start=1):
+                # Parse balance (optional)
                 try:
-                    if pd.isna(row['Text']) or str(row['Text']).strip() == "":
-                        errors.append(f"Row {index}: Skipping - missing description")
-                        continue
-                    description = " ".join(str(row['Text']).lower().split())
-
-                    # Parse amount
-                    if pd.isna(row['Amount']):
-                        errors.append(f"Row {index}: Skipping - missing amount")
-                        continue
-                    amount_clean = self._clean_amount(row['Amount'])
+                    balance = self._clean_amount(row['Balance']) if 'Balance' in row and not pd.isna(
+                        row['Balance']) else 0.0
+                except:
+                    balance = 0.0
+
+                hash_key = f"{self.user_id}|{description}|{amount}|{transaction_date}"
+                transaction_hash = self._generate_hash(hash_key)
+
+                rows.append((
+                    self.user_id,
+                    self.category_id,
+                    description[:25],
+                    str(amount),
+                    description[:225],
+                    transaction_date,
+                    balance,
+                    transaction_hash,
+                ))
+            except Exception as e:
+                errors.append(f"Row {index}: {str(e)}")
+                continue
+
+        return rows, errors
+
+    def _reset(self):
+        self.imported_count = 0
+        self.duplicate_count = 0
+        self.file_duplicate_count = 0
+        self.existing_duplicate_count = 0
+        self.errors = []
+        self._rows_seen = 0
+
+        self._file_hashes = set()
+        self._existing_hashes = set()
+        self._hash_range = None
+
+    def _load_existing_hashes(self, start_date, end_date):
+        """Load the user's stored hashes for any part of the date range not loaded yet"""
+        if self._hash_range is None:
+            ranges = [(start_date, end_date)]
+            self._hash_range = (start_date, end_date)
+        else:
+            loaded_start, loaded_end = self._hash_range
+            ranges = []
+            if start_date < loaded_start:
+                ranges.append((start_date, _shift_day(loaded_start, -1)))
+            if end_date > loaded_end:
+                ranges.append((_shift_day(loaded_end, 1), end_date))
+            self._hash_range = (min(start_date, loaded_start), max(end_date, loaded_end))
+
+        for range_start, range_end in ranges:
+            hashes = get_transaction_hashes(self.user_id, range_start, range_end)
+            self._existing_hashes.update(digest_key(h) for h in hashes)
+
+    def _filter_duplicates(self, rows):
+        """
+        Drop rows that repeat an earlier row of the file or a stored transaction
+
+        The hash covers the transaction date, so only stored hashes inside
+        the file's date range can match; those are fetched once per range.
+        """
+        if not rows:
+            return rows
+
+        dates = [row[5] for row in rows]
+        self._load_existing_hashes(min(dates), max(dates))
+
+        file_hashes = self._file_hashes
+        existing_hashes = self._existing_hashes
+        fresh = []
+        for row in rows:
+            key = digest_key(row[7])
+            if key in file_hashes:
+                self.file_duplicate_count += 1
+            elif key in existing_hashes:
+                self.existing_duplicate_count += 1
+            else:
+                file_hashes.add(key)
+                fresh.append(row)
+        return fresh
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold one bulk writer (and transaction) for the whole import
+
+        The executemany strategy keeps the original behaviour of one
+        add_transaction_batch call, and transaction, per 100 rows. Batches
+        that skipped duplicates have their rollups rebuilt once at the end,
+        over the dates written, also when the import stops early after some
+        batches committed.
+        """
+        if self.write_strategy == EXECUTEMANY:
+            self._written = WrittenDates()
+            try:
+                yield
+            finally:
+                written, self._written = self._written, None
+                if written:
                     try:
-                        amount = Decimal(str(amount_clean)).quantize(Decimal("0.01"))
-                    except (InvalidOperation, ValueError) as e:
-                        errors.append(f"Row {index}: Invalid amount - {e}")
-                        continue
+                        with db() as (conn, cursor):
+                            written.refresh(cursor)
+                    except Exception as e:
+                        print(f"Could not refresh rollups after import, "
+                              f"run python -m databaseDAO.transaction.rollup_DAO {self.user_id}: {e}")
+            return
 
-                    # Parse date
-                    if pd.isna(row['Value date']):
-                        errors.append(f"Row {index}: Missing date")
-                        continue
+        try:
+            with bulk_writer(self.write_strategy) as writer:
+                self._writer = writer
+                yield
+        except Exception:
+            # The transaction was rolled back, nothing from this import was kept
+            self.imported_count = 0
+            raise
+        finally:
+            self._writer = None
 
-                    try:
-                        transaction_date = pd.to_datetime(row['Value date'], errors="raise").strftime("%Y-%m-%d")
-                    except Exception as e:
-                        errors.append(f"Row {index}: Invalid date - {e}")
-                        continue
+    def _print_summary(self):
+        if self.errors:
+            print(f"Skipped {len(self.errors)} rows with errors")
 
-                    # Parse balance (optional)
-                    try:
-                        balance = self._clean_amount(row['Balance']) if 'Balance' in row and not pd.isna(
-                            row['Balance']) else 0.0
-                    except:
-                        balance = 0.0
-
-                    hash_key = f"{self.user_id}|{description}|{amount:.2f}|{transaction_date}"
-                    transaction_hash = self._generate_hash(hash_key)
-
-                    if self.imported_count < 5:  # Only show first 5 for testing
-                        print(f"\n--- Row {index} ---")
-                        print(f"Hash key: {hash_key}")
-                        print(f"Hash: {transaction_hash}")
-
-                    batch.append((
-                        self.user_id,
-                        self.category_id,
-                        description[:25],
-                        amount,
-                        description[:225],
-                        transaction_date,
-                        balance,
-                        transaction_hash,
-                    ))
-
-                    if len(batch) >= batch_count:
-                        rows_inserted = add_transaction_batch(batch)
-                        self.imported_count += rows_inserted
-
-                        duplicates_in_batch = len(batch) - rows_inserted
-                        self.duplicate_count += duplicates_in_batch
-
-                        print(f"Processed {self.imported_count + self.duplicate_count}: "
-                              f"{rows_inserted} new, {duplicates_in_batch} skipped")
-                        batch.clear()
-                except Exception as e:
-                    errors.append(f"Row {index}: {str(e)}")
-                    continue
+        print("\nImport Complete:")
+        print(f"  Imported: {self.imported_count} transactions")
+        print(f"  Duplicates skipped: {self.duplicate_count}")
+        if self.prefilter_duplicates:
+            print(f"    Within the file: {self.file_duplicate_count}")
+            print(f"    Already stored: {self.existing_duplicate_count}")
 
-            if batch:
-                rows_inserted = add_transaction_batch(batch)
-                duplicates_in_batch = len(batch) - rows_inserted
+    def import_csv(self, file_path: str):
+        try:
+            file = pd.read_csv(file_path, sep=None, engine='python', skipinitialspace=True, quotechar='"')
 
-                self.imported_count += rows_inserted
-                self.duplicate_count += duplicates_in_batch
+            print(f"DEBUG: All CSV columns detected: {list(file.columns)}")
+            print(f"DEBUG: Total rows read by pandas: {len(file)}")
 
-                print(f"Final batch: {rows_inserted} new, {duplicates_in_batch} skipped")
+            # Show first few rows for debugging
+            if len(file) > 0:
+                print(f"DEBUG: First row data:")
+                print(file.head(1).to_dict('records'))
+
+            self._reset()
+            with self._writing():
+                if self.import_frame(file) is None:
+                    return None
 
-            print(f"\nImport Complete:")
-            print(f"  Imported: {self.imported_count} transactions")
-            print(f"  Duplicates skipped: {self.duplicate_count}")
+            self._print_summary()
             return True
 
         except FileNotFoundError:
@@ -168,3 +338,97 @@ class bankImporter:
         except Exception as e:
             print(f"Error: {e}")
             raise
+
+    def import_stream(self, reader):
+        """
+        Import a CsvChunkReader one chunk at a time
+
+        Each chunk is parsed, validated and written before the next one is
+        read, so only a single chunk of the upload is in memory at once.
+        """
+        self._reset()
+        with self._writing():
+            for frame in reader:
+                if self.import_frame(frame) is None:
+                    return None
+
+        self._print_summary()
+        return True
+
+    def import_frame(self, file):
+        """
+        Validate, parse and insert the rows of one DataFrame
+
+        Counters and errors accumulate across calls, and row numbers in
+        error messages continue from the previous frame.
+
+        Returns:
+            Number of rows inserted, or None if required columns are missing
+        """
+        file.columns = file.columns.str.strip().str.strip('"\'')
+
+        # Check for required columns (but allow extra columns)
+        required_columns = ['Value date', 'Text', 'Amount']
+        missing_columns = []
+
+        for col in required_columns:
+            if col not in file.columns:
+                missing_columns.append(col)
+
+        if missing_columns:
+            print(f"Error: Missing required columns: {missing_columns}")
+            print(f"Available columns: {list(file.columns)}")
+            print(f"Expected columns: {required_columns}")
+            return None
+
+        initial_count = len(file)
+        file = file.dropna(subset=required_columns)
+        dropped_count = initial_count - len(file)
+
+        if dropped_count > 0:
+            print(f"DEBUG: Dropped {dropped_count} rows with missing data in required columns")
+
+        print(f"Processing {len(file)} transactions...")
+
+        first_row = self._rows_seen + 1
+        self._rows_seen += len(file)
+
+        if self.columnar:
+            rows, errors = self._prepare_rows(file, first_row)
+        else:
+            rows, errors = self._prepare_rows_iterrows(file, first_row)
+        self.errors.extend(errors)
+
+        if self.prefilter_duplicates:
+            prepared_count = len(rows)
+            rows = self._filter_duplicates(rows)
+            self.duplicate_count += prepared_count - len(rows)
+
+        inserted = 0
+        batch_count = 100 if self._writer is None else 5000
+        for start in range(0, len(rows), batch_count):
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise ImportCancelled("Import cancelled")
+
+            batch = rows[start:start + batch_count]
+            if self._writer is not None:
+                rows_inserted = self._writer.write(batch)
+            elif self._written is not None:
+                rows_inserted = add_transaction_batch(batch, update_rollups=False)
+                if 0 < rows_inserted < len(batch):
+                    self._written.add(batch)
+            else:
+                rows_inserted = add_transaction_batch(batch)
+            duplicates_in_batch = len(batch) - rows_inserted
+
+            inserted += rows_inserted
+            self.imported_count += rows_inserted
+            self.duplicate_count += duplicates_in_batch
+            if self.prefilter_duplicates:
+                # Stored by another import since the hashes were loaded
+                self.existing_duplicate_count += duplicates_in_batch
+
+            print(f"Processed {self.imported_count + self.duplicate_count}: "
+                  f"{rows_inserted} new, {duplicates_in_batch} skipped")
+
+        return inserted
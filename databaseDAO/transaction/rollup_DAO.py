@@ -0,0 +1,393 @@
+import sys
+from datetime import date, timedelta
+
+from databaseDAO.sqlConnector import db
+from databaseDAO.money import Money, cents_sql
+
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+PERIODS = (DAY, WEEK, MONTH)
+
+# Category and merchant sums per day would be about as large as transactions
+BREAKDOWN_PERIODS = (WEEK, MONTH)
+
+# period_date of the bucket a transaction falls in. Weeks are keyed by the
+# Monday that closes them, the same labels as pandas resample('W-MON').
+BUCKET_SQL = {
+    DAY: "transaction_date",
+    WEEK: "DATE_ADD(transaction_date, INTERVAL MOD(7 - WEEKDAY(transaction_date), 7) DAY)",
+    MONTH: "DATE_SUB(transaction_date, INTERVAL DAYOFMONTH(transaction_date) - 1 DAY)",
+}
+
+TOTALS_SQL = """
+    SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END),
+    SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END),
+    COUNT(*)
+    """
+
+ROLLUP_TABLES = {
+    "transaction_rollups": ("", """
+        SUM(CASE WHEN amount > 0 THEN amount ELSE 0 END),
+        SUM(CASE WHEN amount < 0 THEN -amount ELSE 0 END),
+        COUNT(CASE WHEN amount > 0 THEN 1 END),
+        COUNT(CASE WHEN amount < 0 THEN 1 END),
+        COUNT(*), MIN(amount), MAX(amount)
+        """, "income, expenses, income_count, expense_count, transaction_count, min_amount, max_amount", PERIODS),
+    "category_rollups": ("category_id", TOTALS_SQL, "income, expenses, transaction_count", BREAKDOWN_PERIODS),
+    "merchant_rollups": ("name", TOTALS_SQL, "income, expenses, transaction_count", BREAKDOWN_PERIODS),
+}
+
+BREAKDOWN_COLUMNS = {"category_rollups": "category_id", "merchant_rollups": "merchant"}
+
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def bucket_range(period, first, last):
+    """First and last day of the buckets of period that contain first and last"""
+    if period == WEEK:
+        start = first + timedelta(days=(7 - first.weekday()) % 7 - 6)
+        end = last + timedelta(days=(7 - last.weekday()) % 7)
+        return start, end
+    if period == MONTH:
+        start = first.replace(day=1)
+        next_month = (last.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    return first, last
+
+
+def first_whole_week(day):
+    """
+    period_date of the first week that starts on or after day
+
+    Weeks run Tuesday to the closing Monday, so the bucket holding day
+    itself may start up to 6 days earlier.
+    """
+    last_day = day + timedelta(days=6)
+    return last_day + timedelta(days=(7 - last_day.weekday()) % 7)
+
+
+def _range_statements(user_id, period, first, last):
+    """(query, params) pairs that rebuild the period buckets between first and last"""
+    start, end = bucket_range(period, first, last)
+    end_exclusive = end + timedelta(days=1)
+    bucket = BUCKET_SQL[period]
+
+    for table, (group_column, aggregates, columns, periods) in ROLLUP_TABLES.items():
+        if period not in periods:
+            continue
+
+        yield (f"DELETE FROM {table} WHERE user_id = %s AND period = %s "
+               f"AND period_date >= %s AND period_date < %s", (user_id, period, start, end_exclusive))
+
+        target_columns = "user_id, period, period_date"
+        select_columns = f"user_id, %s, {bucket}"
+        group_by = bucket
+        if group_column:
+            target_columns += f", {BREAKDOWN_COLUMNS[table]}"
+            select_columns += f", {group_column}"
+            group_by += f", {group_column}"
+
+        yield (f"""
+            INSERT INTO {table} ({target_columns}, {columns})
+            SELECT {select_columns}, {aggregates}
+            FROM transactions
+            WHERE user_id = %s AND transaction_date >= %s AND transaction_date < %s
+            GROUP BY {group_by}
+            """, (period, user_id, start, end_exclusive))
+
+
+def _refresh_range(cursor, user_id, period, first, last):
+    for query, params in _range_statements(user_id, period, first, last):
+        cursor.execute(query, params)
+
+
+def rollup_statements(user_id, dates):
+    """(query, params) pairs run by refresh_rollups, for callers with their own cursor type"""
+    dates = [_to_date(value) for value in dates if value is not None]
+    if not dates:
+        return
+
+    first, last = min(dates), max(dates)
+    for period in PERIODS:
+        yield from _range_statements(user_id, period, first, last)
+
+
+def refresh_rollups(cursor, user_id, dates):
+    """
+    Recompute the rollup buckets that contain any of the given dates
+
+    Runs on the caller's cursor, so the rollups change in the same
+    transaction as the rows that were written. Buckets are rebuilt from
+    transactions over the affected range rather than adjusted by deltas,
+    which keeps min/max right after updates and deletes; the cost depends on
+    the range touched, not on the user's history.
+
+    The rebuild's DELETE takes gap locks, so two writers rebuilding
+    overlapping ranges can deadlock (MySQL error 1213). Inserts therefore
+    use apply_rollup_deltas; only updates, deletes and inserts that skipped
+    duplicates rebuild.
+
+    Args:
+        cursor: Cursor of the transaction that changed the rows
+        user_id: Owner of the changed transactions
+        dates: transaction_date values of the changed rows; None is ignored
+    """
+    for query, params in rollup_statements(user_id, dates):
+        cursor.execute(query, params)
+
+
+def refresh_rollups_for_rows(cursor, rows):
+    """refresh_rollups for insert rows shaped like TRANSACTION_COLUMNS"""
+    dates_by_user = {}
+    for row in rows:
+        dates_by_user.setdefault(row[0], []).append(row[5])
+    for user_id, dates in dates_by_user.items():
+        refresh_rollups(cursor, user_id, dates)
+
+
+def bucket_date(period, day):
+    """period_date of the bucket of period that contains day, as BUCKET_SQL computes it"""
+    if period == WEEK:
+        return day + timedelta(days=(7 - day.weekday()) % 7)
+    if period == MONTH:
+        return day.replace(day=1)
+    return day
+
+
+DELTA_COLUMNS = {
+    "transaction_rollups": "income, expenses, income_count, expense_count, transaction_count, min_amount, max_amount",
+    "category_rollups": "income, expenses, transaction_count",
+    "merchant_rollups": "income, expenses, transaction_count",
+}
+
+DELTA_UPDATES = {
+    "transaction_rollups": """
+        income = income + new.income, expenses = expenses + new.expenses,
+        income_count = income_count + new.income_count, expense_count = expense_count + new.expense_count,
+        transaction_count = transaction_count + new.transaction_count,
+        min_amount = COALESCE(LEAST(min_amount, new.min_amount), new.min_amount),
+        max_amount = COALESCE(GREATEST(max_amount, new.max_amount), new.max_amount)
+        """,
+    "category_rollups": """
+        income = income + new.income, expenses = expenses + new.expenses,
+        transaction_count = transaction_count + new.transaction_count
+        """,
+}
+DELTA_UPDATES["merchant_rollups"] = DELTA_UPDATES["category_rollups"]
+
+# Buckets per INSERT statement
+DELTA_CHUNK = 1000
+
+
+def _add_delta(deltas, key, cents):
+    income, expenses, income_count, expense_count, count, low, high = deltas.get(key, (0, 0, 0, 0, 0, cents, cents))
+    deltas[key] = (income + max(cents, 0), expenses + max(-cents, 0), income_count + (cents > 0),
+                   expense_count + (cents < 0), count + 1, min(low, cents), max(high, cents))
+
+
+def rollup_delta_statements(rows):
+    """
+    (query, params) pairs that add newly inserted rows to their rollup buckets
+
+    Every row must really have been inserted. Sums and counts are added with
+    INSERT ... ON DUPLICATE KEY UPDATE instead of rebuilding the buckets, so
+    an insert only locks the buckets it touches and takes no gap locks on
+    empty ranges.
+
+    Args:
+        rows: Insert rows shaped like TRANSACTION_COLUMNS; undated rows are skipped
+    """
+    deltas = {table: {} for table in ROLLUP_TABLES}
+    for row in rows:
+        user_id, category_id, name, amount, transaction_date = row[0], row[1], row[2], row[3], row[5]
+        if transaction_date is None:
+            continue
+        day = _to_date(transaction_date)
+        cents = Money.of(amount).cents
+        for period in PERIODS:
+            period_date = bucket_date(period, day)
+            _add_delta(deltas["transaction_rollups"], (user_id, period, period_date), cents)
+            if period in BREAKDOWN_PERIODS:
+                _add_delta(deltas["category_rollups"], (user_id, period, period_date, category_id), cents)
+                _add_delta(deltas["merchant_rollups"], (user_id, period, period_date, name), cents)
+
+    for table, buckets in deltas.items():
+        key_columns = "user_id, period, period_date"
+        if table in BREAKDOWN_COLUMNS:
+            key_columns += f", {BREAKDOWN_COLUMNS[table]}"
+        columns = f"{key_columns}, {DELTA_COLUMNS[table]}"
+        placeholder = "(" + ", ".join(["%s"] * len(columns.split(","))) + ")"
+
+        values = []
+        # One order for every writer, so concurrent inserts never wait on each other in a cycle
+        for key in sorted(buckets, key=str):
+            income, expenses, income_count, expense_count, count, low, high = buckets[key]
+            if table == "transaction_rollups":
+                values.append(key + (Money(income).to_decimal(), Money(expenses).to_decimal(), income_count,
+                                     expense_count, count, Money(low).to_decimal(), Money(high).to_decimal()))
+            else:
+                values.append(key + (Money(income).to_decimal(), Money(expenses).to_decimal(), count))
+
+        for start in range(0, len(values), DELTA_CHUNK):
+            chunk = values[start:start + DELTA_CHUNK]
+            yield (f"INSERT INTO {table} ({columns}) VALUES {', '.join([placeholder] * len(chunk))} AS new "
+                   f"ON DUPLICATE KEY UPDATE {DELTA_UPDATES[table]}",
+                   [value for bucket in chunk for value in bucket])
+
+
+def apply_rollup_deltas(cursor, rows):
+    """Add inserted rows to their rollups, on the caller's cursor; see rollup_delta_statements"""
+    for query, params in rollup_delta_statements(rows):
+        cursor.execute(query, params)
+
+
+class WrittenDates:
+    """
+    First and last transaction_date written per user, for rows written in
+    many batches whose rollups are refreshed once at the end
+    """
+
+    def __init__(self):
+        self.ranges = {}
+
+    def add(self, rows):
+        """Track insert rows shaped like TRANSACTION_COLUMNS"""
+        for row in rows:
+            user_id, transaction_date = row[0], row[5]
+            if transaction_date is None:
+                continue
+            first, last = self.ranges.get(user_id, (transaction_date, transaction_date))
+            self.ranges[user_id] = (min(first, transaction_date), max(last, transaction_date))
+
+    def refresh(self, cursor):
+        """Rebuild the buckets over each user's written range, once"""
+        for user_id, (first, last) in self.ranges.items():
+            refresh_rollups(cursor, user_id, [first, last])
+        self.ranges = {}
+
+    def __bool__(self):
+        return bool(self.ranges)
+
+
+def as_money(rows, columns):
+    """Wrap the cent columns of fetched rows in Money"""
+    for row in rows:
+        for column in columns:
+            if row[column] is not None:
+                row[column] = Money(row[column])
+    return rows
+
+
+def rollups_query(user_id, period, start_date=None, end_date=None):
+    """(query, params) of get_rollups"""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown rollup period: {period}")
+
+    query = f"""
+        SELECT period_date, {cents_sql('income')} AS income, {cents_sql('expenses')} AS expenses,
+               income_count, expense_count, transaction_count,
+               {cents_sql('min_amount')} AS min_amount, {cents_sql('max_amount')} AS max_amount
+        FROM transaction_rollups
+        WHERE user_id = %s AND period = %s
+        """
+    values = [user_id, period]
+    if start_date is not None:
+        query += " AND period_date >= %s"
+        values.append(start_date)
+    if end_date is not None:
+        query += " AND period_date <= %s"
+        values.append(end_date)
+    query += " ORDER BY period_date"
+    return query, values
+
+
+ROLLUP_MONEY_COLUMNS = ("income", "expenses", "min_amount", "max_amount")
+
+
+def get_rollups(user_id, period, start_date=None, end_date=None):
+    """
+    Income/expense rollups of one period type, oldest first
+
+    Args:
+        user_id: Owner of the transactions
+        period: day, week or month
+        start_date, end_date: Inclusive range of period_date
+
+    Returns:
+        List of dicts with period_date, income, expenses, income_count,
+        expense_count, transaction_count, min_amount and max_amount; the
+        amounts are Money
+    """
+    query, values = rollups_query(user_id, period, start_date, end_date)
+    with db(dictionary=True) as (conn, cursor):
+        cursor.execute(query, values)
+        return as_money(cursor.fetchall(), ROLLUP_MONEY_COLUMNS)
+
+
+def get_breakdown(user_id, kind, period, period_date, limit=None):
+    """
+    Category or merchant sums for one bucket, biggest expenses first
+
+    Args:
+        kind: "category" or "merchant"
+        period: week or month
+        period_date: Key of the bucket (closing Monday or first of month)
+    """
+    table = f"{kind}_rollups"
+    if table not in BREAKDOWN_COLUMNS or period not in BREAKDOWN_PERIODS:
+        raise ValueError(f"No {kind} rollups for period {period}")
+
+    query = f"""
+        SELECT {BREAKDOWN_COLUMNS[table]}, {cents_sql('income')} AS income,
+               {cents_sql('expenses')} AS expenses, transaction_count
+        FROM {table}
+        WHERE user_id = %s AND period = %s AND period_date = %s
+        ORDER BY expenses DESC
+        """
+    values = [user_id, period, period_date]
+    if limit is not None:
+        query += " LIMIT %s"
+        values.append(limit)
+
+    with db(dictionary=True) as (conn, cursor):
+        cursor.execute(query, values)
+        return as_money(cursor.fetchall(), ("income", "expenses"))
+
+
+def rebuild_rollups(user_id=None):
+    """
+    Recompute all rollups from transactions, for one user or everyone
+
+    Each user is rebuilt in its own transaction.
+    """
+    if user_id is None:
+        with db() as (conn, cursor):
+            cursor.execute("SELECT DISTINCT user_id FROM transactions")
+            user_ids = [row[0] for row in cursor.fetchall()]
+    else:
+        user_ids = [user_id]
+
+    for uid in user_ids:
+        with db() as (conn, cursor):
+            for table in ROLLUP_TABLES:
+                cursor.execute(f"DELETE FROM {table} WHERE user_id = %s", (uid,))
+            cursor.execute("SELECT MIN(transaction_date), MAX(transaction_date) FROM transactions "
+                           "WHERE user_id = %s", (uid,))
+            first, last = cursor.fetchone()
+            if first is not None:
+                for period in PERIODS:
+                    _refresh_range(cursor, uid, period, first, last)
+        print(f"Rebuilt rollups for user {uid}")
+
+    return len(user_ids)
+
+
+if __name__ == "__main__":
+    # python -m databaseDAO.transaction.rollup_DAO [user_id]
+    rebuild_rollups(int(sys.argv[1]) if len(sys.argv) > 1 else None)
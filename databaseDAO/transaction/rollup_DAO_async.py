@@ -0,0 +1,24 @@
+from databaseDAO.async_db import adb
+from databaseDAO.transaction.rollup_DAO import (
+    rollup_delta_statements, rollup_statements, rollups_query, as_money, ROLLUP_MONEY_COLUMNS
+)
+
+
+async def refresh_rollups(cursor, user_id, dates):
+    """refresh_rollups on an async cursor, in the caller's transaction"""
+    for query, params in rollup_statements(user_id, dates):
+        await cursor.execute(query, params)
+
+
+async def apply_rollup_deltas(cursor, rows):
+    """apply_rollup_deltas on an async cursor, in the caller's transaction"""
+    for query, params in rollup_delta_statements(rows):
+        await cursor.execute(query, params)
+
+
+async def get_rollups(user_id, period, start_date=None, end_date=None):
+    """Async get_rollups: income/expense rollups of one period type, oldest first"""
+    query, values = rollups_query(user_id, period, start_date, end_date)
+    async with adb(dictionary=True) as (conn, cursor):
+        await cursor.execute(query, values)
+        return as_money(list(await cursor.fetchall()), ROLLUP_MONEY_COLUMNS)
@@ -1,12 +1,54 @@
+import base64
+import json
+from datetime import date
+from decimal import Decimal
+
 from databaseDAO.sqlConnector import db
+from databaseDAO.statement_cache import prepared_statement
+from databaseDAO.money import Money, cents_sql
+from databaseDAO.transaction.rollup_DAO import apply_rollup_deltas, refresh_rollups, refresh_rollups_for_rows, MONTH
+
+TRANSACTION_COLUMNS = ("user_id", "category_id", "name", "amount", "description", "transaction_date", "balance",
+                       "transaction_hash")
+
+INSERT_BATCH_QUERY = """
+    INSERT IGNORE INTO transactions 
+        (user_id, category_id, name, amount, description, transaction_date,balance,transaction_hash) 
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
+        """
+
+# Columns clients may ask for from the listing API; transaction_hash stays internal
+LISTING_FIELDS = ("transaction_id", "category_id", "name", "amount", "description", "transaction_date", "balance",
+                  "created_at")
+LISTING_MAX_LIMIT = 500
+
+CHECK_TRANSACTION_QUERY = prepared_statement(
+    "SELECT name FROM transactions WHERE transaction_id = %s AND user_id = %s")
+
+# Monthly rollups plus the transactions without a date, which no rollup covers
+DASHBOARD_TOTALS_QUERY = f"""
+    SELECT {cents_sql('income')}, {cents_sql('expenses')}, income_count, expense_count, transaction_count
+    FROM transaction_rollups
+    WHERE user_id = %s AND period = %s
+    UNION ALL
+    SELECT {cents_sql('COALESCE(SUM(CASE WHEN amount > 0 THEN amount END), 0)')},
+           {cents_sql('COALESCE(-SUM(CASE WHEN amount < 0 THEN amount END), 0)')},
+           COUNT(CASE WHEN amount > 0 THEN 1 END),
+           COUNT(CASE WHEN amount < 0 THEN 1 END),
+           COUNT(*)
+    FROM transactions
+    WHERE user_id = %s AND transaction_date IS NULL
+    """
 
 
 def register_transaction(user_id, category_id, name, amount, description, transaction_date=None, balance=None,
                          transaction_hash=None):
     query = "INSERT INTO transactions (user_id, category_id, name, amount, description, transaction_date,balance,transaction_hash) VALUES (%s,%s,%s,%s,%s,%s,%s,%s)"
+    amount = Money.of(amount).to_decimal()
     with db() as (conn, cursor):
-        cursor.execute(query,
-                       (user_id, category_id, name, amount, description, transaction_date, balance, transaction_hash))
+        row = (user_id, category_id, name, amount, description, transaction_date, balance, transaction_hash)
+        cursor.execute(query, row)
+        apply_rollup_deltas(cursor, [row])
     print("transaction registered!")
     return True
 
@@ -14,14 +56,16 @@ def register_transaction(user_id, category_id, name, amount, description, transa
 def delete_transaction(transaction_id, user_id):
     query = "DELETE FROM transactions WHERE transaction_id = %s AND user_id = %s"
     with db() as (conn, cursor):
+        cursor.execute("SELECT transaction_date FROM transactions WHERE transaction_id = %s AND user_id = %s",
+                       (transaction_id, user_id))
+        row = cursor.fetchone()
         cursor.execute(query, (transaction_id, user_id,))
+        if row:
+            refresh_rollups(cursor, user_id, [row[0]])
     return True
 
 
 def update_transaction(transaction_id, user_id, category_id=None, name=None, amount=None, description=None):
-    if not check_transaction(transaction_id, user_id):
-        return False
-
     updates = []
     values = []
 
@@ -32,11 +76,11 @@ def update_transaction(transaction_id, user_id, category_id=None, name=None, amo
         updates.append("name = %s")
         values.append(name)
     if amount is not None:
-        if not isinstance(amount, (int, float)):
+        if not isinstance(amount, (int, float, Decimal, Money)):
             print("Invalid amount.")
             return False
         updates.append("amount = %s")
-        values.append(amount)
+        values.append(Money.of(amount).to_decimal())
     if description is not None:
         updates.append("description = %s")
         values.append(description)
@@ -49,14 +93,20 @@ def update_transaction(transaction_id, user_id, category_id=None, name=None, amo
     values.extend([transaction_id, user_id])
 
     with db() as (conn, cursor):
+        # Also checks that the transaction exists and belongs to the user
+        cursor.execute("SELECT transaction_date FROM transactions WHERE transaction_id = %s AND user_id = %s",
+                       (transaction_id, user_id))
+        row = cursor.fetchone()
+        if not row:
+            return False
         cursor.execute(query, tuple(values))
+        refresh_rollups(cursor, user_id, [row[0]])
     return True
 
 
 def check_transaction(transaction_id_check, user_id_check):
-    query = f"SELECT name FROM transactions WHERE transaction_id = %s AND user_id = %s"
     with db(dictionary=True) as (conn, cursor):
-        cursor.execute(query, (transaction_id_check, user_id_check))
+        cursor.execute(CHECK_TRANSACTION_QUERY, (transaction_id_check, user_id_check))
         name = cursor.fetchone()
         if not name:
             return False
@@ -65,7 +115,7 @@ def check_transaction(transaction_id_check, user_id_check):
 
 
 def get_all_transactions(user_id):
-    query = "SELECT * FROM transactions WHERE user_id = %s"
+    query = f"SELECT user_id, {', '.join(LISTING_FIELDS)} FROM transactions WHERE user_id = %s"
     with db(dictionary=True) as (conn, cursor):
         cursor.execute(query, (user_id,))
         rows = cursor.fetchall()
@@ -85,17 +135,211 @@ def get_transaction(transaction_id, user_id):
     return row
 
 
-def add_transaction_batch(batch):
-    if not batch:
-        return 0
-
+def get_transaction_hashes(user_id, start_date, end_date):
+    """Hashes of the user's transactions dated between start_date and end_date (inclusive)"""
     query = """
-    INSERT IGNORE INTO transactions 
-        (user_id, category_id, name, amount, description, transaction_date,balance,transaction_hash) 
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
+        SELECT transaction_hash
+        FROM transactions
+        WHERE user_id = %s
+          AND transaction_date >= %s
+          AND transaction_date <= %s
+          AND transaction_hash IS NOT NULL
         """
+    with db() as (conn, cursor):
+        cursor.execute(query, (user_id, start_date, end_date))
+        return [row[0] for row in cursor.fetchall()]
+
+
+def add_transaction_batch(batch, update_rollups=True):
+    """
+    Insert rows shaped like TRANSACTION_COLUMNS, skipping duplicates, in one transaction
+
+    When every row is inserted its rollups are updated by delta. If some were
+    duplicates it is not known which, so the buckets over the batch's dates
+    are rebuilt; callers writing many batches pass update_rollups=False and
+    rebuild those once at the end, with rollup_DAO.WrittenDates.
+    """
+    if not batch:
+        return 0
 
     with db() as (conn, cursor):
-        cursor.executemany(query, batch)
+        cursor.executemany(INSERT_BATCH_QUERY, batch)
         rows_affected = cursor.rowcount
+        if rows_affected == len(batch):
+            apply_rollup_deltas(cursor, batch)
+        elif rows_affected and update_rollups:
+            refresh_rollups_for_rows(cursor, batch)
     return rows_affected
+
+
+def encode_cursor(transaction_date, transaction_id):
+    """Opaque page cursor for the position after (transaction_date, transaction_id)"""
+    position = [transaction_date.isoformat() if transaction_date else None, transaction_id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Raises:
+        ValueError: If the cursor was not made by encode_cursor
+    """
+    try:
+        transaction_date, transaction_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if transaction_date is not None:
+            transaction_date = date.fromisoformat(transaction_date)
+        return transaction_date, int(transaction_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def list_transactions(user_id, limit=50, cursor=None, start_date=None, end_date=None, min_amount=None,
+                      max_amount=None, category_id=None, search=None, fields=None):
+    """
+    One page of a user's transactions, newest first
+
+    Pages are ordered by (transaction_date, transaction_id) descending and
+    continue after the cursor instead of using OFFSET, so every page costs
+    the same however deep it is. Transactions without a date come after all
+    dated ones and are left out when a date range is given.
+
+    Args:
+        user_id: Owner of the transactions
+        limit: Page size, at most LISTING_MAX_LIMIT
+        cursor: next_cursor from the previous page, None for the first page
+        start_date, end_date: Inclusive transaction_date range
+        min_amount, max_amount: Inclusive amount range
+        category_id: Only this category
+        search: Text matched anywhere in the name or description
+        fields: Columns to return, from LISTING_FIELDS; transaction_id and
+            transaction_date are always included
+
+    Returns:
+        (rows, next_cursor), next_cursor is None on the last page
+
+    Raises:
+        ValueError: For an unknown field or an invalid cursor
+    """
+    limit, dated, undated = listing_queries(user_id, limit, cursor, start_date, end_date, min_amount, max_amount,
+                                            category_id, search, fields)
+    rows = []
+
+    with db(dictionary=True) as (conn, db_cursor):
+        if dated:
+            db_cursor.execute(*dated)
+            rows = db_cursor.fetchall()
+
+        if undated and len(rows) <= limit:
+            query, params = undated
+            db_cursor.execute(query, params + [limit + 1 - len(rows)])
+            rows = rows + db_cursor.fetchall()
+
+    return listing_page(rows, limit)
+
+
+def listing_queries(user_id, limit=50, cursor=None, start_date=None, end_date=None, min_amount=None,
+                    max_amount=None, category_id=None, search=None, fields=None):
+    """
+    Page size and statements of list_transactions, shared with the async DAO
+
+    Returns:
+        (limit, dated, undated). dated is a (query, params) pair for the
+        dated rows, or None; undated is one for the rows without a date,
+        whose params still need the number of rows to fetch, or None
+    """
+    fields = list(fields or LISTING_FIELDS)
+    unknown = [field for field in fields if field not in LISTING_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    for key in ("transaction_date", "transaction_id"):
+        if key not in fields:
+            fields.insert(0, key)
+
+    limit = max(1, min(int(limit), LISTING_MAX_LIMIT))
+    after_date, after_id = decode_cursor(cursor) if cursor else (None, None)
+
+    conditions = ["user_id = %s"]
+    values = [user_id]
+    if start_date is not None:
+        conditions.append("transaction_date >= %s")
+        values.append(start_date)
+    if end_date is not None:
+        conditions.append("transaction_date <= %s")
+        values.append(end_date)
+    if min_amount is not None:
+        conditions.append("amount >= %s")
+        values.append(min_amount)
+    if max_amount is not None:
+        conditions.append("amount <= %s")
+        values.append(max_amount)
+    if category_id is not None:
+        conditions.append("category_id = %s")
+        values.append(category_id)
+    if search:
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append("(name LIKE %s OR description LIKE %s)")
+        values.extend([pattern, pattern])
+
+    select = f"SELECT {', '.join(fields)} FROM transactions WHERE {' AND '.join(conditions)}"
+    dated = undated = None
+
+    # Dated transactions first; a cursor without a date is already past them
+    if after_id is None or after_date is not None:
+        query = select + " AND transaction_date IS NOT NULL"
+        params = list(values)
+        if after_id is not None:
+            query += " AND (transaction_date, transaction_id) < (%s, %s)"
+            params.extend([after_date, after_id])
+        query += " ORDER BY transaction_date DESC, transaction_id DESC LIMIT %s"
+        dated = (query, params + [limit + 1])
+
+    if start_date is None and end_date is None:
+        query = select + " AND transaction_date IS NULL"
+        params = list(values)
+        if after_id is not None and after_date is None:
+            query += " AND transaction_id < %s"
+            params.append(after_id)
+        query += " ORDER BY transaction_id DESC LIMIT %s"
+        undated = (query, params)
+
+    return limit, dated, undated
+
+
+def listing_page(rows, limit):
+    """Trim the limit + 1 fetched rows to a page and its next_cursor"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["transaction_date"], rows[-1]["transaction_id"])
+    return rows, next_cursor
+
+
+def get_dashboard_summary(user_id, recent_limit=5):
+    """
+    Income and expense totals and the most recent transactions for the dashboard
+
+    Totals add up the user's monthly rollups plus the few transactions
+    without a date, which no rollup covers, and the recent rows come from
+    the listing index, so the cost does not grow with the user's history.
+
+    Returns:
+        Dict with total_income, total_expenses (positive Money), income_count,
+        expense_count, transaction_count and recent_transactions
+    """
+    with db() as (conn, cursor):
+        cursor.execute(DASHBOARD_TOTALS_QUERY, (user_id, MONTH, user_id))
+        buckets = cursor.fetchall()
+
+    summary = dashboard_totals(buckets)
+    summary["recent_transactions"], _ = list_transactions(user_id, limit=recent_limit)
+    return summary
+
+
+def dashboard_totals(buckets):
+    """Add up the DASHBOARD_TOTALS_QUERY rows"""
+    return {
+        "total_income": Money(sum(row[0] for row in buckets)),
+        "total_expenses": Money(sum(row[1] for row in buckets)),
+        "income_count": sum(row[2] for row in buckets),
+        "expense_count": sum(row[3] for row in buckets),
+        "transaction_count": sum(row[4] for row in buckets),
+    }
@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+from databaseDAO.async_db import adb
+from databaseDAO.money import Money
+from databaseDAO.transaction.rollup_DAO import MONTH
+from databaseDAO.transaction.rollup_DAO_async import apply_rollup_deltas, refresh_rollups
+from databaseDAO.transaction.transaction_DAO import (
+    DASHBOARD_TOTALS_QUERY, dashboard_totals, listing_queries, listing_page
+)
+
+
+async def register_transaction(user_id, category_id, name, amount, description, transaction_date=None, balance=None,
+                               transaction_hash=None):
+    query = ("INSERT INTO transactions (user_id, category_id, name, amount, description, transaction_date, balance, "
+             "transaction_hash) VALUES (%s,%s,%s,%s,%s,%s,%s,%s)")
+    amount = Money.of(amount).to_decimal()
+    async with adb() as (conn, cursor):
+        row = (user_id, category_id, name, amount, description, transaction_date, balance, transaction_hash)
+        await cursor.execute(query, row)
+        await apply_rollup_deltas(cursor, [row])
+    return True
+
+
+async def delete_transaction(transaction_id, user_id):
+    async with adb() as (conn, cursor):
+        await cursor.execute("SELECT transaction_date FROM transactions WHERE transaction_id = %s AND user_id = %s",
+                             (transaction_id, user_id))
+        row = await cursor.fetchone()
+        await cursor.execute("DELETE FROM transactions WHERE transaction_id = %s AND user_id = %s",
+                             (transaction_id, user_id))
+        if row:
+            await refresh_rollups(cursor, user_id, [row[0]])
+    return True
+
+
+async def update_transaction(transaction_id, user_id, category_id=None, name=None, amount=None, description=None):
+    updates = []
+    values = []
+
+    if category_id is not None:
+        updates.append("category_id = %s")
+        values.append(category_id)
+    if name is not None:
+        updates.append("name = %s")
+        values.append(name)
+    if amount is not None:
+        if not isinstance(amount, (int, float, Decimal, Money)):
+            return False
+        updates.append("amount = %s")
+        values.append(Money.of(amount).to_decimal())
+    if description is not None:
+        updates.append("description = %s")
+        values.append(description)
+
+    if not updates:
+        return False
+
+    values.extend([transaction_id, user_id])
+
+    async with adb() as (conn, cursor):
+        await cursor.execute("SELECT transaction_date FROM transactions WHERE transaction_id = %s AND user_id = %s",
+                             (transaction_id, user_id))
+        row = await cursor.fetchone()
+        if not row:
+            return False
+        await cursor.execute(f"UPDATE transactions SET {', '.join(updates)} "
+                             f"WHERE transaction_id = %s AND user_id = %s", tuple(values))
+        await refresh_rollups(cursor, user_id, [row[0]])
+    return True
+
+
+async def get_transaction(transaction_id, user_id):
+    async with adb() as (conn, cursor):
+        await cursor.execute("SELECT name, amount, description, created_at FROM transactions "
+                             "WHERE transaction_id = %s AND user_id = %s", (transaction_id, user_id))
+        row = await cursor.fetchone()
+    return row if row else False
+
+
+async def list_transactions(user_id, limit=50, cursor=None, start_date=None, end_date=None, min_amount=None,
+                            max_amount=None, category_id=None, search=None, fields=None):
+    """Async list_transactions: one page of a user's transactions, newest first"""
+    limit, dated, undated = listing_queries(user_id, limit, cursor, start_date, end_date, min_amount, max_amount,
+                                            category_id, search, fields)
+    rows = []
+
+    async with adb(dictionary=True) as (conn, db_cursor):
+        if dated:
+            await db_cursor.execute(*dated)
+            rows = list(await db_cursor.fetchall())
+
+        if undated and len(rows) <= limit:
+            query, params = undated
+            await db_cursor.execute(query, params + [limit + 1 - len(rows)])
+            rows = rows + list(await db_cursor.fetchall())
+
+    return listing_page(rows, limit)
+
+
+async def get_dashboard_summary(user_id, recent_limit=5):
+    """Async get_dashboard_summary: income and expense totals and the most recent transactions"""
+    async with adb() as (conn, cursor):
+        await cursor.execute(DASHBOARD_TOTALS_QUERY, (user_id, MONTH, user_id))
+        buckets = await cursor.fetchall()
+
+    summary = dashboard_totals(buckets)
+    summary["recent_transactions"], _ = await list_transactions(user_id, limit=recent_limit)
+    return summary
@@ -0,0 +1,59 @@
+import hashlib
+import os
+
+
+HEX = "hex"
+BINARY16 = "binary16"
+BINARY32 = "binary32"
+
+SHA256 = "sha256"
+BLAKE2B = "blake2b"
+
+# binary16 matches the BINARY(16) column in budget_db.sql; use hex until
+# migrations/001_binary_transaction_hash.sql has been applied.
+HASH_FORMAT = os.getenv("TRANSACTION_HASH_FORMAT", BINARY16)
+HASH_ALGORITHM = os.getenv("TRANSACTION_HASH_ALGORITHM", SHA256)
+
+DIGEST_SIZES = {BINARY16: 16, BINARY32: 32}
+
+
+def generate_transaction_hash(key, hash_format=HASH_FORMAT, algorithm=HASH_ALGORITHM):
+    """
+    Hash a transaction key for the transaction_hash column
+
+    sha256 truncated to 16 bytes equals UNHEX(LEFT(hex, 32)) of the old hex
+    hashes, so rows converted by the migration still match re-imports.
+    blake2b is faster but matches nothing stored with sha256.
+
+    Args:
+        key: The "user_id|description|amount|date" string
+        hash_format: hex, binary16 or binary32
+        algorithm: sha256 or blake2b
+
+    Returns:
+        Digest bytes for the binary formats, a 64-char hex string for hex
+    """
+    data = key.encode()
+
+    if hash_format == HEX:
+        return hashlib.sha256(data).hexdigest()
+    if hash_format not in DIGEST_SIZES:
+        raise ValueError(f"Unknown transaction hash format: {hash_format}")
+
+    size = DIGEST_SIZES[hash_format]
+    if algorithm == BLAKE2B:
+        return hashlib.blake2b(data, digest_size=size).digest()
+    if algorithm == SHA256:
+        return hashlib.sha256(data).digest()[:size]
+    raise ValueError(f"Unknown transaction hash algorithm: {algorithm}")
+
+
+def digest_key(stored_hash):
+    """A stored hash, hex or binary, as digest bytes for set lookups"""
+    if isinstance(stored_hash, str):
+        return bytes.fromhex(stored_hash)
+    return bytes(stored_hash)
+
+
+def is_binary(hash_format=HASH_FORMAT):
+    return hash_format in DIGEST_SIZES
@@ -1,33 +1,26 @@
 from contextlib import contextmanager
 
+from databaseDAO.credential_store import fetch_credentials, insert_user, store_rehash, unknown_emails
+from databaseDAO.password_hasher import check_password, hash_password, verify_dummy, verify_password
+from databaseDAO.rate_limiter import login_limiter
 from databaseDAO.sqlConnector import db
-import hashlib
-import os
-from datetime import datetime, timedelta
+from databaseDAO.user_context import invalidate_user
 
-# Rate limiting dictionary (in production, use Redis)
-login_attempts = {}
 
 def register(name, email, password):
+    passwordcheck = checkpassword(password)
+    if not passwordcheck[0]:
+        return passwordcheck
+    namecheck = nameChecker(name)
+    if not namecheck[0]:
+        return namecheck
+
+    # The unique key on users.email is the existence check
     with db() as (_, cursor):
-        query = "INSERT INTO users(name, email, password) VALUES (%s,%s,%s)"
-
-        namecheck = nameChecker(name)
-        emailcheck = isEmail(cursor, email)
-        passwordcheck = checkpassword(password)
-
-        # NOW CHECK THE FIRST ELEMENT OF THE TUPLE
-        if not emailcheck[0]:
-            return emailcheck
-        if not passwordcheck[0]:
-            return passwordcheck
-        if not namecheck[0]:
-            return namecheck
-        else:
-            hashedpw = hashpassword(password)
-            cursor.execute(query, (name, email, hashedpw,))
-
-            return True, "User registered successfully."
+        if not insert_user(cursor, name, email, hash_password(password)):
+            print("This email is already registered. Please use a new email or continue with the current one.")
+            return False, "Email already registered"
+        return True, "User registered successfully."
 
 
 def isEmail(cursor, email):
@@ -40,12 +33,6 @@ def isEmail(cursor, email):
         return True, "Email available"
 
 
-def hashpassword(password):
-    salt = os.urandom(16).hex()
-    hashed = hashlib.sha256((salt + password).encode()).hexdigest()
-    return salt + ":" + hashed
-
-
 def checkpassword(password):
     special = "!#€%&/()=?^*_:;©@£$∞§|[]≈±´~™''æ…‚§¶°"
     lower = "abcdefghijklmnopqrstuvwxyz"
@@ -91,25 +78,11 @@ def nameChecker(name):
 
 
 def check_rate_limit(email):
-    """Simple rate limiting for login attempts"""
-    current_time = datetime.now()
-
-    if email in login_attempts:
-        attempts, last_attempt = login_attempts[email]
-
-        if current_time - last_attempt > timedelta(minutes=15):
-            login_attempts[email] = (1, current_time)
-            return True
-
-        if attempts >= 5:
-            print(f"Too many login attempts for {email}. Try again in 15 minutes.")
-            return False
-
-        login_attempts[email] = (attempts + 1, current_time)
-        return True
-    else:
-        login_attempts[email] = (1, current_time)
-        return True
+    """Count a login attempt; False once the email is over its limit"""
+    if not login_limiter.hit(email):
+        print(f"Too many login attempts for {email}. Try again in {login_limiter.window_seconds // 60} minutes.")
+        return False
+    return True
 
 
 def logIn(email, password):
@@ -121,59 +94,53 @@ def logIn(email, password):
     if not check_rate_limit(email):
         return False, None
 
-    with db() as (conn, cursor):
-
-        salt = passwordSalt(cursor, email)
-        if not salt:
-            print("The email or password is incorrect!")
-            return False, None
-        hashedPw = hashAgain(salt, password)
-
-        query = "SELECT password, user_id FROM users WHERE email = %s"
-        cursor.execute(query, (email,))
-        row = cursor.fetchone()
-        if not row:
-            print("Invalid email or password")
-            return False, None
-
-        stored_pw, user_id = row
-        _, realHashpw = stored_pw.split(":")
-
-        if hashedPw == realHashpw:
-            print("Login Successful")
-            # Reset rate limit on successful login
-            if email in login_attempts:
-                del login_attempts[email]
-            return True, user_id
-        else:
-            print("The email or password is incorrect")
-            return False, None
+    credentials = None
+    if email not in unknown_emails:
+        with db() as (conn, cursor):
+            credentials = fetch_credentials(cursor, email)
+    if not credentials:
+        # Cost as much as a wrong password, so timing does not reveal registered emails
+        verify_dummy(password)
+        print("The email or password is incorrect!")
+        return False, None
 
+    user_id, stored_pw = credentials
+    matches, new_hash = check_password(password, stored_pw)
 
-def passwordSalt(cursor, email):
-    query = "SELECT password FROM users WHERE email = %s"
-    cursor.execute(query, (email,))
-    result = cursor.fetchone()
-    if not result:
-        return None
-    salt, _ = result[0].split(":")
-    return salt
+    if matches:
+        if new_hash:
+            upgrade_hash(user_id, stored_pw, new_hash)
+        print("Login Successful")
+        # Reset rate limit on successful login
+        login_limiter.reset(email)
+        return True, user_id
+    else:
+        print("The email or password is incorrect")
+        return False, None
 
 
-def hashAgain(salt, password):
-    hashed = hashlib.sha256((salt + password).encode()).hexdigest()
-    return hashed
+def upgrade_hash(user_id, old_hash, new_hash):
+    """Store a rehashed password; the login succeeds even if this fails"""
+    try:
+        with db() as (conn, cursor):
+            store_rehash(cursor, user_id, old_hash, new_hash)
+        invalidate_user(user_id)
+    except Exception as e:
+        print(f"Could not upgrade the password hash of user {user_id}: {e}")
 
 
-def update_userinfo(email=None, name=None, new_email=None):
+def update_userinfo(email=None, name=None, new_email=None, user_id=None):
 
    with db() as (conn, cursor):
-        query = "SELECT user_id FROM users WHERE email = %s"
-        cursor.execute(query, (email,))
-        row = cursor.fetchone()
-        if not row:
-            print("The user does not exist")
-            return False
+        # Callers holding the user's context pass user_id and skip the lookup
+        if user_id is None:
+            query = "SELECT user_id FROM users WHERE email = %s"
+            cursor.execute(query, (email,))
+            row = cursor.fetchone()
+            if not row:
+                print("The user does not exist")
+                return False
+            user_id = row[0]
 
         update = []
         value = []
@@ -194,28 +161,29 @@ def update_userinfo(email=None, name=None, new_email=None):
             update.append("email = %s")
             value.append(new_email)
 
-        value.append(email)
-        query = f"UPDATE users SET {', '.join(update)} WHERE email = %s"
+        value.append(user_id)
+        query = f"UPDATE users SET {', '.join(update)} WHERE user_id = %s"
         cursor.execute(query, tuple(value))
-        print("User information updated successfully.")
-        return True
+
+   # After the commit, so no request caches the old row again
+   invalidate_user(user_id)
+   if new_email:
+       unknown_emails.discard(new_email)
+   print("User information updated successfully.")
+   return True
 
 
 def update_password(email, old_password, password, re_password):
 
     with db() as (conn, cursor):
-        query = "SELECT password FROM users WHERE email = %s"
-        cursor.execute(query, (email,))
-        row = cursor.fetchone()
-        if not row:
+        credentials = fetch_credentials(cursor, email)
+        if not credentials:
             print("The user does not exist!")
             return False
 
-        storedPw = row[0]
-        old_salt, realhashPw = storedPw.split(":")
-        oldPassword_hash = hashAgain(old_salt, old_password)
+        user_id, storedPw = credentials
 
-        if oldPassword_hash != realhashPw:
+        if not verify_password(old_password, storedPw):
             print("The password is incorrect!")
             return False
         else:
@@ -227,7 +195,9 @@ def update_password(email, old_password, password, re_password):
                 return False
             else:
                 query = "UPDATE users SET password = %s WHERE email = %s"
-                newPassword_hash = hashpassword(password)
+                newPassword_hash = hash_password(password)
                 cursor.execute(query, (newPassword_hash, email,))
-                print("The password has been successfully changed!")
-                return True
+
+    invalidate_user(user_id)
+    print("The password has been successfully changed!")
+    return True
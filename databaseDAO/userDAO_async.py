@@ -0,0 +1,133 @@
+from databaseDAO.async_db import adb
+from databaseDAO.credential_store import unknown_emails
+from databaseDAO.credential_store_async import fetch_credentials, insert_user, store_rehash
+from databaseDAO.password_hasher import check_password_async, hash_password_async, verify_dummy_async, verify_password_async
+from databaseDAO.rate_limiter import login_limiter
+from databaseDAO.user_context import invalidate_user
+from databaseDAO.userDAO import nameChecker, checkpassword
+
+
+async def isEmail(cursor, email):
+    await cursor.execute("SELECT 1 FROM users WHERE email = %s", (email,))
+    if await cursor.fetchone() is not None:
+        return False, "Email already registered"
+    return True, "Email available"
+
+
+async def register(name, email, password):
+    passwordcheck = checkpassword(password)
+    if not passwordcheck[0]:
+        return passwordcheck
+    namecheck = nameChecker(name)
+    if not namecheck[0]:
+        return namecheck
+
+    password_hash = await hash_password_async(password)
+    # The unique key on users.email is the existence check
+    async with adb() as (_, cursor):
+        if not await insert_user(cursor, name, email, password_hash):
+            return False, "Email already registered"
+        return True, "User registered successfully."
+
+
+async def check_rate_limit(email):
+    """Count a login attempt; False once the email is over its limit"""
+    if not await login_limiter.hit_async(email):
+        return False
+    return True
+
+
+async def logIn(email, password):
+    if "@" not in email:
+        return False, None
+
+    if not await check_rate_limit(email):
+        return False, None
+
+    credentials = None
+    if email not in unknown_emails:
+        async with adb() as (conn, cursor):
+            credentials = await fetch_credentials(cursor, email)
+    if not credentials:
+        # Cost as much as a wrong password, so timing does not reveal registered emails
+        await verify_dummy_async(password)
+        return False, None
+
+    user_id, stored_pw = credentials
+    matches, new_hash = await check_password_async(password, stored_pw)
+    if matches:
+        if new_hash:
+            await upgrade_hash(user_id, stored_pw, new_hash)
+        await login_limiter.reset_async(email)
+        return True, user_id
+
+    return False, None
+
+
+async def upgrade_hash(user_id, old_hash, new_hash):
+    """Store a rehashed password; the login succeeds even if this fails"""
+    try:
+        async with adb() as (conn, cursor):
+            await store_rehash(cursor, user_id, old_hash, new_hash)
+        invalidate_user(user_id)
+    except Exception as e:
+        print(f"Could not upgrade the password hash of user {user_id}: {e}")
+
+
+async def update_userinfo(email=None, name=None, new_email=None, user_id=None):
+    async with adb() as (conn, cursor):
+        # Callers holding the user's context pass user_id and skip the lookup
+        if user_id is None:
+            await cursor.execute("SELECT user_id FROM users WHERE email = %s", (email,))
+            row = await cursor.fetchone()
+            if not row:
+                return False
+            user_id = row[0]
+
+        update = []
+        value = []
+
+        if name:
+            if not nameChecker(name)[0]:
+                return False
+            update.append("name = %s")
+            value.append(name)
+
+        if new_email:
+            if not (await isEmail(cursor, new_email))[0]:
+                return False
+            update.append("email = %s")
+            value.append(new_email)
+
+        if not update:
+            return False
+
+        value.append(user_id)
+        await cursor.execute(f"UPDATE users SET {', '.join(update)} WHERE user_id = %s", tuple(value))
+
+    # After the commit, so no request caches the old row again
+    invalidate_user(user_id)
+    if new_email:
+        unknown_emails.discard(new_email)
+    return True
+
+
+async def update_password(email, old_password, password, re_password):
+    async with adb() as (conn, cursor):
+        credentials = await fetch_credentials(cursor, email)
+        if not credentials:
+            return False
+
+        user_id, stored_pw = credentials
+        if not await verify_password_async(old_password, stored_pw):
+            return False
+        if not checkpassword(password)[0]:
+            return False
+        if password != re_password:
+            return False
+
+        await cursor.execute("UPDATE users SET password = %s WHERE email = %s",
+                             (await hash_password_async(password), email))
+
+    invalidate_user(user_id)
+    return True
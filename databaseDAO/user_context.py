@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from databaseDAO.sqlConnector import db
+from databaseDAO.statement_cache import prepared_statement
+
+USER_CONTEXT_QUERY = prepared_statement("SELECT name, email, password FROM users WHERE user_id = %s")
+
+
+class UserContext:
+    """What handlers need to know about the signed-in user, without asking the database"""
+
+    def __init__(self, user_id, name, email, hash_version):
+        self.user_id = user_id
+        self.name = name
+        self.email = email
+        # Only the scheme and cost of the password hash; the hash itself is
+        # never cached, checks that need it read it from the database
+        self.hash_version = hash_version
+
+
+def hash_version(password_hash):
+    """Scheme and cost of a stored password hash, e.g. "scrypt$16384$8$1", or "legacy" """
+    if "$" not in password_hash:
+        return "legacy"
+    return password_hash.rsplit("$", 2)[0]
+
+
+class UserContextCache:
+    """
+    User contexts by user_id, kept for ttl seconds, least recently used dropped first
+
+    A missing user is cached too, as None. DAO functions that change a
+    user's name, email or password call invalidate(); other processes see
+    the change once their entry expires.
+    """
+
+    def __init__(self, capacity=10_000, ttl=60.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # Bumped by every invalidation, so a lookup that raced one is not cached
+        self.generation = 0
+
+    def get(self, user_id):
+        """
+        Returns:
+            (found, context); found is False if user_id is not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return False, None
+            added, context = entry
+            if time.monotonic() - added >= self.ttl:
+                del self._entries[user_id]
+                return False, None
+            self._entries.move_to_end(user_id)
+            return True, context
+
+    def put(self, user_id, context, generation=None):
+        """Cache context, unless something was invalidated since generation was read"""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[user_id] = (time.monotonic(), context)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_contexts = UserContextCache(int(os.getenv("USER_CONTEXT_CACHE_SIZE", "10000")),
+                                 float(os.getenv("USER_CONTEXT_CACHE_SECONDS", "60")))
+
+
+def remember_context(user_id, row, generation):
+    """Cache the context built from a USER_CONTEXT_QUERY row; None if the user does not exist"""
+    context = None
+    if row:
+        name, email, password_hash = row
+        context = UserContext(user_id, name, email, hash_version(password_hash))
+    user_contexts.put(user_id, context, generation)
+    return context
+
+
+def get_user_context(user_id):
+    """
+    The signed-in user's context, from the cache or one query
+
+    Returns:
+        UserContext, or None if the user does not exist
+    """
+    found, context = user_contexts.get(user_id)
+    if found:
+        return context
+    generation = user_contexts.generation
+    with db() as (conn, cursor):
+        cursor.execute(USER_CONTEXT_QUERY, (user_id,))
+        return remember_context(user_id, cursor.fetchone(), generation)
+
+
+def invalidate_user(user_id):
+    """Forget a user's cached context after their name, email or password changed"""
+    user_contexts.invalidate(user_id)
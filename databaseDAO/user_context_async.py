@@ -0,0 +1,18 @@
+from databaseDAO.async_db import adb
+from databaseDAO.user_context import USER_CONTEXT_QUERY, remember_context, user_contexts
+
+
+async def get_user_context(user_id):
+    """
+    The signed-in user's context, from the cache or one query
+
+    Returns:
+        UserContext, or None if the user does not exist
+    """
+    found, context = user_contexts.get(user_id)
+    if found:
+        return context
+    generation = user_contexts.generation
+    async with adb() as (conn, cursor):
+        await cursor.execute(USER_CONTEXT_QUERY, (user_id,))
+        return remember_context(user_id, await cursor.fetchone(), generation)
@@ -1,4 +1,10 @@
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from databaseDAO import user_context_async
+from databaseDAO.async_db import async_unit_of_work
+from databaseDAO.sqlConnector import UnitOfWork, current_unit_of_work
+from databaseDAO.user_context import UserContext
 
 
 def get_current_user(request: Request) -> int:
@@ -6,3 +12,43 @@ def get_current_user(request: Request) -> int:
     if not user_id:
         raise HTTPException(status_code=401)
     return user_id
+
+
+async def get_user_context(user_id: int = Depends(get_current_user)) -> UserContext:
+    """
+    The signed-in user's name, email and password hash version, cached per process
+
+    Handlers take it instead of selecting the user again; a session whose
+    user no longer exists gets a 401.
+    """
+    context = await user_context_async.get_user_context(user_id)
+    if context is None:
+        raise HTTPException(status_code=401)
+    return context
+
+
+async def unit_of_work():
+    """
+    Request-scoped unit of work
+
+    Every DAO call in the request, async or run in the thread pool, shares
+    one connection per pool and its transaction. Nothing is checked out
+    until a DAO needs it; the work is committed when the handler returns
+    and rolled back when it raises. The sync and async pools use different
+    drivers, so a request using DAOs of both kinds holds two connections
+    and two transactions.
+
+    Declare it with Depends(unit_of_work, scope="function") so the commit
+    happens before the response is sent; with the default scope a failed
+    commit would reach the client as a success.
+    """
+    async with async_unit_of_work():
+        work = UnitOfWork()
+        token = current_unit_of_work.set(work)
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            current_unit_of_work.reset(token)
+            await run_in_threadpool(work.finish, succeeded)
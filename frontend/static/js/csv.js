@@ -37,7 +37,7 @@ document.addEventListener('DOMContentLoaded', async () => {
 });
 
 // ==================== SECURITY CONSTANTS ====================
-const MAX_FILE_SIZE = 5 * 1024 * 1024; // 5MB
+const MAX_FILE_SIZE = 500 * 1024 * 1024; // 500MB
 const ALLOWED_MIME_TYPES = ['text/csv', 'application/vnd.ms-excel', 'text/plain', 'application/csv'];
 const ALLOWED_EXTENSIONS = ['.csv'];
 
@@ -84,7 +84,7 @@ function validateFile(file) {
     }
 
     if (file.size === 0) return { valid: false, error: 'File is empty' };
-    if (file.size > MAX_FILE_SIZE) return { valid: false, error: 'File too large (max 5MB)' };
+    if (file.size > MAX_FILE_SIZE) return { valid: false, error: 'File too large (max 500MB)' };
 
     if (/[<>:"|?*]|\.\.|\0/.test(name)) {
         return { valid: false, error: 'Invalid file name' };
@@ -154,13 +154,15 @@ async function uploadFile() {
             body: formData
         });
 
+        const job = await response.json();
+        if (!response.ok) throw new Error(job.detail || 'Import failed');
+
+        const result = await waitForImportJob(job.job_id);
+
         if (uploadInterval) clearInterval(uploadInterval);
         uploadInterval = null;
         updateProgress(100);
 
-        const result = await response.json();
-        if (!response.ok) throw new Error(result.detail || 'Import failed');
-
         showResults(result, true);
 
     } catch (err) {
@@ -169,6 +171,21 @@ async function uploadFile() {
     }
 }
 
+// ==================== IMPORT JOB POLLING ====================
+async function waitForImportJob(jobId) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+
+        const response = await fetch(`/import-csv/jobs/${jobId}`, { credentials: 'include' });
+        const job = await response.json();
+        if (!response.ok) throw new Error(job.detail || 'Import failed');
+
+        if (job.status === 'completed') return job;
+        if (job.status === 'failed') throw new Error(job.error || 'Import failed');
+        if (job.status === 'cancelled') throw new Error('Import cancelled');
+    }
+}
+
 // ==================== CSV CONTENT VALIDATION ====================
 async function validateCSVContent(file) {
     return new Promise((resolve, reject) => {
@@ -81,80 +81,101 @@ const container = document.getElementById('toast-container');
 }
 
 // ==================== LOAD TRANSACTIONS ====================
-async function loadTransactions() {
+const PAGE_SIZE = 100;
+let loadedTransactions = [];
+let nextCursor = null;
+
+async function loadTransactions(append = false) {
     try {
-        const res = await fetch('/transactions', { credentials: 'include' });
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        if (append && nextCursor) params.set('cursor', nextCursor);
+
+        const res = await fetch(`/transactions?${params}`, { credentials: 'include' });
         if (!res.ok) throw new Error();
 
-        const transactions = await res.json();
-        const list = document.getElementById('transactions-list');
-        if (!list) return;
+        const page = await res.json();
+        loadedTransactions = append ? loadedTransactions.concat(page.transactions) : page.transactions;
+        nextCursor = page.next_cursor;
+        renderTransactions();
 
-        if (!transactions.length) {
-            list.innerHTML = '<p style="text-align:center;color:#666;padding:40px">No transactions found.</p>';
-            return;
-        }
+    } catch {
+        showMessage('Failed to load transactions', 'error');
+    }
+}
 
-        const grouped = {};
-        transactions.forEach(t => {
-            const d = t.transaction_date || 'No date';
-            grouped[d] = grouped[d] || [];
-            grouped[d].push(t);
-        });
+function renderTransactions() {
+    const transactions = loadedTransactions;
+    const list = document.getElementById('transactions-list');
+    if (!list) return;
+
+    if (!transactions.length) {
+        list.innerHTML = '<p style="text-align:center;color:#666;padding:40px">No transactions found.</p>';
+        return;
+    }
 
-        let html = '';
+    // The API returns newest first with undated transactions last, so groups keep that order
+    const grouped = {};
+    transactions.forEach(t => {
+        const d = t.transaction_date || 'No date';
+        grouped[d] = grouped[d] || [];
+        grouped[d].push(t);
+    });
+
+    let html = '';
+
+    Object.keys(grouped)
+        .forEach(date => {
+            html += `
+            <div class="transaction-date-group">
+                <h3>${formatDate(date)}</h3>
+                <hr class="date-separator">
+            `;
+
+            grouped[date].forEach(t => {
+                const amount = parseFloat(t.amount || 0);
+                const isPositive = amount > 0;
+                const sign = isPositive ? '+' : ''
+                const color = isPositive ? '#10b981' : '#ef4444';
+                const colorClass = isPositive ? 'positive' : 'negative';
 
-        Object.keys(grouped)
-            .sort()
-            .reverse()
-            .forEach(date => {
                 html += `
-                <div class="transaction-date-group">
-                    <h3>${formatDate(date)}</h3>
-                    <hr class="date-separator">
-                `;
-
-                grouped[date].forEach(t => {
-                    const amount = parseFloat(t.amount || 0);
-                    const isPositive = amount > 0;
-                    const sign = isPositive ? '+' : ''
-                    const color = isPositive ? '#10b981' : '#ef4444';
-                    const colorClass = isPositive ? 'positive' : 'negative';
-
-                    html += `
-                    <div class="transaction-card">
-                        <div class="transaction-main">
-                            <div>
-                                <div><strong>${escapeHtml(t.name)}</strong></div>
-                                ${t.description ? `<small>${escapeHtml(t.description)}</small>` : ''}
-                            </div>
-                            <div style="color:${color}">
-                                <strong>${sign}${Math.abs(amount).toFixed(2)}kr</strong>
-                            </div>
+                <div class="transaction-card">
+                    <div class="transaction-main">
+                        <div>
+                            <div><strong>${escapeHtml(t.name)}</strong></div>
+                            ${t.description ? `<small>${escapeHtml(t.description)}</small>` : ''}
                         </div>
-                        <div class="transaction-actions">
-                            <button
-                                class="btn-delete"
-                                onclick="openDeleteModal(
-                                    ${t.transaction_id},
-                                    '${escapeHtml(t.name).replace(/'/g, "\\'")}',
-                                    ${amount}
-                                )">
-                                Delete
-                            </button>
+                        <div style="color:${color}">
+                            <strong>${sign}${Math.abs(amount).toFixed(2)}kr</strong>
                         </div>
                     </div>
-                    `;
-                });
-
-                html += '</div>';
+                    <div class="transaction-actions">
+                        <button
+                            class="btn-delete"
+                            onclick="openDeleteModal(
+                                ${t.transaction_id},
+                                '${escapeHtml(t.name).replace(/'/g, "\\'")}',
+                                ${amount}
+                            )">
+                            Delete
+                        </button>
+                    </div>
+                </div>
+                `;
             });
 
-        list.innerHTML = html;
+            html += '</div>';
+        });
 
-    } catch {
-        showMessage('Failed to load transactions', 'error');
+    if (nextCursor) {
+        html += `
+        <div style="text-align:center;padding:20px">
+            <button class="btn btn-primary" onclick="loadTransactions(true)">Load more</button>
+        </div>
+        `;
     }
+
+    list.innerHTML = html;
 }
 
 // ==================== ADD TRANSACTION ====================
@@ -1,4 +1,7 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, suppress
+
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,7 +9,12 @@ from fastapi.responses import FileResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
-from routers import auth, accounts, transactions, currency, charts, reports, csv_import
+from routers import auth, accounts, transactions, currency, charts, reports, csv_import, metrics
+from databaseDAO.sqlConnector import pool
+from databaseDAO.async_db import close_pool
+from databaseDAO.transaction.import_jobs import shutdown_import_job_manager
+from Visuals.ExchangeRates import get_currency_converter, refresh_rates_periodically
+from Visuals.report_renderer import renderer
 
 load_dotenv()
 
@@ -14,7 +22,30 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY not found in environment variables!")
 
-app = FastAPI()
+RATE_REFRESH_MINUTES = float(os.getenv("EXCHANGE_RATE_REFRESH_MINUTES", "60"))
+
+# Pool, statement cache and render queue internals are for operators, not users
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Exchange rates are fetched in the background, never inside a request
+    rate_refresher = asyncio.create_task(
+        refresh_rates_periodically(get_currency_converter(), RATE_REFRESH_MINUTES * 60)
+    )
+    yield
+    rate_refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await rate_refresher
+    renderer.shutdown()
+    # Running imports stop at their next batch and record their status before the pools close
+    await asyncio.to_thread(shutdown_import_job_manager)
+    pool.close_all()
+    await close_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # ==================== MIDDLEWARE ====================
 
@@ -101,3 +132,5 @@ app.include_router(currency.router)
 app.include_router(charts.router)
 app.include_router(reports.router)
 app.include_router(csv_import.router)
+if METRICS_ENABLED:
+    app.include_router(metrics.router)
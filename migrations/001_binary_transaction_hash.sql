@@ -0,0 +1,25 @@
+-- Store transactions.transaction_hash as a 16-byte binary digest instead of
+-- the 64-char hex VARCHAR(250), which shrinks the uniq_user_tx index.
+--
+-- Existing hashes are converted to UNHEX(LEFT(hash, 32)), the first 16 bytes
+-- of the same SHA-256, which is exactly what the importer now computes with
+-- TRANSACTION_HASH_FORMAT=binary16 (the default), so re-imports still detect
+-- rows stored before the migration.
+--
+-- For BINARY(32) use BINARY(32) and UNHEX(transaction_hash) below, and set
+-- TRANSACTION_HASH_FORMAT=binary32.
+--
+-- On very large tables run the UPDATE in transaction_id ranges, e.g.
+--   ... WHERE transaction_id BETWEEN 1 AND 1000000 AND transaction_hash IS NOT NULL
+
+ALTER TABLE transactions ADD COLUMN transaction_hash_bin BINARY(16) NULL;
+
+UPDATE transactions
+SET transaction_hash_bin = UNHEX(LEFT(transaction_hash, 32))
+WHERE transaction_hash IS NOT NULL;
+
+ALTER TABLE transactions
+    DROP INDEX uniq_user_tx,
+    DROP COLUMN transaction_hash,
+    RENAME COLUMN transaction_hash_bin TO transaction_hash,
+    ADD CONSTRAINT uniq_user_tx UNIQUE (user_id, transaction_hash);
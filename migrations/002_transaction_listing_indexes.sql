@@ -0,0 +1,7 @@
+-- Indexes behind the keyset-paginated GET /transactions listing, which
+-- orders by (transaction_date, transaction_id) within one user, optionally
+-- for a single category.
+
+ALTER TABLE transactions
+    ADD INDEX idx_tx_user_date (user_id, transaction_date, transaction_id),
+    ADD INDEX idx_tx_user_category_date (user_id, category_id, transaction_date, transaction_id);
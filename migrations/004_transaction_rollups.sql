@@ -0,0 +1,43 @@
+-- Rollup tables behind the weekly chart and the dashboard totals.
+--
+-- After creating them, fill them from existing transactions with
+--   python -m databaseDAO.transaction.rollup_DAO
+
+CREATE TABLE IF NOT EXISTS transaction_rollups(
+    user_id INT NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_date DATE NOT NULL,
+    income DECIMAL(15,2) NOT NULL DEFAULT 0,
+    expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+    income_count INT NOT NULL DEFAULT 0,
+    expense_count INT NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    min_amount DECIMAL(12,2),
+    max_amount DECIMAL(12,2),
+    PRIMARY KEY (user_id, period, period_date),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS category_rollups(
+    user_id INT NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_date DATE NOT NULL,
+    category_id INT NOT NULL,
+    income DECIMAL(15,2) NOT NULL DEFAULT 0,
+    expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, period, period_date, category_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS merchant_rollups(
+    user_id INT NOT NULL,
+    period VARCHAR(5) NOT NULL,
+    period_date DATE NOT NULL,
+    merchant VARCHAR(100) NOT NULL,
+    income DECIMAL(15,2) NOT NULL DEFAULT 0,
+    expenses DECIMAL(15,2) NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, period, period_date, merchant),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
@@ -0,0 +1,7 @@
+-- Covering index for the date-range reads: the monthly report, the weekly
+-- chart fallback and the rollup refresh all filter one user's transactions
+-- by transaction_date >= start AND transaction_date < end and only read
+-- these columns, so they are answered from the index alone.
+
+ALTER TABLE transactions
+    ADD INDEX idx_tx_user_date_cover (user_id, transaction_date, amount, category_id, name, description);
@@ -0,0 +1,13 @@
+-- Daily exchange rates for converting amounts at the rate of their own date.
+--
+-- rate is units of currency per 1 USD on rate_date. The app stores a
+-- snapshot each time it refreshes its rates; older snapshots can be loaded
+-- with
+--   python -m databaseDAO.ExchangeRate.rate_history_DAO snapshot.json [...]
+
+CREATE TABLE IF NOT EXISTS exchange_rate_history(
+    currency CHAR(3) NOT NULL,
+    rate_date DATE NOT NULL,
+    rate DECIMAL(20,10) NOT NULL,
+    PRIMARY KEY (currency, rate_date)
+);
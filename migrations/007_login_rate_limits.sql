@@ -0,0 +1,13 @@
+-- Login attempt counters shared by every app worker (RATE_LIMIT_BACKEND=mysql).
+--
+-- Each key keeps the attempt counts of the current and the previous fixed
+-- window; window_index is the Unix time divided by the window length. Rows
+-- more than a window old are purged by the app.
+
+CREATE TABLE IF NOT EXISTS login_rate_limits(
+    limit_key VARCHAR(255) NOT NULL PRIMARY KEY,
+    window_index BIGINT NOT NULL,
+    current_count INT NOT NULL DEFAULT 0,
+    previous_count INT NOT NULL DEFAULT 0,
+    INDEX idx_login_rate_limits_window (window_index)
+);
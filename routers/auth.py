@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
-from dependencies import get_current_user
+from dependencies import get_user_context
+from databaseDAO.user_context import UserContext
 from models.user_models import (
     LoginRequest, RegisterRequest, UpdateUserRequest, UpdatePasswordRequest
 )
-from databaseDAO.userDAO import logIn, register, update_userinfo, update_password
+from databaseDAO.userDAO_async import logIn, register, update_userinfo, update_password
 
 router = APIRouter()
 
@@ -18,7 +19,7 @@ async def auth_status(request: Request):
 
 @router.post("/login")
 async def login_endpoint(request: Request, response: Response, data: LoginRequest):
-    success, user_id = logIn(data.email, data.password)
+    success, user_id = await logIn(data.email, data.password)
     if not success:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -30,13 +31,13 @@ async def login_endpoint(request: Request, response: Response, data: LoginReques
 
 
 @router.get("/me")
-async def get_me(request: Request, current_user: int = Depends(get_current_user)):
-    return {"user_id": current_user, "email": request.session.get("email")}
+async def get_me(user: UserContext = Depends(get_user_context)):
+    return {"user_id": user.user_id, "email": user.email, "name": user.name}
 
 
 @router.post("/register")
 async def register_endpoint(data: RegisterRequest):
-    success, message = register(data.name, data.email, data.password)
+    success, message = await register(data.name, data.email, data.password)
     if not success:
         raise HTTPException(status_code=400, detail=message)
     return {"success": True, "message": message}
@@ -46,18 +47,19 @@ async def register_endpoint(data: RegisterRequest):
 async def update_user_endpoint(
     request: Request,
     data: UpdateUserRequest,
-    current_user_id: int = Depends(get_current_user)
+    user: UserContext = Depends(get_user_context)
 ):
-    user_email = request.session.get("email")
-    result = update_userinfo(user_email, data.name, data.new_email)
+    result = await update_userinfo(user.email, data.name, data.new_email, user_id=user.user_id)
     if not result:
         raise HTTPException(status_code=400, detail="Update failed")
+    if data.new_email:
+        request.session["email"] = data.new_email
     return {"success": True, "message": "User information updated"}
 
 
 @router.put("/update-password")
 async def update_password_endpoint(data: UpdatePasswordRequest):
-    result = update_password(data.email, data.old_password, data.password, data.re_password)
+    result = await update_password(data.email, data.old_password, data.password, data.re_password)
     if not result:
         raise HTTPException(status_code=400, detail="Password update failed")
     return {"success": True, "message": "Password updated successfully"}
@@ -1,7 +1,13 @@
+from datetime import date, timedelta
+
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from dependencies import get_current_user
 from Visuals.ExchangeRates import get_currency_converter
-from Visuals.BarChart import weekly_expenses, incoming_funds, outgoing_funds
+from databaseDAO.transaction.rollup_DAO import WEEK, first_whole_week
+from databaseDAO.transaction.rollup_DAO_async import get_rollups
+from databaseDAO.money import cents_array, to_units
+from Visuals.time_series import densify, WEEKLY
 import pandas as pd
 
 router = APIRouter(prefix="/api")
@@ -14,9 +20,13 @@ async def get_weekly_chart_data(
     base_currency: str = "USD"
 ):
     try:
-        transactions = weekly_expenses(current_user_id, weeks)
+        # Weekly rollups are keyed by the Monday closing each W-MON week. A week
+        # straddling the cutoff would count days before it, so the chart starts
+        # at the first whole week after the cutoff.
+        cutoff = date.today() - timedelta(weeks=weeks)
+        buckets = await get_rollups(current_user_id, WEEK, first_whole_week(cutoff))
 
-        if not transactions:
+        if not buckets:
             return {
                 'success': False,
                 'error': 'No transactions found for this user',
@@ -24,11 +34,12 @@ async def get_weekly_chart_data(
                 'weeks': weeks
             }
 
-        df = pd.DataFrame(transactions, columns=["Date", "Amount"])
-        df["Date"] = pd.to_datetime(df["Date"])
-        df.set_index("Date", inplace=True)
-
-        weekly = df.resample('W-MON').agg({'Amount': [incoming_funds, outgoing_funds]})
+        # Sums stay in integer cents until they are converted for the response
+        weekly = pd.DataFrame({
+            "income": cents_array([bucket["income"] for bucket in buckets]),
+            "expenses": cents_array([bucket["expenses"] for bucket in buckets]),
+        }, index=pd.DatetimeIndex([bucket["period_date"] for bucket in buckets]))
+        weekly = densify(weekly, WEEKLY)
         weekly = weekly.reset_index()
         weekly.columns = ['Date', 'Income', 'Expenses']
         weekly['Net'] = weekly['Income'] - weekly['Expenses']
@@ -36,23 +47,17 @@ async def get_weekly_chart_data(
         converter = get_currency_converter()
         needs_conversion = base_currency != 'SEK'
 
-        weekly_data = []
-        for _, row in weekly.iterrows():
-            income = float(row['Income'])
-            expenses = float(row['Expenses'])
-            net = float(row['Net'])
-
-            if needs_conversion:
-                income = converter.convert(income, 'SEK', base_currency)
-                expenses = converter.convert(expenses, 'SEK', base_currency)
-                net = converter.convert(net, 'SEK', base_currency)
+        # Each week is converted at the rate of its closing Monday, in one vectorized pass
+        amounts = to_units(weekly[['Income', 'Expenses', 'Net']].to_numpy())
+        if needs_conversion:
+            amounts = await run_in_threadpool(converter.convert_many_asof, amounts, weekly['Date'],
+                                              'SEK', base_currency)
+        amounts = amounts.round(2)
 
-            weekly_data.append({
-                'date': row['Date'].strftime('%Y-%m-%d'),
-                'income': round(income, 2),
-                'expenses': round(expenses, 2),
-                'net': round(net, 2)
-            })
+        weekly_data = [
+            {'date': week.strftime('%Y-%m-%d'), 'income': income, 'expenses': expenses, 'net': net}
+            for week, (income, expenses, net) in zip(weekly['Date'], amounts.tolist())
+        ]
 
         total_income = sum(w['income'] for w in weekly_data)
         total_expenses = sum(w['expenses'] for w in weekly_data)
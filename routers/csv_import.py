@@ -1,15 +1,17 @@
 import re
 import os
-import tempfile
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from dependencies import get_current_user
-from databaseDAO.transaction.importcsv import bankImporter
+from databaseDAO.transaction.csv_stream import CsvChunkReader
+from databaseDAO.transaction.import_jobs import get_import_job_manager, spool_upload, ImportLimitError
 
 router = APIRouter()
 
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+# Uploads are parsed chunk by chunk, so memory use does not grow with this limit
+MAX_FILE_SIZE = int(os.getenv("CSV_MAX_UPLOAD_MB", "500")) * 1024 * 1024
 ALLOWED_EXTENSIONS = {'.csv'}
 ALLOWED_MIME_TYPES = {'text/csv', 'application/vnd.ms-excel', 'text/plain', 'application/csv'}
 
@@ -58,79 +60,69 @@ async def import_csv_transactions(
     if not is_valid:
         raise HTTPException(status_code=400, detail=error_msg)
 
-    temp_file_path = None
-
     try:
-        content = await file.read()
-
-        if len(content) > MAX_FILE_SIZE:
+        if file.size is not None and file.size > MAX_FILE_SIZE:
             raise HTTPException(status_code=400, detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024 * 1024):.1f} MB")
-        if len(content) == 0:
-            raise HTTPException(status_code=400, detail="File is empty")
-        if b'\x00' in content:
-            raise HTTPException(status_code=400, detail="File contains invalid characters")
 
+        reader = CsvChunkReader(file.file, max_bytes=MAX_FILE_SIZE)
         try:
-            text_content = content.decode('utf-8-sig')
-        except UnicodeDecodeError:
-            try:
-                text_content = content.decode('latin-1')
-            except UnicodeDecodeError:
-                raise HTTPException(status_code=400, detail="Unable to decode file. Please ensure it's a valid CSV.")
-
-        lines = [line for line in text_content.split('\n') if line.strip()]
-        if len(lines) < 2:
-            raise HTTPException(status_code=400, detail="CSV file is too short or empty")
-
-        # Strip outer quotes from lines if present
-        fixed_lines = []
-        for line in lines:
-            if line.startswith('"') and line.endswith('"') and line.count('"') == 2:
-                fixed_lines.append(line[1:-1])
-            else:
-                fixed_lines.append(line)
-
-        text_content = '\n'.join(fixed_lines)
-
-        is_valid, error_msg = validate_csv_columns(fixed_lines[0])
+            header = await run_in_threadpool(reader.read_header)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if header is None:
+            raise HTTPException(status_code=400, detail="File is empty")
+
+        is_valid, error_msg = validate_csv_columns(header)
         if not is_valid:
             raise HTTPException(status_code=400, detail=error_msg)
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as temp_file:
-            temp_file.write(text_content)
-            temp_file_path = temp_file.name
-
-        importer = bankImporter(user_id=current_user_id, default_category_id=1)
-        importer.import_csv(temp_file_path)
+        await run_in_threadpool(file.file.seek, 0)
+        try:
+            temp_file_path = await run_in_threadpool(spool_upload, file.file, MAX_FILE_SIZE)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        if temp_file_path and os.path.exists(temp_file_path):
+        try:
+            job = get_import_job_manager().submit(current_user_id, temp_file_path, MAX_FILE_SIZE)
+        except ImportLimitError as e:
             os.unlink(temp_file_path)
+            raise HTTPException(status_code=429, detail=str(e))
 
-        return JSONResponse(status_code=200, content={
-            "message": "Import completed successfully",
-            "imported": importer.imported_count,
-            "duplicates": importer.duplicate_count,
-            "total": importer.imported_count + importer.duplicate_count,
-            "user_id": current_user_id
+        return JSONResponse(status_code=202, content={
+            "message": "Import started",
+            **job.to_dict()
         })
 
     except HTTPException:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception:
-                pass
         raise
 
     except Exception as e:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception:
-                pass
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
     finally:
-        await file.close()
\ No newline at end of file
+        await file.close()
+
+
+@router.get("/import-csv/jobs")
+async def list_import_jobs(current_user_id: int = Depends(get_current_user)):
+    jobs = get_import_job_manager().list(current_user_id)
+    return {"success": True, "jobs": [job.to_dict() for job in jobs], "count": len(jobs)}
+
+
+@router.get("/import-csv/jobs/{job_id}")
+async def get_import_job(job_id: str, current_user_id: int = Depends(get_current_user)):
+    job = get_import_job_manager().get(job_id, current_user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_dict()
+
+
+@router.delete("/import-csv/jobs/{job_id}")
+async def cancel_import_job(job_id: str, current_user_id: int = Depends(get_current_user)):
+    job = get_import_job_manager().cancel(job_id, current_user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return {"success": True, "message": "Cancellation requested", **job.to_dict()}
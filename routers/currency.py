@@ -1,10 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
-from dependencies import get_current_user
-from databaseDAO.Account.account_dao import get_all_accounts
-from databaseDAO.transaction.transaction_DAO import get_all_transactions
+from fastapi.concurrency import run_in_threadpool
+from dependencies import get_current_user, unit_of_work
+from databaseDAO.Account.account_dao_async import get_all_accounts
+from databaseDAO.transaction.transaction_DAO_async import get_dashboard_summary
 from Visuals.ExchangeRates import get_currency_converter
 
-router = APIRouter(prefix="/api/currency")
+router = APIRouter(prefix="/api/currency", dependencies=[Depends(unit_of_work, scope="function")])
 
 
 @router.get("/dashboard")
@@ -12,29 +13,29 @@ async def get_dashboard_converted(
     current_user_id: int = Depends(get_current_user),
     base_currency: str = "USD"
 ):
-    accounts = get_all_accounts(current_user_id)
-    transactions = get_all_transactions(current_user_id)
+    accounts = await get_all_accounts(current_user_id)
+    summary = await get_dashboard_summary(current_user_id, 5)
     converter = get_currency_converter()
-    conversion_result = converter.convert_accounts(accounts, base_currency)
+    conversion_result = await run_in_threadpool(converter.convert_accounts, accounts, base_currency)
 
     if not conversion_result['success']:
         raise HTTPException(status_code=500, detail=conversion_result.get('error'))
 
-    total_income = sum(float(t['amount']) for t in transactions if float(t['amount']) > 0)
-    total_expenses = sum(abs(float(t['amount'])) for t in transactions if float(t['amount']) < 0)
-
     return {
         'success': True,
         'user_id': current_user_id,
         'base_currency': base_currency,
         'statistics': {
             'total_balance': conversion_result['total_balance'],
-            'total_income': round(total_income, 2),
-            'total_expenses': round(total_expenses, 2),
+            'total_income': float(summary['total_income']),
+            'total_expenses': float(summary['total_expenses']),
+            'income_count': summary['income_count'],
+            'expense_count': summary['expense_count'],
+            'transaction_count': summary['transaction_count'],
             'account_count': len(accounts)
         },
         'accounts': conversion_result['accounts'],
-        'recent_transactions': transactions[:5],
+        'recent_transactions': summary['recent_transactions'],
         'timestamp': conversion_result['timestamp']
     }
 
@@ -44,9 +45,9 @@ async def get_accounts_converted(
     current_user_id: int = Depends(get_current_user),
     base_currency: str = "USD"
 ):
-    accounts = get_all_accounts(current_user_id)
+    accounts = await get_all_accounts(current_user_id)
     converter = get_currency_converter()
-    result = converter.convert_accounts(accounts, base_currency)
+    result = await run_in_threadpool(converter.convert_accounts, accounts, base_currency)
     if not result['success']:
         raise HTTPException(status_code=500, detail=result.get('error'))
     return result
@@ -56,7 +57,7 @@ async def get_accounts_converted(
 async def get_exchange_rates(base_currency: str = "USD"):
     try:
         converter = get_currency_converter()
-        rates = converter.get_rates(base_currency)
+        rates = await run_in_threadpool(converter.get_rates, base_currency)
         if not rates:
             raise HTTPException(status_code=500, detail="Could not fetch rates")
         return {'success': True, 'base_currency': base_currency, 'rates': rates, 'count': len(rates)}
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from dependencies import get_current_user
+from databaseDAO import statement_cache
+from databaseDAO.sqlConnector import pool
+from Visuals.report_renderer import renderer
+
+router = APIRouter(prefix="/api/metrics")
+
+
+@router.get("/pool")
+async def get_pool_metrics(current_user_id: int = Depends(get_current_user)):
+    """Connection pool sizes, counters and acquire-wait / checkout-duration histograms"""
+    return pool.metrics()
+
+
+@router.get("/statements")
+async def get_statement_metrics(current_user_id: int = Depends(get_current_user)):
+    """Prepared statement cache hits, misses and evictions, per registered query"""
+    return statement_cache.stats.to_dict()
+
+
+@router.get("/reports")
+async def get_report_metrics(current_user_id: int = Depends(get_current_user)):
+    """Report render workers, renders queued or running, and rendered/failed/rejected/timed-out counts"""
+    return renderer.metrics()
@@ -1,19 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.concurrency import run_in_threadpool
-from dependencies import get_current_user
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from dependencies import get_current_user, unit_of_work
 from models.transaction_models import TransactionCreate, TransactionUpdate
-from databaseDAO.transaction.transaction_DAO import (
+from databaseDAO.transaction.transaction_DAO import LISTING_MAX_LIMIT
+from databaseDAO.transaction.transaction_DAO_async import (
     register_transaction, delete_transaction, update_transaction,
-    get_transaction, get_all_transactions
+    get_transaction, list_transactions
 )
 
-router = APIRouter(prefix="/transactions")
+router = APIRouter(prefix="/transactions", dependencies=[Depends(unit_of_work, scope="function")])
 
 
 @router.post("")
 async def create_transaction(data: TransactionCreate, current_user_id: int = Depends(get_current_user)):
-    ok = await run_in_threadpool(
-        register_transaction, current_user_id, data.category_id, data.name,
+    ok = await register_transaction(
+        current_user_id, data.category_id, data.name,
         data.amount, data.description, data.transaction_date, data.balance
     )
     if not ok:
@@ -22,13 +25,33 @@ async def create_transaction(data: TransactionCreate, current_user_id: int = Dep
 
 
 @router.get("")
-async def get_transactions(current_user_id: int = Depends(get_current_user)):
-    return await run_in_threadpool(get_all_transactions, current_user_id)
+async def get_transactions(
+    limit: int = Query(50, ge=1, le=LISTING_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    category_id: Optional[int] = None,
+    q: Optional[str] = Query(None, max_length=100),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    current_user_id: int = Depends(get_current_user)
+):
+    """One page of transactions, newest first; pass next_cursor back as cursor for the next page"""
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    try:
+        rows, next_cursor = await list_transactions(
+            current_user_id, limit, cursor, start_date, end_date,
+            min_amount, max_amount, category_id, q, field_list
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"transactions": rows, "next_cursor": next_cursor}
 
 
 @router.get("/{transaction_id}")
 async def get_transaction_endpoint(transaction_id: int, current_user_id: int = Depends(get_current_user)):
-    tx = await run_in_threadpool(get_transaction, transaction_id, current_user_id)
+    tx = await get_transaction(transaction_id, current_user_id)
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return tx
@@ -40,8 +63,8 @@ async def update_transaction_endpoint(
     data: TransactionUpdate,
     current_user_id: int = Depends(get_current_user)
 ):
-    ok = await run_in_threadpool(
-        update_transaction, transaction_id, current_user_id,
+    ok = await update_transaction(
+        transaction_id, current_user_id,
         data.category_id, data.name, data.amount, data.description
     )
     if not ok:
@@ -51,7 +74,7 @@ async def update_transaction_endpoint(
 
 @router.delete("/{transaction_id}")
 async def delete_transaction_endpoint(transaction_id: int, current_user_id: int = Depends(get_current_user)):
-    ok = await run_in_threadpool(delete_transaction, transaction_id, current_user_id)
+    ok = await delete_transaction(transaction_id, current_user_id)
     if not ok:
         raise HTTPException(status_code=400, detail="Delete failed")
     return {"success": True}
\ No newline at end of file